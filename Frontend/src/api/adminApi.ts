@@ -1,5 +1,6 @@
 import apiClient from './apiClient';
 import { AdminLog, SystemSettings, User, Pet } from '@/models';
+import type { MessagePagination } from './chatApi';
 
 export const adminApi = {
   /**
@@ -424,15 +425,18 @@ export const adminApi = {
   /**
    * View chat in read-only mode (for admins who didn't verify the request)
    */
-  async viewChatReadOnly(roomId: string): Promise<{
+  async viewChatReadOnly(roomId: string, before?: number | null): Promise<{
     room: any;
     messages: any[];
+    pagination: MessagePagination | null;
     participants: any[];
     is_readonly: boolean;
     is_verifying_admin: boolean;
     chat_request: any;
   }> {
-    const response = await apiClient.get(`/chats/rooms/${roomId}/admin-view/`);
+    // Newest page of messages; pass pagination.next_before to load older ones
+    const params = before ? { before } : undefined;
+    const response = await apiClient.get(`/chats/rooms/${roomId}/admin-view/`, { params });
     return response.data;
   },
 };
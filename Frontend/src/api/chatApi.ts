@@ -1,6 +1,31 @@
 import apiClient from './apiClient';
 import { ChatRoom, Message } from '@/models';
 
+export interface MessagePagination {
+  limit: number;
+  has_more: boolean;
+  next_before: number | null;
+  next_after: number | null;
+}
+
+export interface MessagePage<T = any> {
+  messages: T[];
+  pagination: MessagePagination | null;
+}
+
+/**
+ * One page of a room's message history, oldest first.
+ * Without `before` this is the newest page; pass pagination.next_before to get the page before it.
+ */
+async function fetchMessagePage(roomId: number | string, before?: number | null): Promise<MessagePage> {
+  const params = before ? { before } : undefined;
+  const response = await apiClient.get(`/chats/rooms/${roomId}/messages/`, { params });
+  return {
+    messages: response.data?.data || response.data || [],
+    pagination: response.data?.pagination || null,
+  };
+}
+
 export const chatApi = {
   /**
    * Get all chat rooms for current user
@@ -159,15 +184,7 @@ export const chatApi = {
    */
   async getMessages(roomId: number | string): Promise<Message[]> {
     try {
-      // Try string room_id first (like "3_6")
-      if (typeof roomId === 'string') {
-        const response = await apiClient.get(`/chats/rooms/${roomId}/messages/`);
-        return response.data?.data || response.data || [];
-      } else {
-        // Try integer ID
-        const response = await apiClient.get<Message[]>(`/chats/rooms/${roomId}/messages/`);
-        return response.data?.data || response.data || [];
-      }
+      return (await fetchMessagePage(roomId)).messages;
     } catch (error: any) {
       console.error('Error fetching messages:', error);
       return [];
@@ -373,15 +390,21 @@ export const chatApi = {
   },
 
   /**
-   * Get room messages by room_id
+   * Get room messages by room_id (the newest page; see getRoomMessagesPage)
    */
   async getRoomMessages(roomId: string): Promise<any[]> {
+    return (await this.getRoomMessagesPage(roomId)).messages;
+  },
+
+  /**
+   * Get one page of room messages; pass pagination.next_before to load older messages
+   */
+  async getRoomMessagesPage(roomId: string, before?: number | null): Promise<MessagePage> {
     try {
-      const response = await apiClient.get(`/chats/rooms/${roomId}/messages/`);
-      return response.data.data || response.data || [];
+      return await fetchMessagePage(roomId, before);
     } catch (error: any) {
       if (error.response?.status === 400 || error.response?.status === 404) {
-        return [];
+        return { messages: [], pagination: null };
       }
       throw error;
     }
@@ -5,6 +5,7 @@ import { Textarea } from '@/components/ui/textarea';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { useChatSocket } from '@/hooks/useChatSocket';
+import { useOlderMessages } from '@/hooks/useOlderMessages';
 import { chatApi } from '@/api';
 import { useAuth } from '@/lib/auth';
 import { format } from 'date-fns';
@@ -40,6 +41,11 @@ export function ChatWindow({ roomId, otherUser, isOnline = false }: ChatWindowPr
   const [loading, setLoading] = useState(true);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const typingTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+  const { containerRef, onScroll, loadOlder, hasOlder, loadingOlder, setPagination, consumePrepended } =
+    useOlderMessages<Message>({
+      setMessages,
+      fetchOlder: (before) => chatApi.getRoomMessagesPage(roomId, before),
+    });
 
   // Load initial messages
   useEffect(() => {
@@ -77,8 +83,10 @@ export function ChatWindow({ roomId, otherUser, isOnline = false }: ChatWindowPr
   const loadMessages = async () => {
     try {
       setLoading(true);
-      const data = await chatApi.getRoomMessages(roomId);
-      setMessages(data || []);
+      // Newest page first; older pages load when scrolling up
+      const page = await chatApi.getRoomMessagesPage(roomId);
+      setMessages(page.messages || []);
+      setPagination(page.pagination);
       scrollToBottom();
     } catch (error) {
       console.error('Error loading messages:', error);
@@ -130,7 +138,9 @@ export function ChatWindow({ roomId, otherUser, isOnline = false }: ChatWindowPr
   };
 
   useEffect(() => {
-    scrollToBottom();
+    if (!consumePrepended()) {
+      scrollToBottom();
+    }
   }, [messages]);
 
   useEffect(() => {
@@ -170,7 +180,7 @@ export function ChatWindow({ roomId, otherUser, isOnline = false }: ChatWindowPr
       </CardHeader>
 
       {/* Messages */}
-      <CardContent className="flex-1 overflow-y-auto p-4 space-y-4">
+      <CardContent ref={containerRef} onScroll={onScroll} className="flex-1 overflow-y-auto p-4 space-y-4">
         {loading ? (
           <div className="flex items-center justify-center h-full">
             <Loader2 className="h-6 w-6 animate-spin text-gray-400" />
@@ -181,6 +191,13 @@ export function ChatWindow({ roomId, otherUser, isOnline = false }: ChatWindowPr
           </div>
         ) : (
           <>
+            {hasOlder && (
+              <div className="flex justify-center">
+                <Button variant="ghost" size="sm" onClick={loadOlder} disabled={loadingOlder}>
+                  {loadingOlder ? <Loader2 className="h-4 w-4 animate-spin" /> : 'Load older messages'}
+                </Button>
+              </div>
+            )}
             {messages.map((message) => {
               const isOwn = message.sender.id === user?.id;
               return (
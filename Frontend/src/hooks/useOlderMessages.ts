@@ -0,0 +1,79 @@
+import { useCallback, useRef, useState } from 'react';
+import type { Dispatch, SetStateAction, UIEvent } from 'react';
+import type { MessagePage, MessagePagination } from '@/api/chatApi';
+
+// Start loading the previous page when the list is scrolled this close to the top
+const LOAD_OLDER_THRESHOLD_PX = 80;
+
+interface UseOlderMessagesOptions<T extends { id: number }> {
+  setMessages: Dispatch<SetStateAction<T[]>>;
+  fetchOlder: (before: number) => Promise<MessagePage<T>>;
+}
+
+/**
+ * Loads older chat history on demand: the room opens with the newest page and
+ * earlier pages are fetched with ?before=<pagination.next_before> when the
+ * message list is scrolled to the top (or loadOlder is called).
+ */
+export function useOlderMessages<T extends { id: number }>({ setMessages, fetchOlder }: UseOlderMessagesOptions<T>) {
+  const containerRef = useRef<HTMLDivElement>(null);
+  const nextBeforeRef = useRef<number | null>(null);
+  const loadingRef = useRef(false);
+  const prependedRef = useRef(false);
+  const [hasOlder, setHasOlder] = useState(false);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+
+  /** Record the pagination of the page that was just shown. */
+  const setPagination = useCallback((pagination: MessagePagination | null | undefined) => {
+    nextBeforeRef.current = pagination?.has_more ? pagination.next_before : null;
+    setHasOlder(nextBeforeRef.current !== null);
+  }, []);
+
+  const loadOlder = useCallback(async () => {
+    const before = nextBeforeRef.current;
+    if (before === null || loadingRef.current) return;
+
+    loadingRef.current = true;
+    setLoadingOlder(true);
+    try {
+      const page = await fetchOlder(before);
+      const container = containerRef.current;
+      const previousHeight = container?.scrollHeight ?? 0;
+      prependedRef.current = true;
+      setMessages(prev => {
+        const seen = new Set(prev.map(m => m.id));
+        return [...page.messages.filter(m => !seen.has(m.id)), ...prev];
+      });
+      setPagination(page.pagination);
+      // Keep the message that was at the top where it was
+      requestAnimationFrame(() => {
+        if (container) {
+          container.scrollTop += container.scrollHeight - previousHeight;
+        }
+      });
+    } catch (error) {
+      console.error('Error loading older messages:', error);
+    } finally {
+      loadingRef.current = false;
+      setLoadingOlder(false);
+    }
+  }, [fetchOlder, setMessages, setPagination]);
+
+  const onScroll = useCallback((event: UIEvent<HTMLDivElement>) => {
+    if (event.currentTarget.scrollTop < LOAD_OLDER_THRESHOLD_PX) {
+      loadOlder();
+    }
+  }, [loadOlder]);
+
+  /**
+   * True once after older messages were prepended, so the caller's
+   * scroll-to-bottom effect can leave the scroll position alone.
+   */
+  const consumePrepended = useCallback(() => {
+    const prepended = prependedRef.current;
+    prependedRef.current = false;
+    return prepended;
+  }, []);
+
+  return { containerRef, onScroll, loadOlder, hasOlder, loadingOlder, setPagination, consumePrepended };
+}
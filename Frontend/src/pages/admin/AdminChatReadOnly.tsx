@@ -17,6 +17,7 @@ import { Avatar, AvatarFallback } from '@/components/ui/avatar';
 import { Badge } from '@/components/ui/badge';
 import { Separator } from '@/components/ui/separator';
 import { useToast } from '@/hooks/use-toast';
+import { useOlderMessages } from '@/hooks/useOlderMessages';
 import { adminApi } from '@/api';
 import { getBaseUrl } from '@/config/api';
 import { AdminSidebar } from '@/components/layout/AdminSidebar';
@@ -60,6 +61,11 @@ export default function AdminChatReadOnly() {
   const [isVerifyingAdmin, setIsVerifyingAdmin] = useState(false);
   const [chatRequest, setChatRequest] = useState<any>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const { containerRef, onScroll, loadOlder, hasOlder, loadingOlder, setPagination, consumePrepended } =
+    useOlderMessages<Message>({
+      setMessages,
+      fetchOlder: (before) => adminApi.viewChatReadOnly(roomId!, before),
+    });
 
   useEffect(() => {
     if (roomId) {
@@ -68,7 +74,9 @@ export default function AdminChatReadOnly() {
   }, [roomId]);
 
   useEffect(() => {
-    messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
+    if (!consumePrepended()) {
+      messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
+    }
   }, [messages]);
 
   const loadChatData = async () => {
@@ -79,7 +87,9 @@ export default function AdminChatReadOnly() {
       const data = await adminApi.viewChatReadOnly(roomId);
 
       setRoom(data.room);
+      // Newest page first; older pages load when scrolling up
       setMessages(data.messages || []);
+      setPagination(data.pagination);
       setParticipants(data.participants || []);
       setIsReadOnly(data.is_readonly !== false);
       setIsVerifyingAdmin(data.is_verifying_admin || false);
@@ -201,7 +211,14 @@ export default function AdminChatReadOnly() {
             </div>
 
             {/* Messages Area */}
-            <div className="flex-1 overflow-y-auto p-6 space-y-4 bg-gray-50">
+            <div ref={containerRef} onScroll={onScroll} className="flex-1 overflow-y-auto p-6 space-y-4 bg-gray-50">
+              {hasOlder && (
+                <div className="flex justify-center">
+                  <Button variant="ghost" size="sm" onClick={loadOlder} disabled={loadingOlder}>
+                    {loadingOlder ? 'Loading...' : 'Load older messages'}
+                  </Button>
+                </div>
+              )}
               {messages.length === 0 ? (
                 <div className="flex items-center justify-center h-full">
                   <div className="text-center text-muted-foreground">
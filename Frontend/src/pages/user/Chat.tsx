@@ -11,6 +11,7 @@ import { chatApi } from '@/api/chatApi';
 import { useAuth } from '@/lib/auth';
 import { useToast } from '@/hooks/use-toast';
 import { useChatSSE } from '@/hooks/useChatSSE';
+import { useOlderMessages } from '@/hooks/useOlderMessages';
 import { format } from 'date-fns';
 import { getImageUrl } from '@/services/api';
 import { getBaseUrl } from '@/config/api';
@@ -235,6 +236,12 @@ export default function Chat() {
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const typingTimeoutRef = useRef<NodeJS.Timeout | null>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
+  const { containerRef, onScroll, loadOlder, hasOlder, loadingOlder, setPagination, consumePrepended } =
+    useOlderMessages<Message>({
+      setMessages,
+      fetchOlder: (before) =>
+        chatApi.getRoomMessagesPage((room?.room_id || room?.roomId || room?.id || roomId)!.toString(), before),
+    });
 
   // Server-Sent Events (SSE) connection - simpler and more reliable than WebSocket
   const { isConnected, sendMessage: sendSSEMessage } = useChatSSE({
@@ -277,7 +284,9 @@ export default function Chat() {
   }, [roomId]);
 
   useEffect(() => {
-    messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
+    if (!consumePrepended()) {
+      messagesEndRef.current?.scrollIntoView({ behavior: 'smooth' });
+    }
   }, [messages]);
 
   const loadRoom = async () => {
@@ -315,10 +324,11 @@ export default function Chat() {
         if (other) setOtherUser(other);
       }
 
-      // Load messages
+      // Load the newest page of messages; older pages load when scrolling up
       const actualRoomId = roomData.room_id || roomData.roomId || roomData.id;
-      const messagesData = await chatApi.getRoomMessages(actualRoomId.toString());
-      setMessages(messagesData || []);
+      const page = await chatApi.getRoomMessagesPage(actualRoomId.toString());
+      setMessages(page.messages || []);
+      setPagination(page.pagination);
     } catch (error: any) {
       toast({
         title: 'Error',
@@ -554,7 +564,14 @@ export default function Chat() {
               </CardHeader>
 
               {/* Messages */}
-              <CardContent className="flex-1 overflow-y-auto p-4 space-y-4">
+              <CardContent ref={containerRef} onScroll={onScroll} className="flex-1 overflow-y-auto p-4 space-y-4">
+                {hasOlder && (
+                  <div className="flex justify-center">
+                    <Button variant="ghost" size="sm" onClick={loadOlder} disabled={loadingOlder}>
+                      {loadingOlder ? 'Loading...' : 'Load older messages'}
+                    </Button>
+                  </div>
+                )}
                 {messages.map((message) => {
                   const isOwn = message.sender.id === user?.id;
                   return (
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AdminLog, SystemSettings, DashboardStats
+from .models import AdminLog, ArchivedAdminLog, DailyMetric, ModerationLease, SystemSettings, DashboardStats
 
 
 @admin.register(AdminLog)
@@ -10,6 +10,26 @@ class AdminLogAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
 
 
+@admin.register(ArchivedAdminLog)
+class ArchivedAdminLogAdmin(admin.ModelAdmin):
+    list_display = ('admin', 'action', 'model_type', 'object_id', 'created_at', 'archived_at')
+    list_filter = ('action', 'model_type')
+    search_fields = ('admin__email', 'admin__name', 'description')
+
+
+@admin.register(ModerationLease)
+class ModerationLeaseAdmin(admin.ModelAdmin):
+    list_display = ('item_type', 'object_id', 'admin', 'leased_at', 'expires_at')
+    list_filter = ('item_type',)
+
+
+@admin.register(DailyMetric)
+class DailyMetricAdmin(admin.ModelAdmin):
+    list_display = ('date', 'metric', 'value', 'computed_at')
+    list_filter = ('metric',)
+    date_hierarchy = 'date'
+
+
 @admin.register(SystemSettings)
 class SystemSettingsAdmin(admin.ModelAdmin):
     list_display = ('key', 'value', 'updated_by', 'updated_at')
@@ -0,0 +1,209 @@
+"""
+Admin audit log: buffered writes, archival and cursor paging.
+
+log_action() does not insert immediately. Entries are queued with
+transaction.on_commit (so an action that rolls back leaves no log row) and,
+inside a request, collected until AdminLogBufferMiddleware writes them all
+with one bulk_create once the view returns. Outside a request (management
+commands, shell) each entry is written as soon as its transaction commits.
+Set ADMIN_LOG_BUFFERED = False to write every entry synchronously; tests
+always do (TestCase never commits, so on_commit callbacks would never run).
+If the buffered INSERT fails, the entries are saved one by one and any that
+still fail are reported with their content.
+
+Rows older than ADMIN_LOG_ARCHIVE_AFTER_DAYS are moved to ArchivedAdminLog
+in batches (`manage.py archive_admin_logs`), so the live table and its
+indexes only cover recent activity. Log pages are ordered by (created_at, id)
+and read the archive only once a page runs past the live rows.
+"""
+import base64
+import traceback
+from datetime import datetime, timedelta
+from asgiref.local import Local
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import AdminLog, ArchivedAdminLog
+
+DEFAULT_LOG_PAGE_SIZE = 50
+MAX_LOG_PAGE_SIZE = 200
+
+ARCHIVED_FIELDS = [
+    'id', 'admin_id', 'action', 'model_type', 'object_id', 'description',
+    'changes', 'ip_address', 'created_at',
+]
+
+_state = Local()
+
+
+def buffering_enabled():
+    return getattr(settings, 'ADMIN_LOG_BUFFERED', True) and not getattr(settings, 'TESTING', False)
+
+
+def _enqueue(entry):
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        entry.save()
+    else:
+        pending.append(entry)
+
+
+def log_action(admin, action, model_type, object_id, description, changes=None, ip_address=None):
+    """Record an admin action; returns the (possibly not yet saved) AdminLog."""
+    entry = AdminLog(
+        admin=admin, action=action, model_type=model_type, object_id=object_id,
+        description=description, changes=changes or {}, ip_address=ip_address
+    )
+    if not buffering_enabled():
+        entry.save()
+    else:
+        # Runs right away in autocommit mode, after COMMIT inside atomic()
+        transaction.on_commit(lambda: _enqueue(entry))
+    return entry
+
+
+def start_buffer():
+    _state.pending = []
+
+
+def flush():
+    """Write every buffered entry with one bulk_create; returns how many were written."""
+    pending = getattr(_state, 'pending', None) or []
+    if not pending:
+        return 0
+    _state.pending = []
+    try:
+        AdminLog.objects.bulk_create(pending, batch_size=500)
+        return len(pending)
+    except Exception as e:
+        print(f"Error writing {len(pending)} admin logs in bulk, saving them one by one: {e}")
+        return _save_each(pending)
+
+
+def _save_each(entries):
+    written = 0
+    for entry in entries:
+        try:
+            with transaction.atomic():
+                entry.pk = None
+                entry.save()
+            written += 1
+        except Exception as e:
+            print(
+                f"Lost admin log: admin={entry.admin_id} action={entry.action} "
+                f"{entry.model_type}#{entry.object_id} ({entry.description}): {e}"
+            )
+            print(traceback.format_exc())
+    return written
+
+
+def stop_buffer():
+    try:
+        flush()
+    finally:
+        _state.pending = None
+
+
+class AdminLogBufferMiddleware:
+    """Collects the request's AdminLog entries and writes them in one INSERT."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start_buffer()
+        try:
+            return self.get_response(request)
+        finally:
+            stop_buffer()
+
+
+def archivable_logs(older_than_days=None):
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'ADMIN_LOG_ARCHIVE_AFTER_DAYS', 180)
+    return AdminLog.objects.filter(created_at__lt=timezone.now() - timedelta(days=older_than_days))
+
+
+def archive_logs(queryset, batch_size=1000):
+    """Move the logs in `queryset` to the archive, one transaction per batch.
+
+    Returns the number of rows moved.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by('id').values(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                break
+            ArchivedAdminLog.objects.bulk_create(
+                [ArchivedAdminLog(**row) for row in rows],
+                ignore_conflicts=True,
+            )
+            AdminLog.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+        if len(rows) < batch_size:
+            break
+    return moved
+
+
+def filter_logs(queryset, query_params):
+    """Apply the ?action=, ?model_type= and ?admin= filters."""
+    for param in ('action', 'model_type'):
+        if query_params.get(param):
+            queryset = queryset.filter(**{param: query_params[param]})
+    if query_params.get('admin'):
+        queryset = queryset.filter(admin_id=int(query_params['admin']))
+    return queryset
+
+
+def encode_cursor(log):
+    raw = f'{log.created_at.isoformat()}|{log.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(token):
+    """Cursor token -> (created_at, id); raises ValueError."""
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(token.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(log_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def wants_archive(query_params):
+    return str(query_params.get('include_archived', '')).lower() in ('1', 'true', 'yes')
+
+
+def paginate_logs(queryset, query_params, archive_queryset=None):
+    """Return (logs, page_info) for a newest-first page paged with ?before=<cursor>&limit=N.
+
+    Pages walk the (created_at, id) index, so deep pages cost the same as the
+    first. Archived rows are always older than live ones; `archive_queryset`
+    is read only when the live rows run out.
+    """
+    try:
+        limit = int(query_params.get('limit') or DEFAULT_LOG_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = DEFAULT_LOG_PAGE_SIZE
+    limit = max(1, min(limit, MAX_LOG_PAGE_SIZE))
+    before = query_params.get('before')
+    if before:
+        created_at, log_id = decode_cursor(before)
+        older = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=log_id)
+        queryset = queryset.filter(older)
+        if archive_queryset is not None:
+            archive_queryset = archive_queryset.filter(older)
+
+    logs = list(queryset.order_by('-created_at', '-id')[:limit + 1])
+    if len(logs) <= limit and archive_queryset is not None:
+        logs += list(archive_queryset.order_by('-created_at', '-id')[:limit + 1 - len(logs)])
+    has_more = len(logs) > limit
+    logs = logs[:limit]
+    page_info = {
+        'limit': limit,
+        'has_more': has_more,
+        # Pass as ?before= to load the next (older) page
+        'next_before': encode_cursor(logs[-1]) if has_more else None,
+    }
+    return logs, page_info
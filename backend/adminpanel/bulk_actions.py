@@ -0,0 +1,213 @@
+"""
+Bulk moderation decisions.
+
+Each function decides a list of objects in one transaction with a fixed
+number of queries: rows are locked and loaded once, changed with
+bulk_update, and the Notification rows are written with bulk_create. AdminLog
+rows go through the buffered writer (adminpanel.audit), so they are inserted
+together after commit. Pet reports another admin holds in the moderation queue
+are skipped (see adminpanel.moderation) and everything decided is released from it.
+
+Every function returns {'updated': [ids], 'skipped': {id: reason}, 'not_found': [ids]}.
+"""
+import json
+from django.db import transaction
+from django.utils import timezone
+from .audit import log_action
+from .counters import record_bulk_update
+from .models import ModerationLease
+
+MAX_BULK_IDS = 500
+
+
+def parse_ids(value):
+    """Validate a list of ids from a request body; raises ValueError."""
+    if not isinstance(value, list) or not value:
+        raise ValueError('ids must be a non-empty list')
+    if len(value) > MAX_BULK_IDS:
+        raise ValueError(f'At most {MAX_BULK_IDS} ids per request')
+    try:
+        return list(dict.fromkeys(int(i) for i in value))
+    except (TypeError, ValueError):
+        raise ValueError('ids must be integers')
+
+
+def parse_approved(value):
+    """Validate the `approved` flag of a request body; raises ValueError."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', '1', 'yes'):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError('approved must be true or false')
+
+
+def approved_status(pet):
+    """adoption_status a pending report gets when it is approved."""
+    if pet.adoption_status != 'Pending':
+        return pet.adoption_status
+    # Found pets have found_date set, lost pets don't
+    return 'Found' if pet.found_date is not None else 'Lost'
+
+
+def _split(item_type, model, ids, admin, queryset=None):
+    """Lock and load the objects; return (objects, skipped, not_found).
+
+    `item_type` is the moderation queue type, or None for objects the queue doesn't hand out.
+    """
+    queryset = queryset if queryset is not None else model.objects.all()
+    objects = {obj.id: obj for obj in queryset.select_for_update().filter(id__in=ids)}
+    leased = {}
+    if item_type is not None:
+        leased = dict(
+            ModerationLease.objects.filter(
+                item_type=item_type, object_id__in=list(objects), expires_at__gt=timezone.now()
+            ).exclude(admin=admin).values_list('object_id', 'admin_id')
+        )
+    skipped = {object_id: f'Being reviewed by admin {admin_id}' for object_id, admin_id in leased.items()}
+    not_found = [i for i in ids if i not in objects]
+    return [objects[i] for i in ids if i in objects and i not in leased], skipped, not_found
+
+
+def _log(admin, action, model_type, objects, description, ip_address):
+    # Buffered until commit and written together with the request's other logs
+    for obj in objects:
+        log_action(admin, action, model_type, obj.id, description(obj), ip_address=ip_address)
+
+
+def approve_pets(admin, ids, ip_address=None):
+    from pets.models import Pet
+    from notifications.models import Notification
+
+    with transaction.atomic():
+        pets, skipped, not_found = _split('pet', Pet, ids, admin, Pet.objects.select_related('posted_by'))
+        for pet in pets:
+            pet.is_verified = True
+            pet.adoption_status = approved_status(pet)
+        Pet.objects.bulk_update(pets, ['is_verified', 'adoption_status'])
+        record_bulk_update(pets)
+        _log(admin, 'APPROVE', 'Pet', pets, lambda pet: f'Approved pet: {pet.name}', ip_address)
+
+        # One query for the approval notifications that already exist
+        notify = [pet for pet in pets if pet.posted_by_id and pet.posted_by_id != admin.id]
+        already_notified = set(
+            Notification.objects.filter(
+                related_pet_id__in=[pet.id for pet in notify],
+                notification_type__in=['pet_approved', 'pet_verified'],
+                is_read=False,
+            ).values_list('user_id', 'related_pet_id')
+        )
+        Notification.objects.bulk_create([
+            Notification(
+                user_id=pet.posted_by_id,
+                title='Pet Report Approved!',
+                message=(
+                    f'Your {"lost" if pet.adoption_status == "Lost" else "found" if pet.adoption_status == "Found" else "available for adoption"} '
+                    f'pet report for "{pet.name}" has been approved and is now live!'
+                ),
+                notification_type='pet_approved',
+                link_target=f'/pets/{pet.id}',
+                related_pet_id=pet.id,
+            )
+            for pet in notify if (pet.posted_by_id, pet.id) not in already_notified
+        ])
+        ModerationLease.objects.filter(item_type='pet', object_id__in=[pet.id for pet in pets]).delete()
+    return {'updated': [pet.id for pet in pets], 'skipped': skipped, 'not_found': not_found}
+
+
+def reject_pets(admin, ids, reason='No reason provided', ip_address=None):
+    from pets.models import Pet
+    from notifications.models import Notification
+
+    with transaction.atomic():
+        pets, skipped, not_found = _split('pet', Pet, ids, admin)
+        _log(admin, 'REJECT', 'Pet', pets, lambda pet: f'Rejected pet: {pet.name}. Reason: {reason}', ip_address)
+        Notification.objects.bulk_create([
+            Notification(
+                user_id=pet.posted_by_id,
+                title='Pet Report Rejected',
+                message=f'Your pet report for "{pet.name}" was rejected. Reason: {reason}',
+                notification_type='admin_announcement',
+                link_target=f'/pets/{pet.id}',
+                related_pet_id=pet.id,
+            )
+            for pet in pets if pet.posted_by_id
+        ])
+        ModerationLease.objects.filter(item_type='pet', object_id__in=[pet.id for pet in pets]).delete()
+    return {'updated': [pet.id for pet in pets], 'skipped': skipped, 'not_found': not_found}
+
+
+def verify_volunteers(admin, ids, approved, notes='', ip_address=None):
+    from users.models import User, Volunteer
+
+    now = timezone.now()
+    with transaction.atomic():
+        volunteers, skipped, not_found = _split(None, Volunteer, ids, admin)
+        fields = ['verification_notes', 'updated_at']
+        for volunteer in volunteers:
+            volunteer.verification_notes = notes
+            volunteer.updated_at = now
+            if approved:
+                volunteer.verified_by = admin
+        if approved:
+            fields.append('verified_by')
+            User.objects.filter(
+                id__in=[v.user_id for v in volunteers]
+            ).update(volunteer_verified=True)
+        Volunteer.objects.bulk_update(volunteers, fields)
+        _log(
+            admin, 'VERIFY' if approved else 'REJECT', 'Volunteer', volunteers,
+            lambda v: f'{"Verified" if approved else "Rejected"} volunteer #{v.id}. Notes: {notes}',
+            ip_address
+        )
+    return {'updated': [v.id for v in volunteers], 'skipped': skipped, 'not_found': not_found}
+
+
+def shelter_verification_notes(shelter, notes, verification_params):
+    """verification_notes for an approved shelter (appends the checked parameters)."""
+    if not verification_params:
+        return notes
+    verification_info = {
+        'verification_params': verification_params,
+        'notes': notes,
+        'verified_count': sum(1 for v in verification_params.values() if v),
+    }
+    if notes:
+        return f"{notes}\n\nVerification Details: {json.dumps(verification_info)}"
+    return f"Verification Details: {json.dumps(verification_info)}"
+
+
+def verify_shelters(admin, ids, approved, notes='', verification_params=None, ip_address=None):
+    """Approving requires the same >= 2 checked verification_params as verify_shelter."""
+    from users.models import Shelter, User
+
+    verification_params = verification_params or {}
+    if not isinstance(verification_params, dict):
+        raise ValueError('verification_params must be an object')
+    if approved and sum(1 for v in verification_params.values() if v) < 2:
+        raise ValueError('At least 2 verification parameters must be checked')
+
+    now = timezone.now()
+    with transaction.atomic():
+        shelters, skipped, not_found = _split(None, Shelter, ids, admin)
+        fields = ['verification_notes', 'updated_at']
+        for shelter in shelters:
+            shelter.updated_at = now
+            if approved:
+                shelter.is_verified = True
+                shelter.verified_by = admin
+                shelter.verified_at = now
+                shelter.verification_notes = shelter_verification_notes(shelter, notes, verification_params)
+            else:
+                shelter.verification_notes = notes
+        if approved:
+            fields += ['is_verified', 'verified_by', 'verified_at']
+            User.objects.filter(id__in=[s.user_id for s in shelters]).update(shelter_verified=True)
+        Shelter.objects.bulk_update(shelters, fields)
+        _log(
+            admin, 'VERIFY' if approved else 'REJECT', 'Shelter', shelters,
+            lambda s: f'{"Verified" if approved else "Rejected"} shelter: {s.name}. Notes: {notes}',
+            ip_address
+        )
+    return {'updated': [s.id for s in shelters], 'skipped': skipped, 'not_found': not_found}
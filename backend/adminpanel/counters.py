@@ -0,0 +1,129 @@
+"""
+Incrementally maintained DashboardStats counters.
+
+Every tracked model maps each counter column to a predicate over one row.
+Instances remember which counters they contributed to when loaded (post_init);
+on save or delete the difference is applied to the DashboardStats row as a
+single UPDATE ... SET col = col + delta, so the dashboard never recounts on
+read. See adminpanel.signals for the receivers.
+
+Writes that bypass model signals (queryset.update, bulk_update) are not seen
+unless the caller passes the instances to record_bulk_update(). The
+`reconcile_dashboard_stats` command recounts everything to correct that drift.
+
+The "last 7 days" figures can't be kept incrementally (rows age out without
+any write), so recent_activity() counts them on read, one indexed range COUNT
+per table.
+"""
+from datetime import timedelta
+from django.db.models import F
+from django.utils import timezone
+
+RECENT_DAYS = 7
+
+
+def recent_activity():
+    """Pets created and users joined in the last RECENT_DAYS days (two indexed COUNTs)."""
+    from pets.models import Pet
+    from users.models import User
+    since = timezone.now() - timedelta(days=RECENT_DAYS)
+    return {
+        'pets_last_7_days': Pet.objects.filter(created_at__gte=since).count(),
+        'users_last_7_days': User.objects.filter(date_joined__gte=since).count(),
+    }
+
+
+# app_label.ModelName -> {DashboardStats field: predicate(instance)}
+COUNTERS = {
+    'pets.Pet': {
+        'total_pets': lambda pet: True,
+        'pending_pets': lambda pet: pet.adoption_status == 'Pending',
+        'found_pets': lambda pet: pet.adoption_status == 'Found',
+        'lost_pets': lambda pet: pet.adoption_status == 'Lost',
+        'available_pets': lambda pet: pet.adoption_status == 'Available for Adoption',
+        'adopted_pets': lambda pet: pet.adoption_status == 'Adopted',
+        'reunited_pets': lambda pet: pet.adoption_status == 'Reunited',
+    },
+    'users.User': {
+        'total_users': lambda user: True,
+        'active_users': lambda user: user.is_active,
+    },
+    'pets.AdoptionApplication': {
+        'total_applications': lambda application: True,
+        'pending_applications': lambda application: application.status == 'Pending',
+    },
+    'chats.ChatRoom': {
+        'total_chats': lambda room: True,
+        'active_chats': lambda room: room.is_active,
+    },
+    'chats.ChatRequest': {
+        'pending_chat_requests': lambda chat_request: chat_request.status == 'pending',
+    },
+}
+
+# Fields the predicates read; instances loaded without them are not tracked
+TRACKED_FIELDS = {
+    'pets.Pet': {'adoption_status'},
+    'users.User': {'is_active'},
+    'pets.AdoptionApplication': {'status'},
+    'chats.ChatRoom': {'is_active'},
+    'chats.ChatRequest': {'status'},
+}
+
+
+def counted(instance):
+    """Set of counters this instance currently contributes 1 to, or None if unknown."""
+    label = instance._meta.label
+    if TRACKED_FIELDS[label] & instance.get_deferred_fields():
+        return None
+    return {field for field, predicate in COUNTERS[label].items() if predicate(instance)}
+
+
+def snapshot(instance):
+    instance._dashboard_counted = counted(instance)
+
+
+def apply_deltas(deltas):
+    """Add the non-zero deltas to the DashboardStats row in one UPDATE."""
+    from .models import DashboardStats
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if changes:
+        DashboardStats.objects.update(**changes)
+
+
+def _diff(before, after, deltas):
+    for field in after - before:
+        deltas[field] = deltas.get(field, 0) + 1
+    for field in before - after:
+        deltas[field] = deltas.get(field, 0) - 1
+
+
+def record_save(instance, created):
+    before = set() if created else getattr(instance, '_dashboard_counted', None)
+    after = counted(instance)
+    if before is not None and after is not None:
+        deltas = {}
+        _diff(before, after, deltas)
+        apply_deltas(deltas)
+    instance._dashboard_counted = after
+
+
+def record_delete(instance):
+    before = getattr(instance, '_dashboard_counted', None)
+    if before is None:
+        before = counted(instance)
+    if before:
+        apply_deltas({field: -1 for field in before})
+    instance._dashboard_counted = set()
+
+
+def record_bulk_update(instances):
+    """Apply the changes of instances written with bulk_update in one UPDATE."""
+    deltas = {}
+    for instance in instances:
+        before = getattr(instance, '_dashboard_counted', None)
+        after = counted(instance)
+        if before is not None and after is not None:
+            _diff(before, after, deltas)
+        instance._dashboard_counted = after
+    apply_deltas(deltas)
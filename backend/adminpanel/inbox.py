@@ -0,0 +1,142 @@
+"""
+Unified moderation inbox.
+
+Every kind of pending work is projected onto the same slim row
+(type, id, created_at, title, subtitle, user_id) and the projections are
+combined with UNION ALL, so one page of the inbox is a single query no matter
+how many kinds of work are waiting. Per-type totals are another single query
+(a UNION ALL of one COUNT per type).
+
+Pages are newest first and use a keyset cursor on (created_at, type, id)
+instead of offsets, so deep pages cost the same as the first one. Clients open
+the item through the type's own detail endpoint.
+"""
+import base64
+from datetime import datetime
+from django.db.models import CharField, Count, F, Q, Value
+
+DEFAULT_INBOX_PAGE_SIZE = 25
+MAX_INBOX_PAGE_SIZE = 100
+
+INBOX_TYPES = ('pet_report', 'volunteer', 'shelter', 'feeding_point', 'adoption', 'role_request')
+
+COLUMNS = ('item_type', 'item_id', 'item_created_at', 'item_title', 'item_subtitle', 'item_user_id')
+
+
+def _sources():
+    """{type: (pending queryset, created field, title field, subtitle field, user field)}."""
+    from pets.models import AdoptionApplication
+    from users.models import FeedingPoint, Shelter, Volunteer
+    from users.models_role_request import RoleRequest
+    from .moderation import pending_queryset
+
+    return {
+        'pet_report': (pending_queryset('pet'), 'created_at', 'name', 'adoption_status', 'posted_by_id'),
+        'volunteer': (Volunteer.objects.filter(verified_by__isnull=True), 'created_at', 'user__name', 'ngo_name', 'user_id'),
+        'shelter': (Shelter.objects.filter(is_verified=False), 'created_at', 'name', 'city', 'user_id'),
+        'feeding_point': (FeedingPoint.objects.filter(is_active=True), 'created_at', 'name', 'city', 'created_by_id'),
+        'adoption': (AdoptionApplication.objects.filter(status='Pending'), 'applied_at', 'pet__name', 'applicant__name', 'applicant_id'),
+        'role_request': (RoleRequest.objects.filter(status='pending'), 'created_at', 'requested_role', 'user__name', 'user_id'),
+    }
+
+
+def parse_types(value):
+    """Comma-separated ?types= value -> tuple of inbox types; raises ValueError."""
+    if not value:
+        return INBOX_TYPES
+    types = tuple(dict.fromkeys(t.strip() for t in value.split(',') if t.strip()))
+    unknown = [t for t in types if t not in INBOX_TYPES]
+    if unknown:
+        raise ValueError(f'Unknown inbox type(s): {", ".join(unknown)}')
+    return types or INBOX_TYPES
+
+
+def encode_cursor(row):
+    raw = f"{row['item_created_at'].isoformat()}|{row['item_type']}|{row['item_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(token):
+    """Cursor token -> (created_at, type, id); raises ValueError."""
+    try:
+        created_at, item_type, item_id = base64.urlsafe_b64decode(token.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), item_type, int(item_id)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def _older_than(item_type, created_field, cursor):
+    """Rows of `item_type` that sort after the cursor in (created_at, type, id) DESC order."""
+    created_at, cursor_type, cursor_id = cursor
+    condition = Q(**{f'{created_field}__lt': created_at})
+    if item_type < cursor_type:
+        condition |= Q(**{created_field: created_at})
+    elif item_type == cursor_type:
+        condition |= Q(**{created_field: created_at, 'pk__lt': cursor_id})
+    return condition
+
+
+def _projection(item_type, queryset, created_field, title, subtitle, user):
+    return queryset.order_by().annotate(
+        item_type=Value(item_type, output_field=CharField()),
+        item_id=F('pk'),
+        item_created_at=F(created_field),
+        item_title=F(title),
+        item_subtitle=F(subtitle),
+        item_user_id=F(user),
+    ).values(*COLUMNS)
+
+
+def inbox_page(types=INBOX_TYPES, before=None, limit=DEFAULT_INBOX_PAGE_SIZE):
+    """Return (rows, page_info) for one newest-first page of pending work."""
+    limit = max(1, min(limit or DEFAULT_INBOX_PAGE_SIZE, MAX_INBOX_PAGE_SIZE))
+    cursor = decode_cursor(before) if before else None
+    sources = _sources()
+
+    parts = []
+    for item_type in types:
+        queryset, created_field, title, subtitle, user = sources[item_type]
+        if cursor is not None:
+            queryset = queryset.filter(_older_than(item_type, created_field, cursor))
+        parts.append(_projection(item_type, queryset, created_field, title, subtitle, user))
+
+    combined = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+    rows = list(combined.order_by('-item_created_at', '-item_type', '-item_id')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    page_info = {
+        'limit': limit,
+        'has_more': has_more,
+        # Pass as ?before= to load the next (older) page
+        'next_before': encode_cursor(rows[-1]) if has_more else None,
+    }
+    return rows, page_info
+
+
+def inbox_counts(types=INBOX_TYPES):
+    """{type: pending count} in one query; types not asked for are omitted."""
+    sources = _sources()
+    parts = [
+        sources[item_type][0].order_by()
+        .annotate(item_type=Value(item_type, output_field=CharField()))
+        .values('item_type')
+        .annotate(n=Count('pk'))
+        .values('item_type', 'n')
+        for item_type in types
+    ]
+    combined = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+    counts = {item_type: 0 for item_type in types}
+    for row in combined:
+        counts[row['item_type']] = row['n']
+    return counts
+
+
+def serialize_row(row):
+    return {
+        'type': row['item_type'],
+        'id': row['item_id'],
+        'created_at': row['item_created_at'].isoformat() if row['item_created_at'] else None,
+        'title': row['item_title'],
+        'subtitle': row['item_subtitle'],
+        'user_id': row['item_user_id'],
+    }
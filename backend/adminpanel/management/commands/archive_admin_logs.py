@@ -0,0 +1,30 @@
+"""
+Move old admin logs to the archive table.
+Usage: python manage.py archive_admin_logs [--days 180] [--batch-size 1000] [--dry-run]
+Run it periodically (e.g. a nightly cron job).
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from adminpanel.audit import archivable_logs, archive_logs
+
+
+class Command(BaseCommand):
+    help = 'Archive admin logs older than ADMIN_LOG_ARCHIVE_AFTER_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'ADMIN_LOG_ARCHIVE_AFTER_DAYS', 180),
+            help='Archive logs older than this many days'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Logs moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be done')
+
+    def handle(self, *args, **options):
+        queryset = archivable_logs(options['days'])
+
+        if options['dry_run']:
+            self.stdout.write(f'Would archive {queryset.count()} admin logs')
+            return
+
+        moved = archive_logs(queryset, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} admin logs'))
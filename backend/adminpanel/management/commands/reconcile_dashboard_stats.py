@@ -0,0 +1,28 @@
+"""
+Recount the DashboardStats counters and report any drift.
+Usage: python manage.py reconcile_dashboard_stats
+Run it periodically (e.g. a nightly cron job): it corrects writes that
+bypassed the counter signals.
+"""
+from django.core.management.base import BaseCommand
+from django.forms.models import model_to_dict
+from adminpanel.counters import COUNTERS
+from adminpanel.models import DashboardStats
+
+
+class Command(BaseCommand):
+    help = 'Recount dashboard statistics and correct drift in the incremental counters'
+
+    def handle(self, *args, **options):
+        fields = sorted({field for counters in COUNTERS.values() for field in counters})
+        stats = DashboardStats.get_latest()
+        before = model_to_dict(stats, fields=fields)
+        stats.update_stats()
+        after = model_to_dict(stats, fields=fields)
+
+        drift = {field: after[field] - before[field] for field in fields if after[field] != before[field]}
+        for field, delta in drift.items():
+            self.stdout.write(f'{field}: {before[field]} -> {after[field]} ({delta:+d})')
+        self.stdout.write(self.style.SUCCESS(
+            f'Dashboard stats reconciled ({len(drift)} counters corrected)'
+        ))
@@ -0,0 +1,34 @@
+"""
+Roll up daily dashboard metrics into adminpanel.DailyMetric.
+Usage: python manage.py rollup_daily_metrics [--since YYYY-MM-DD] [--until YYYY-MM-DD]
+Run it daily (e.g. a cron job shortly after midnight). Without options it only
+processes the completed days that have not been rolled up yet; --since
+recomputes from that date (rows are upserted, so reruns are safe).
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from adminpanel.rollups import rollup_new_days, rollup_range
+
+
+class Command(BaseCommand):
+    help = 'Write daily metric rows for the admin dashboard trend charts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Recompute from this date (inclusive)')
+        parser.add_argument('--until', help='Stop before this date (default: today)')
+
+    def _date(self, value, option):
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'Invalid date for {option}: {value}')
+        return day
+
+    def handle(self, *args, **options):
+        until = self._date(options['until'], '--until') if options['until'] else timezone.localdate()
+
+        if options['since']:
+            days = rollup_range(self._date(options['since'], '--since'), until)
+        else:
+            days = rollup_new_days(until)
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {days} days'))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0003_dashboardstats_reunited_pets'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_type', models.CharField(choices=[('pet', 'Pet report'), ('chat_request', 'Chat request')], max_length=20)),
+                ('object_id', models.IntegerField()),
+                ('leased_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField()),
+                ('admin', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='moderation_leases', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['item_type', 'expires_at'], name='adminpanel__item_ty_ac8d0c_idx'), models.Index(fields=['admin', 'item_type'], name='adminpanel__admin_i_49fb31_idx')],
+                'constraints': [models.UniqueConstraint(fields=('item_type', 'object_id'), name='unique_moderation_lease')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0004_moderationlease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('metric', models.CharField(max_length=50)),
+                ('value', models.IntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date', 'metric'],
+                'indexes': [models.Index(fields=['metric', 'date'], name='adminpanel__metric_5195fe_idx')],
+                'constraints': [models.UniqueConstraint(fields=('date', 'metric'), name='unique_daily_metric')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('adminpanel', '0005_dailymetric'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAdminLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('DELETE', 'Delete'), ('APPROVE', 'Approve'), ('REJECT', 'Reject'), ('VERIFY', 'Verify'), ('FEATURE', 'Feature'), ('UNFEATURE', 'Unfeature')], max_length=20)),
+                ('model_type', models.CharField(choices=[('User', 'User'), ('Pet', 'Pet'), ('AdoptionApplication', 'AdoptionApplication'), ('Category', 'Category'), ('ChatRoom', 'ChatRoom'), ('Message', 'Message')], max_length=50)),
+                ('object_id', models.IntegerField()),
+                ('description', models.TextField()),
+                ('changes', models.JSONField(blank=True, default=dict)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='adminlog',
+            index=models.Index(fields=['created_at', 'id'], name='adminpanel__created_30828e_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedadminlog',
+            name='admin',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_admin_logs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedadminlog',
+            index=models.Index(fields=['created_at', 'id'], name='adminpanel__created_c7ade8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedadminlog',
+            index=models.Index(fields=['model_type', 'object_id'], name='adminpanel__model_t_388821_idx'),
+        ),
+    ]
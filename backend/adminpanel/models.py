@@ -45,12 +45,106 @@ class AdminLog(models.Model):
         indexes = [
             models.Index(fields=['admin', 'created_at']),
             models.Index(fields=['model_type', 'object_id']),
+            models.Index(fields=['created_at', 'id']),
         ]
 
     def __str__(self):
         return f"{self.admin} - {self.action} - {self.model_type} #{self.object_id}"
 
 
+class ArchivedAdminLog(models.Model):
+    """Cold-storage copy of an AdminLog row moved out of the live table.
+
+    Keeps the original id as primary key, so (created_at, id) cursors used by
+    the log API stay valid across the live table and the archive.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    admin = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='archived_admin_logs'
+    )
+    action = models.CharField(max_length=20, choices=AdminLog.ACTION_CHOICES)
+    model_type = models.CharField(max_length=50, choices=AdminLog.MODEL_CHOICES)
+    object_id = models.IntegerField()
+    description = models.TextField()
+    changes = models.JSONField(default=dict, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['model_type', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.admin} - {self.action} - {self.model_type} #{self.object_id} (archived)"
+
+
+class ModerationLease(models.Model):
+    """Temporary claim by one admin on a pending moderation item.
+
+    The moderation queue hands out the oldest unleased items and records a lease
+    per item, so concurrent admins never get the same work. Leases expire on
+    their own and are released as soon as the item is approved or rejected.
+    """
+
+    ITEM_TYPE_CHOICES = [
+        ('pet', 'Pet report'),
+        ('chat_request', 'Chat request'),
+    ]
+
+    item_type = models.CharField(max_length=20, choices=ITEM_TYPE_CHOICES)
+    object_id = models.IntegerField()
+    admin = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='moderation_leases'
+    )
+    leased_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['item_type', 'object_id'], name='unique_moderation_lease'),
+        ]
+        indexes = [
+            models.Index(fields=['item_type', 'expires_at']),
+            models.Index(fields=['admin', 'item_type']),
+        ]
+
+    def __str__(self):
+        return f"{self.item_type} #{self.object_id} leased by {self.admin_id} until {self.expires_at}"
+
+
+class DailyMetric(models.Model):
+    """One metric's count for one day, written by `manage.py rollup_daily_metrics`.
+
+    Dashboard trend charts read these rows instead of scanning Pet, Message
+    and the other source tables.
+    """
+    date = models.DateField()
+    metric = models.CharField(max_length=50)
+    value = models.IntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date', 'metric']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'metric'], name='unique_daily_metric'),
+        ]
+        indexes = [
+            models.Index(fields=['metric', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.metric}: {self.value}"
+
+
 class SystemSettings(models.Model):
     """System-wide settings model."""
     key = models.CharField(max_length=100, unique=True)
@@ -118,110 +212,79 @@ class DashboardStats(models.Model):
     
     @classmethod
     def get_latest(cls):
-        """Get the latest dashboard stats or create if none exists."""
-        stats = cls.objects.first()
+        """Get the stats row, creating and filling it on first use.
+
+        Counters are kept current by adminpanel.signals, so this is a single
+        primary-key-ordered fetch on every dashboard load.
+        """
+        stats = cls.objects.order_by('pk').first()
         if not stats:
             stats = cls.objects.create()
             stats.update_stats()
         return stats
     
     def update_stats(self):
-        """Update all statistics from database."""
+        """Recount every counter from the database (one aggregate per table).
+
+        Used on first creation and by `manage.py reconcile_dashboard_stats` to
+        correct drift from writes that bypass signals. The stored "last 7 days"
+        columns are a snapshot; to_dict() counts them live.
+        """
         from pets.models import Pet, AdoptionApplication
         from users.models import User
+        from chats.models import ChatRoom, ChatRequest
+        from django.db.models import Count, Q
+        from .counters import RECENT_DAYS
         from datetime import timedelta
-        from django.db import connection
-        
-        # Pet statistics - handle potential invalid foreign keys
-        try:
-            # Use count() which is safer than accessing related objects
-            self.total_pets = Pet.objects.count()
-            self.pending_pets = Pet.objects.filter(adoption_status='Pending').count()
-            self.found_pets = Pet.objects.filter(adoption_status='Found').count()
-            self.lost_pets = Pet.objects.filter(adoption_status='Lost').count()
-            self.available_pets = Pet.objects.filter(adoption_status='Available for Adoption').count()
-            self.adopted_pets = Pet.objects.filter(adoption_status='Adopted').count()
-            self.reunited_pets = Pet.objects.filter(adoption_status='Reunited').count()
-        except Exception as pet_error:
-            self.reunited_pets = Pet.objects.filter(adoption_status='Reunited').count()
-        except Exception:
-            self.total_pets = 0
-            self.pending_pets = 0
-            self.found_pets = 0
-            self.lost_pets = 0
-            self.available_pets = 0
-            self.adopted_pets = 0
-            self.reunited_pets = 0
         
-        # User statistics
-        try:
-            self.total_users = User.objects.count()
-            self.active_users = User.objects.filter(is_active=True).count()
-        except Exception as user_error:
-            self.active_users = User.objects.filter(is_active=True).count()
-        except Exception:
-            self.total_users = 0
-            self.active_users = 0
+        since = timezone.now() - timedelta(days=RECENT_DAYS)
+        pets = Pet.objects.aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(adoption_status='Pending')),
+            found=Count('id', filter=Q(adoption_status='Found')),
+            lost=Count('id', filter=Q(adoption_status='Lost')),
+            available=Count('id', filter=Q(adoption_status='Available for Adoption')),
+            adopted=Count('id', filter=Q(adoption_status='Adopted')),
+            reunited=Count('id', filter=Q(adoption_status='Reunited')),
+            recent=Count('id', filter=Q(created_at__gte=since)),
+        )
+        users = User.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            recent=Count('id', filter=Q(date_joined__gte=since)),
+        )
+        applications = AdoptionApplication.objects.aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status='Pending')),
+        )
+        chats = ChatRoom.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        )
         
-        # Application statistics
-        try:
-            self.total_applications = AdoptionApplication.objects.count()
-            self.pending_applications = AdoptionApplication.objects.filter(status='Pending').count()
-        except Exception as app_error:
-            self.pending_applications = AdoptionApplication.objects.filter(status='Pending').count()
-        except Exception:
-            self.total_applications = 0
-            self.pending_applications = 0
-        
-        # Chat statistics - check if table exists first
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_name = 'chats_chatroom'
-                    );
-                """)
-                chat_table_exists = cursor.fetchone()[0]
-            
-            if chat_table_exists:
-                try:
-                    from chats.models import ChatRoom, ChatRequest
-                    self.total_chats = ChatRoom.objects.count()
-                    self.active_chats = ChatRoom.objects.filter(is_active=True).count()
-                    # Count pending chat requests
-                    self.pending_chat_requests = ChatRequest.objects.filter(status='pending').count()
-                except Exception as chat_error:
-                    self.pending_chat_requests = ChatRequest.objects.filter(status='pending').count()
-                except Exception:
-                    self.total_chats = 0
-                    self.active_chats = 0
-                    self.pending_chat_requests = 0
-            else:
-                self.total_chats = 0
-                self.active_chats = 0
-                self.pending_chat_requests = 0
-        except Exception as e:
-                self.active_chats = 0
-                self.pending_chat_requests = 0
-        except Exception:
-            self.total_chats = 0
-            self.active_chats = 0
-            self.pending_chat_requests = 0
-        
-        # Recent activity
-        try:
-            week_ago = timezone.now() - timedelta(days=7)
-            self.pets_last_7_days = Pet.objects.filter(created_at__gte=week_ago).count()
-            self.users_last_7_days = User.objects.filter(date_joined__gte=week_ago).count()
-        except Exception:
-            self.pets_last_7_days = 0
-            self.users_last_7_days = 0
+        self.total_pets = pets['total']
+        self.pending_pets = pets['pending']
+        self.found_pets = pets['found']
+        self.lost_pets = pets['lost']
+        self.available_pets = pets['available']
+        self.adopted_pets = pets['adopted']
+        self.reunited_pets = pets['reunited']
+        self.pets_last_7_days = pets['recent']
+        self.total_users = users['total']
+        self.active_users = users['active']
+        self.users_last_7_days = users['recent']
+        self.total_applications = applications['total']
+        self.pending_applications = applications['pending']
+        self.total_chats = chats['total']
+        self.active_chats = chats['active']
+        self.pending_chat_requests = ChatRequest.objects.filter(status='pending').count()
         
         self.save()
     
     def to_dict(self):
         """Convert stats to dictionary format."""
+        from .counters import recent_activity
+        
         return {
             'pets': {
                 'total': self.total_pets,
@@ -257,8 +320,6 @@ class DashboardStats(models.Model):
                 'lost': self.lost_pets,
             },
             'matched': self.reunited_pets,
-            'recent_activity': {
-                'pets_last_7_days': self.pets_last_7_days,
-                'users_last_7_days': self.users_last_7_days,
-            }
+            # Counted on read: these age out without any write to count
+            'recent_activity': recent_activity(),
         }
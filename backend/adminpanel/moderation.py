@@ -0,0 +1,114 @@
+"""
+Moderation work queue shared by concurrent admins.
+
+claim_items() hands an admin a batch of the oldest pending items that nobody
+else holds and records a ModerationLease for each one. On PostgreSQL the
+candidate rows are read with SELECT ... FOR UPDATE SKIP LOCKED, so admins
+claiming at the same moment skip each other's rows instead of blocking or
+double-claiming. SQLite has no row locks; there the unique (item_type,
+object_id) constraint on the lease decides who gets a contested item.
+
+Leases expire after MODERATION_LEASE_SECONDS and are released by the
+approve/reject views, so abandoned work returns to the queue by itself.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from .models import AdminLog, ArchivedAdminLog, ModerationLease
+
+DEFAULT_CLAIM_SIZE = 10
+MAX_CLAIM_SIZE = 50
+
+
+def lease_seconds():
+    return getattr(settings, 'MODERATION_LEASE_SECONDS', 300)
+
+
+def pending_queryset(item_type):
+    """Items waiting for a moderation decision, oldest first."""
+    if item_type == 'pet':
+        from pets.models import Pet
+        # reject_pet leaves the report Pending; skip it until the poster edits it again
+        rejection = dict(
+            model_type='Pet', object_id=OuterRef('pk'), action='REJECT',
+            created_at__gte=OuterRef('updated_at')
+        )
+        return Pet.objects.filter(
+            is_verified=False, adoption_status__in=['Pending', 'Found', 'Lost']
+        ).exclude(
+            Exists(AdminLog.objects.filter(**rejection))
+        ).exclude(
+            Exists(ArchivedAdminLog.objects.filter(**rejection))
+        ).order_by('created_at', 'id')
+    if item_type == 'chat_request':
+        from chats.models import ChatRequest
+        return ChatRequest.objects.filter(status='pending').order_by('created_at', 'id')
+    raise ValueError(f'Unknown moderation item type: {item_type}')
+
+
+def claim_items(admin, item_type, size=DEFAULT_CLAIM_SIZE):
+    """Lease up to `size` items to `admin` and return (object ids, expires_at).
+
+    Leases the admin already holds are renewed and count towards `size`, so
+    calling this again simply refreshes the current batch.
+    """
+    size = max(1, min(size or DEFAULT_CLAIM_SIZE, MAX_CLAIM_SIZE))
+    pending = pending_queryset(item_type)
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=lease_seconds())
+
+    with transaction.atomic():
+        ModerationLease.objects.filter(item_type=item_type, expires_at__lte=now).delete()
+        mine = ModerationLease.objects.filter(item_type=item_type, admin=admin)
+        # Drop leases on items someone already decided
+        mine.exclude(object_id__in=pending.values('id')).delete()
+        held = mine.update(expires_at=expires_at)
+
+        wanted = size - held
+        if wanted > 0:
+            leased = ModerationLease.objects.filter(item_type=item_type, object_id=OuterRef('pk'))
+            candidates = pending.exclude(Exists(leased))
+            if connection.features.has_select_for_update_skip_locked:
+                candidates = candidates.select_for_update(skip_locked=True, of=('self',))
+            object_ids = list(candidates.values_list('id', flat=True)[:wanted])
+            ModerationLease.objects.bulk_create([
+                ModerationLease(
+                    item_type=item_type, object_id=object_id, admin=admin,
+                    leased_at=now, expires_at=expires_at
+                )
+                for object_id in object_ids
+            ], ignore_conflicts=True)
+
+        # Re-read: with ignore_conflicts some inserts may have lost to another admin
+        object_ids = list(
+            ModerationLease.objects.filter(item_type=item_type, admin=admin)
+            .order_by('object_id').values_list('object_id', flat=True)
+        )
+    return object_ids, expires_at
+
+
+def release_items(item_type, object_ids, admin=None):
+    """Return items to the queue; with `admin`, only that admin's leases are dropped."""
+    leases = ModerationLease.objects.filter(item_type=item_type, object_id__in=object_ids)
+    if admin is not None:
+        leases = leases.filter(admin=admin)
+    return leases.delete()[0]
+
+
+def lease_conflict(item_type, object_id, admin):
+    """Return the active lease another admin holds on the item, or None."""
+    return ModerationLease.objects.filter(
+        item_type=item_type, object_id=object_id, expires_at__gt=timezone.now()
+    ).exclude(admin=admin).select_related('admin').first()
+
+
+def lease_conflict_response(lease):
+    """Body for the 409 returned when acting on an item another admin is reviewing."""
+    holder = getattr(lease.admin, 'name', None) or lease.admin.email
+    return {
+        'error': f'This item is being reviewed by {holder}',
+        'leased_by': lease.admin_id,
+        'lease_expires_at': lease.expires_at.isoformat(),
+    }
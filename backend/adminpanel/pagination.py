@@ -0,0 +1,30 @@
+"""
+Page-number pagination for admin list endpoints.
+
+Admin views keep their {'data': [...]} response shape and add a 'pagination'
+block next to it, so existing dashboard code keeps working unchanged.
+"""
+from rest_framework.pagination import PageNumberPagination
+
+
+class AdminPagination(PageNumberPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_page_info(self):
+        return {
+            'count': self.page.paginator.count,
+            'page': self.page.number,
+            'page_size': self.page.paginator.per_page,
+            'total_pages': self.page.paginator.num_pages,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+
+
+def paginate(queryset, request):
+    """Return (items on the requested page, page_info) using ?page= and ?page_size=."""
+    paginator = AdminPagination()
+    items = paginator.paginate_queryset(queryset, request)
+    return items, paginator.get_page_info()
@@ -0,0 +1,128 @@
+"""
+Daily metric rollups for dashboard trend charts.
+
+Each completed day gets one DailyMetric row per metric, zero-filled, so a
+chart over a range reads (days x metrics) small rows instead of scanning the
+source tables. A day is counted with one GROUP BY query per source, and rows
+are upserted on (date, metric), so rerunning a range is safe.
+
+Metrics count events on the day they happened:
+  pets_reported[.status]   pets created (split by their status at rollup time)
+  registrations            users joined
+  adoptions                adoption applications approved (reviewed_at)
+  reunifications           pets reunited (reunited_at)
+  messages                 chat messages sent, archived ones included
+  chat_requests[.status]   chat requests created (split by status at rollup time)
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import DailyMetric
+
+ROLLUP_CHUNK_DAYS = 31
+
+PET_STATUS_KEYS = {
+    'Pending': 'pending',
+    'Found': 'found',
+    'Lost': 'lost',
+    'Available for Adoption': 'available',
+    'Adopted': 'adopted',
+    'Reunited': 'reunited',
+}
+
+
+def _sources():
+    """(metric, queryset, datetime field, split field, {split value: metric suffix})."""
+    from pets.models import AdoptionApplication, Pet
+    from users.models import User
+    from chats.models import ArchivedMessage, ChatRequest, Message
+
+    request_status_keys = {value: value for value, _ in ChatRequest.STATUS_CHOICES}
+    return [
+        ('pets_reported', Pet.objects.all(), 'created_at', 'adoption_status', PET_STATUS_KEYS),
+        ('registrations', User.objects.all(), 'date_joined', None, None),
+        ('adoptions', AdoptionApplication.objects.filter(status='Approved'), 'reviewed_at', None, None),
+        ('reunifications', Pet.objects.all(), 'reunited_at', None, None),
+        ('messages', Message.objects.all(), 'created_at', None, None),
+        ('messages', ArchivedMessage.objects.all(), 'created_at', None, None),
+        ('chat_requests', ChatRequest.objects.all(), 'created_at', 'status', request_status_keys),
+    ]
+
+
+def metric_names():
+    names = []
+    for metric, _, _, _, keys in _sources():
+        for name in [metric] + [f'{metric}.{suffix}' for suffix in (keys or {}).values()]:
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def count_days(start, end):
+    """{(date, metric): count} for events in [start, end) (dates)."""
+    counts = defaultdict(int)
+    for metric, queryset, field, split, keys in _sources():
+        group_by = ['day'] + ([split] if split else [])
+        rows = (
+            queryset.filter(**{f'{field}__gte': _day_start(start), f'{field}__lt': _day_start(end)})
+            .annotate(day=TruncDate(field))
+            .values(*group_by)
+            .annotate(n=Count('pk'))
+            .order_by()
+        )
+        for row in rows:
+            counts[(row['day'], metric)] += row['n']
+            if split and row[split] in keys:
+                counts[(row['day'], f'{metric}.{keys[row[split]]}')] += row['n']
+    return counts
+
+
+def rollup_range(start, end):
+    """Write every metric for each day in [start, end). Returns the number of days written."""
+    names = metric_names()
+    days_written = 0
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + timedelta(days=ROLLUP_CHUNK_DAYS), end)
+        counts = count_days(chunk_start, chunk_end)
+        days = [chunk_start + timedelta(days=i) for i in range((chunk_end - chunk_start).days)]
+        with transaction.atomic():
+            DailyMetric.objects.bulk_create(
+                [DailyMetric(date=day, metric=name, value=counts.get((day, name), 0)) for day in days for name in names],
+                update_conflicts=True,
+                unique_fields=['date', 'metric'],
+                update_fields=['value', 'computed_at'],
+                batch_size=500,
+            )
+        days_written += len(days)
+        chunk_start = chunk_end
+    return days_written
+
+
+def first_pending_day():
+    """The day after the last rolled-up one, or the first day with any data."""
+    last = DailyMetric.objects.aggregate(last=Max('date'))['last']
+    if last:
+        return last + timedelta(days=1)
+    earliest = [
+        queryset.aggregate(first=Min(field))['first']
+        for _, queryset, field, _, _ in _sources()
+    ]
+    earliest = [value for value in earliest if value]
+    return timezone.localdate(min(earliest)) if earliest else None
+
+
+def rollup_new_days(until=None):
+    """Roll up every completed day not written yet (today is left for tomorrow's run)."""
+    until = until or timezone.localdate()
+    start = first_pending_day()
+    if start is None or start >= until:
+        return 0
+    return rollup_range(start, until)
@@ -0,0 +1,25 @@
+"""
+Keep the DashboardStats counters current as tracked models change (see adminpanel.counters).
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save
+from .counters import COUNTERS, record_delete, record_save, snapshot
+
+
+def remember_counted(sender, instance, **kwargs):
+    snapshot(instance)
+
+
+def count_saved(sender, instance, created, **kwargs):
+    record_save(instance, created)
+
+
+def count_deleted(sender, instance, **kwargs):
+    record_delete(instance)
+
+
+for label in COUNTERS:
+    model = apps.get_model(label)
+    post_init.connect(remember_counted, sender=model, dispatch_uid=f'dashboard_counters_init_{label}')
+    post_save.connect(count_saved, sender=model, dispatch_uid=f'dashboard_counters_save_{label}')
+    post_delete.connect(count_deleted, sender=model, dispatch_uid=f'dashboard_counters_delete_{label}')
@@ -0,0 +1,106 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from pets.models import Pet
+from users.models import User
+from . import audit, moderation
+from .models import AdminLog, DashboardStats, ModerationLease
+
+
+class RejectPetAuditTests(TestCase):
+    """Rejecting a pet must leave a log row, which is what takes it out of the queue."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(email='admin@example.com', password='x', name='Admin', is_staff=True)
+        poster = User.objects.create_user(email='poster@example.com', password='x', name='Poster')
+        self.pet = Pet.objects.create(name='Bruno', adoption_status='Pending', posted_by=poster)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_reject_logs_and_leaves_the_queue(self):
+        self.assertIn(self.pet, moderation.pending_queryset('pet'))
+
+        response = self.client.post(f'/api/admin/pets/{self.pet.id}/reject', {'reason': 'Blurry photo'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(AdminLog.objects.filter(action='REJECT', model_type='Pet', object_id=self.pet.id).exists())
+        self.assertNotIn(self.pet, moderation.pending_queryset('pet'))
+
+    def test_failed_bulk_flush_saves_entries_one_by_one(self):
+        audit.start_buffer()
+        audit._enqueue(AdminLog(admin=self.admin, action='REJECT', model_type='Pet', object_id=self.pet.id, description='x'))
+        with mock.patch.object(AdminLog.objects, 'bulk_create', side_effect=RuntimeError('boom')):
+            audit.stop_buffer()
+        self.assertEqual(AdminLog.objects.filter(object_id=self.pet.id).count(), 1)
+
+
+class DashboardRecentActivityTests(TestCase):
+    """The 7-day figures age out on read, without the reconcile job."""
+
+    def test_old_rows_drop_out_of_the_last_7_days(self):
+        DashboardStats.get_latest()
+        user = User.objects.create_user(email='new@example.com', password='x', name='New')
+        pet = Pet.objects.create(name='Luna', adoption_status='Lost', posted_by=user)
+        recent = DashboardStats.get_latest().to_dict()['recent_activity']
+        self.assertEqual(recent, {'pets_last_7_days': 1, 'users_last_7_days': 1})
+
+        eight_days_ago = timezone.now() - timedelta(days=8)
+        Pet.objects.filter(pk=pet.pk).update(created_at=eight_days_ago)
+        User.objects.filter(pk=user.pk).update(date_joined=eight_days_ago)
+        recent = DashboardStats.get_latest().to_dict()['recent_activity']
+        self.assertEqual(recent, {'pets_last_7_days': 0, 'users_last_7_days': 0})
+
+
+class ClaimItemsTests(TestCase):
+    """Concurrent admins get disjoint batches; expired or released leases go back to the queue."""
+
+    def setUp(self):
+        self.admins = [
+            User.objects.create_user(email=f'admin{n}@example.com', password='x', name=f'Admin {n}', is_staff=True)
+            for n in range(3)
+        ]
+        poster = User.objects.create_user(email='poster@example.com', password='x', name='Poster')
+        self.pet_ids = [
+            Pet.objects.create(name=f'Pet {n}', adoption_status='Pending', posted_by=poster).id
+            for n in range(5)
+        ]
+
+    def test_admins_get_disjoint_batches(self):
+        first, _ = moderation.claim_items(self.admins[0], 'pet', 3)
+        second, _ = moderation.claim_items(self.admins[1], 'pet', 3)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(set(first) | set(second), set(self.pet_ids))
+        # Claiming again renews the same batch instead of taking more
+        self.assertEqual(moderation.claim_items(self.admins[0], 'pet', 3)[0], first)
+
+    def test_expired_leases_return_to_the_queue(self):
+        first, _ = moderation.claim_items(self.admins[0], 'pet', 5)
+        self.assertEqual(moderation.claim_items(self.admins[1], 'pet', 5)[0], [])
+
+        ModerationLease.objects.filter(admin=self.admins[0]).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertIsNone(moderation.lease_conflict('pet', first[0], self.admins[1]))
+        self.assertEqual(moderation.claim_items(self.admins[1], 'pet', 5)[0], sorted(first))
+
+    def test_released_items_can_be_claimed_by_others(self):
+        first, _ = moderation.claim_items(self.admins[0], 'pet', 5)
+        self.assertIsNotNone(moderation.lease_conflict('pet', first[0], self.admins[1]))
+
+        moderation.release_items('pet', first[:2], self.admins[0])
+
+        self.assertEqual(moderation.claim_items(self.admins[1], 'pet', 5)[0], sorted(first[:2]))
+
+    def test_deciding_a_claimed_item_as_another_admin_conflicts(self):
+        first, _ = moderation.claim_items(self.admins[0], 'pet', 1)
+        client = APIClient()
+        client.force_authenticate(self.admins[1])
+
+        response = client.post(f'/api/admin/pets/{first[0]}/reject', {'reason': 'x'}, format='json')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['leased_by'], self.admins[0].id)
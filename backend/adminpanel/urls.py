@@ -1,14 +1,21 @@
 from django.urls import path
-from . import views
+from . import views, views_export
 
 urlpatterns = [
     # Dashboard and stats
     path('dashboard', views.dashboard_stats, name='admin-dashboard'),
+    path('dashboard/trends', views.dashboard_trends, name='admin-dashboard-trends'),
+    path('metrics/requests', views.request_metrics, name='admin-request-metrics'),
     
     # Pending reports
     path('pending/', views.pending_reports, name='admin-pending-reports'),
     path('pending-requests/', views.pending_requests, name='admin-pending-requests'),
     
+    # Moderation queue (leased batches of pending pet reports / chat requests)
+    path('moderation/claim', views.moderation_claim, name='admin-moderation-claim'),
+    path('moderation/release', views.moderation_release, name='admin-moderation-release'),
+    path('moderation/inbox', views.moderation_inbox, name='admin-moderation-inbox'),
+    
     # Adoption requests
     path('adoptions/pending', views.pending_adoptions, name='admin-pending-adoptions'),
     path('adoptions/<int:pet_id>/accept', views.accept_adoption_request, name='admin-accept-adoption'),
@@ -16,6 +23,7 @@ urlpatterns = [
     # Chats
     path('chats', views.all_chats, name='admin-all-chats'),
     path('chats/stats', views.chat_stats, name='admin-chat-stats'),
+    path('chats/search', views.search_chat_messages, name='admin-search-chat-messages'),
     path('chats/requests', views.chat_requests, name='admin-chat-requests'),
     path('chats/request/', views.admin_create_chat_request, name='admin-create-chat-request'),
     path('chats/requests/<int:request_id>/respond', views.respond_to_chat_request, name='admin-respond-chat-request'),
@@ -29,6 +37,8 @@ urlpatterns = [
     path('pets', views.all_pets, name='admin-all-pets'),
     path('pets/<int:pet_id>/approve', views.approve_pet, name='admin-approve-pet'),
     path('pets/<int:pet_id>/reject', views.reject_pet, name='admin-reject-pet'),
+    path('pets/bulk-approve', views.bulk_approve_pets, name='admin-bulk-approve-pets'),
+    path('pets/bulk-reject', views.bulk_reject_pets, name='admin-bulk-reject-pets'),
     
     # Lost/Found
     path('lost', views.all_lost, name='admin-all-lost'),
@@ -38,6 +48,11 @@ urlpatterns = [
     path('logs', views.all_logs, name='admin-all-logs'),
     path('logs/', views.AdminLogListView.as_view(), name='admin-log-list'),
     path('logs/create/', views.log_admin_action, name='log-admin-action'),
+    # Streaming exports (NDJSON or CSV, optionally gzipped)
+    path('export/pets', views_export.export_pets, name='admin-export-pets'),
+    path('export/users', views_export.export_users, name='admin-export-users'),
+    path('export/applications', views_export.export_applications, name='admin-export-applications'),
+    path('export/logs', views_export.export_logs, name='admin-export-logs'),
     path('settings/', views.SystemSettingsListView.as_view(), name='system-settings-list'),
     path('settings/<str:key>/', views.SystemSettingsDetailView.as_view(), name='system-settings-detail'),
 ]
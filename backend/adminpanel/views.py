@@ -6,6 +6,7 @@ from django.utils import timezone
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
+from .audit import log_action
 from .models import AdminLog, SystemSettings
 from .serializers import AdminLogSerializer, SystemSettingsSerializer
 from pets.models import Pet, AdoptionApplication
@@ -14,12 +15,29 @@ from users.models import User
 
 
 class AdminLogListView(generics.ListAPIView):
-    """List all admin logs."""
+    """List admin logs newest first, cursor-paged (see adminpanel.audit.paginate_logs)."""
     queryset = AdminLog.objects.select_related('admin').all()
     serializer_class = AdminLogSerializer
     permission_classes = [IsAdminUser]
     filterset_fields = ['action', 'model_type', 'admin']
 
+    def list(self, request, *args, **kwargs):
+        from .audit import filter_logs, paginate_logs, wants_archive
+        from .models import ArchivedAdminLog
+
+        try:
+            queryset = filter_logs(self.get_queryset(), request.query_params)
+            archive = None
+            if wants_archive(request.query_params):
+                archive = filter_logs(ArchivedAdminLog.objects.select_related('admin'), request.query_params)
+            logs, page_info = paginate_logs(queryset, request.query_params, archive)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'results': self.get_serializer(logs, many=True).data,
+            'pagination': page_info,
+        })
+
 
 class SystemSettingsListView(generics.ListCreateAPIView):
     """List and create system settings."""
@@ -61,6 +79,7 @@ def log_admin_action(request):
 def dashboard_stats(request):
     """Get dashboard statistics for admin."""
     try:
+        from .counters import recent_activity
         from .models import DashboardStats
         import traceback
         
@@ -157,10 +176,7 @@ def dashboard_stats(request):
                         'lost': pet_agg['lost'],
                     },
                     'matched': pet_agg['reunited'],
-                    'recent_activity': {
-                        'pets_last_7_days': 0,
-                        'users_last_7_days': 0,
-                    }
+                    'recent_activity': recent_activity(),
                 }
                 
                 return Response({
@@ -180,17 +196,8 @@ def dashboard_stats(request):
                     }
                 })
         
-        # Update stats if older than 5 minutes (cache for performance)
-        from datetime import timedelta
-        if stats:
-            try:
-                if not stats.last_updated or (timezone.now() - stats.last_updated) > timedelta(seconds=5):
-                    stats.updated_by = request.user
-                    stats.update_stats()
-                    stats.save()  # Save after updating
-            except Exception:
-                # Continue with existing stats even if update fails
-                pass
+        # Counters are maintained incrementally (adminpanel.counters); only the
+        # 7-day figures are counted on read, in to_dict()
         
         # Convert to dict with error handling
         if stats:
@@ -238,6 +245,101 @@ def dashboard_stats(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def dashboard_trends(request):
+    """Daily metric series for dashboard charts, read from the DailyMetric rollups.
+    
+    ?metrics=pets_reported,messages (default: all), ?start= / ?end= (ISO dates,
+    default: the last 30 days), ?interval=day|week|month. Days that have not been
+    rolled up yet (including today) are absent; see `manage.py rollup_daily_metrics`.
+    """
+    try:
+        from collections import defaultdict
+        from django.utils.dateparse import parse_date
+        from .models import DailyMetric
+        from .rollups import metric_names
+        
+        params = request.query_params
+        known = metric_names()
+        metrics = [m for m in params.get('metrics', '').split(',') if m] or known
+        unknown = [m for m in metrics if m not in known]
+        if unknown:
+            return Response(
+                {'error': f"Unknown metrics: {', '.join(unknown)}", 'metrics': known},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        end = parse_date(params['end']) if params.get('end') else timezone.localdate()
+        start = parse_date(params['start']) if params.get('start') else end - timedelta(days=29)
+        if start is None or end is None or start > end:
+            return Response(
+                {'error': 'start and end must be ISO dates with start <= end'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        interval = params.get('interval', 'day')
+        buckets = {
+            'day': lambda day: day,
+            'week': lambda day: day - timedelta(days=day.weekday()),
+            'month': lambda day: day.replace(day=1),
+        }
+        if interval not in buckets:
+            return Response(
+                {'error': 'interval must be day, week or month'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        series = {metric: defaultdict(int) for metric in metrics}
+        rows = DailyMetric.objects.filter(
+            metric__in=metrics, date__gte=start, date__lte=end
+        ).values_list('metric', 'date', 'value')
+        for metric, day, value in rows:
+            series[metric][buckets[interval](day)] += value
+        
+        return Response({
+            'data': {
+                metric: [{'date': day.isoformat(), 'value': value} for day, value in sorted(points.items())]
+                for metric, points in series.items()
+            },
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'interval': interval,
+        })
+    except Exception as e:
+        import traceback
+        print(f"Error in dashboard_trends: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def request_metrics(request):
+    """Per-endpoint request metrics recorded by RequestMetricsMiddleware in this process.
+    
+    GET: latency percentiles and histogram, queries, SQL/view/render time and
+    response size over the most recent requests of each endpoint, slowest p95
+    first. ?endpoint= keeps endpoints containing the given text (e.g. "pets").
+    DELETE: clear the recorded samples.
+    """
+    from django.conf import settings
+    from backend import instrumentation
+    
+    if request.method == 'DELETE':
+        instrumentation.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response({
+        'data': instrumentation.snapshot(request.query_params.get('endpoint') or None),
+        'budget_ms': getattr(settings, 'REQUEST_METRICS_BUDGET_MS', 500),
+        'query_budget': getattr(settings, 'REQUEST_METRICS_QUERY_BUDGET', 50),
+        'histogram_bounds_ms': list(instrumentation.HISTOGRAM_BOUNDS_MS),
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def pending_reports(request):
@@ -265,17 +367,6 @@ def pending_reports(request):
             ).prefetch_related(
                 'images'
             ).order_by('-created_at')
-            
-            # Debug logging
-            print(f"[DEBUG] Found pets query - report_type={report_type}, count={queryset.count()}")
-            print(f"[DEBUG] Query filters: is_verified=False, found_date__isnull=False, status in ['Pending', 'Found']")
-            for pet in queryset[:5]:  # Log first 5
-                print(f"  - Pet ID {pet.id}: name='{pet.name}', found_date={pet.found_date}, status={pet.adoption_status}, is_verified={pet.is_verified}")
-            
-            # Also log total pending pets for debugging
-            all_pending = Pet.objects.filter(adoption_status='Pending', is_verified=False).count()
-            all_found_pending = Pet.objects.filter(adoption_status='Pending', is_verified=False, found_date__isnull=False).count()
-            print(f"[DEBUG] Total pending pets: {all_pending}, Found pending pets: {all_found_pending}")
         elif report_type == 'lost':
             # Include: Pending pets without found_date (lost pets waiting approval) OR Lost pets that aren't verified
             # Lost pets are created with adoption_status='Pending' but no found_date
@@ -293,17 +384,6 @@ def pending_reports(request):
             ).prefetch_related(
                 'images'
             ).order_by('-created_at')
-            
-            # Debug logging
-            print(f"[DEBUG] Lost pets query - report_type={report_type}, count={queryset.count()}")
-            print(f"[DEBUG] Query filters: is_verified=False, found_date__isnull=True, status in ['Pending', 'Lost']")
-            for pet in queryset[:5]:  # Log first 5
-                print(f"  - Pet ID {pet.id}: name='{pet.name}', found_date={pet.found_date}, status={pet.adoption_status}, is_verified={pet.is_verified}")
-            
-            # Also log total pending pets for debugging
-            all_pending = Pet.objects.filter(adoption_status='Pending', is_verified=False).count()
-            all_lost_pending = Pet.objects.filter(adoption_status='Pending', is_verified=False, found_date__isnull=True).count()
-            print(f"[DEBUG] Total pending pets: {all_pending}, Lost pending pets: {all_lost_pending}")
         else:
             # Get all unverified pets (Pending, Found, or Lost)
             queryset = Pet.objects.filter(
@@ -452,6 +532,41 @@ def pending_requests(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def moderation_inbox(request):
+    """All pending moderation work in one newest-first, cursor-paged list.
+    
+    Query params: types (comma-separated: pet_report, volunteer, shelter,
+    feeding_point, adoption, role_request; default all), limit (default 25,
+    max 100) and before (the next_before cursor of the previous page).
+    Each item is a slim summary; 'counts' has the pending total per type.
+    """
+    try:
+        from .inbox import inbox_counts, inbox_page, parse_types, serialize_row
+        
+        try:
+            types = parse_types(request.query_params.get('types'))
+            limit = int(request.query_params.get('limit') or 0)
+            rows, page_info = inbox_page(types, request.query_params.get('before'), limit)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'data': [serialize_row(row) for row in rows],
+            'counts': inbox_counts(types),
+            'pagination': page_info,
+        })
+    except Exception as e:
+        import traceback
+        print(f"Error in moderation_inbox: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def pending_adoptions(request):
@@ -465,86 +580,99 @@ def pending_adoptions(request):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def all_chats(request):
-    """Get all chat rooms."""
+    """Paginated overview of all chat rooms for admins.
+    
+    Filters: ?is_active=true|false, ?type=normal|claim|adoption|general,
+    ?created_after= / ?created_before= (ISO dates), ?active_after= (last update),
+    ?participant=<user id>. Ordering: ?ordering=created_at|-created_at|updated_at|-updated_at.
+    Paging: ?page= and ?page_size= (max 100).
+    
+    Participant/message counts, last activity and the last message are computed as
+    annotations, so a page costs a fixed number of queries however many rooms exist.
+    """
     try:
-        print(f"\n=== all_chats endpoint called by user {request.user.id} ({request.user.email}) ===")
-        
-        # Check if ChatRoom table exists
-        from django.db import connection
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = 'chats_chatroom'
-                );
-            """)
-            table_exists = cursor.fetchone()[0]
-        
-        print(f"Table exists: {table_exists}")
-        
-        if not table_exists:
-            print("⚠ ChatRoom table does not exist!")
-            return Response({'data': []})
-        
-        # Get ALL chat rooms - return everything for now to debug
-        from django.db.models import Q
-        
-        # Get ALL rooms first to see what we have
-        # Optimize with select_related and prefetch_related
-        # Include messages prefetch to avoid N+1 in serializer get_unread_count and get_last_message
-        from django.db.models import Prefetch, OuterRef, Subquery, Max, Count
-        
-        # We need to optimize getting last message content and unread count
-        # Prefetching messages is one way, but for large chats it loads too much
-        # Better to just prefetch the last few messages or use prefetch_related for basic optimization
-        all_rooms = ChatRoom.objects.all().select_related(
-            'user_a', 'user_b', 'chat_request', 'chat_request__pet', 'chat_request__verified_by_admin'
-        ).prefetch_related(
-            'participants',
-            'messages',         # Prefetch all messages to avoid N+1 in simple lookups
-            'messages__sender'  # Prefetch sender for messages
-        ).order_by('-created_at')
-        
-        print(f"✓ Total rooms in database: {all_rooms.count()}")
-        
-        # List all rooms for debugging
-        if all_rooms.count() > 0:
-            for room in all_rooms[:20]:
-                participants_count = room.participants.count()
-                participants_list = [p.id for p in room.participants.all()[:5]]
-                print(f"  Room {room.id}: room_id='{room.room_id}', is_active={room.is_active}, participants={participants_count} {participants_list}")
-        else:
-            print("  ⚠ No rooms found in database!")
-        
-        # For now, return ALL rooms to ensure we see verification rooms
-        # Later we can filter to only active + verification
-        rooms = all_rooms
+        from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+        from django.db.models.functions import Coalesce
+        from datetime import datetime, time
+        from django.utils.dateparse import parse_date, parse_datetime
+        from chats.serializers import ChatRoomListSerializer
+        from .pagination import paginate
+        
+        params = request.query_params
+        rooms = ChatRoom.objects.all()
+        
+        # Filters
+        if params.get('is_active') in ('true', 'false'):
+            rooms = rooms.filter(is_active=params['is_active'] == 'true')
+        chat_type = params.get('type')
+        if chat_type == 'normal':
+            rooms = rooms.filter(chat_request__isnull=True)
+        elif chat_type:
+            rooms = rooms.filter(chat_request__type=chat_type)
+        for param, lookup in (('created_after', 'created_at__gte'), ('created_before', 'created_at__lte'), ('active_after', 'updated_at__gte')):
+            value = params.get(param)
+            if value:
+                bound = parse_datetime(value)
+                if bound is None and parse_date(value):
+                    # A plain date covers the whole day
+                    bound = datetime.combine(parse_date(value), time.max if lookup.endswith('__lte') else time.min)
+                if bound is None:
+                    return Response(
+                        {'error': f'Invalid date for {param}: {value}'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                if timezone.is_naive(bound):
+                    bound = timezone.make_aware(bound)
+                rooms = rooms.filter(**{lookup: bound})
+        if params.get('participant', '').isdigit():
+            rooms = rooms.filter(Exists(
+                ChatRoom.participants.through.objects.filter(
+                    chatroom_id=OuterRef('pk'), user_id=int(params['participant'])
+                )
+            ))
+        
+        ordering = params.get('ordering', '-created_at')
+        if ordering not in ('created_at', '-created_at', 'updated_at', '-updated_at'):
+            ordering = '-created_at'
+        rooms = rooms.order_by(ordering, '-id')
+        
+        # Per-room aggregates as correlated subqueries (no join fan-out, no N+1)
+        participant_counts = ChatRoom.participants.through.objects.filter(
+            chatroom_id=OuterRef('pk')
+        ).order_by().values('chatroom_id').annotate(n=Count('id')).values('n')
+        message_counts = Message.objects.filter(
+            room_id=OuterRef('pk')
+        ).order_by().values('room_id').annotate(n=Count('id')).values('n')
+        last_message = Message.objects.filter(room_id=OuterRef('pk')).order_by('-id')
+        
+        rooms = rooms.annotate(
+            participant_count=Coalesce(Subquery(participant_counts, output_field=IntegerField()), 0),
+            message_count=Coalesce(Subquery(message_counts, output_field=IntegerField()), 0),
+            annotated_unread_count=ChatRoom.unread_count_annotation(request.user),
+            last_message_at=Subquery(last_message.values('created_at')[:1]),
+            last_message_content=Subquery(last_message.values('content')[:1]),
+            last_message_sender=Subquery(last_message.values('sender__name')[:1]),
+        )
         
-        try:
-            from chats.serializers import ChatRoomListSerializer
-            serializer = ChatRoomListSerializer(rooms, many=True, context={'request': request})
-            serialized_data = serializer.data
-            print(f"✓ Serialized {len(serialized_data)} rooms")
-            if serialized_data:
-                print(f"  First room serialized: id={serialized_data[0].get('id')}, room_id={serialized_data[0].get('room_id')}, participants={len(serialized_data[0].get('participants', []))}")
-                # Check for verification rooms in serialized data
-                verification_rooms = [r for r in serialized_data if r.get('room_id', '').startswith('admin_verification_')]
-                print(f"  Verification rooms in response: {len(verification_rooms)}")
-            else:
-                print("⚠ Serialized data is empty - check serializer for errors")
-            return Response({'data': serialized_data})
-        except Exception as ser_error:
-            import traceback
-            print(f"✗ Serialization error: {ser_error}")
-            print(traceback.format_exc())
-            # Return empty array on serialization error
-            return Response({'data': []})
+        rooms = rooms.select_related(
+            'user_a', 'user_b', 'chat_request', 'chat_request__pet',
+            'chat_request__requester', 'chat_request__target', 'chat_request__verified_by_admin',
+            'chat_request__admin_verification_room', 'chat_request__final_chat_room',
+        ).prefetch_related('participants')
+        
+        page, page_info = paginate(rooms, request)
+        serializer = ChatRoomListSerializer(page, many=True, context={'request': request})
+        data = serializer.data
+        for item, room in zip(data, page):
+            item['participant_count'] = room.participant_count
+            item['message_count'] = room.message_count
+            last_activity = room.last_message_at or room.updated_at
+            item['last_activity'] = last_activity.isoformat() if last_activity else None
+        return Response({'data': data, 'pagination': page_info})
     except Exception as e:
-        # Return empty array on error instead of crashing
         import traceback
-        error_trace = traceback.format_exc()
-        print(f"✗ Error in all_chats: {type(e).__name__}: {str(e)}")
-        print(error_trace)
+        print(f"Error in all_chats: {type(e).__name__}: {str(e)}")
+        print(traceback.format_exc())
         return Response({
             'data': [],
             'error': str(e),
@@ -554,39 +682,62 @@ def all_chats(request):
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
-def chat_stats(request):
-    """Get chat statistics."""
+def search_chat_messages(request):
+    """Full-text search across all chats for moderation.
+    
+    ?q=<terms> (required), ?room=<room_id or id> to narrow to one room,
+    ?limit=N and ?before=<message id> for cursor paging (newest matches first).
+    """
     try:
-        from django.db import connection
-        
-        # Check if ChatRoom table exists using proper Django introspection
-        # This works for both PostgreSQL and SQLite
-        all_tables = connection.introspection.table_names()
-        table_exists = 'chats_chatroom' in all_tables
-        
-        # Debugging
-        print(f"Checking table 'chats_chatroom'. Exists: {table_exists}")
+        from chats.models import ChatRoom
+        from chats.pagination import _parse_int
+        from chats.resolver import resolve_room
+        from chats.search import search_messages
+        from chats.serializers import MessageSearchResultSerializer
         
-        from chats.models import ChatRequest, ChatRoom
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Search query (q) is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Get chat request stats
-        total_requests = ChatRequest.objects.count()
-        pending_requests = ChatRequest.objects.filter(status='pending').count()
-        approved_requests = ChatRequest.objects.filter(status__in=['admin_approved', 'active']).count()
-        rejected_requests = ChatRequest.objects.filter(status='rejected').count()
+        room = None
+        if request.query_params.get('room'):
+            try:
+                room, _ = resolve_room(request.query_params['room'], request.user)
+            except ChatRoom.DoesNotExist:
+                return Response(
+                    {'error': 'Chat room not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
         
-        # Get chat room stats
-        active_chats = ChatRoom.objects.filter(is_active=True).count() if table_exists else 0
+        messages, page_info = search_messages(
+            query,
+            room=room,
+            before=_parse_int(request.query_params.get('before')),
+            limit=_parse_int(request.query_params.get('limit')),
+        )
+        serializer = MessageSearchResultSerializer(messages, many=True, context={'request': request})
+        return Response({'data': serializer.data, 'pagination': page_info})
+    except Exception as e:
+        import traceback
+        print(f"Error in search_chat_messages: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def chat_stats(request):
+    """Get chat statistics (cached briefly, see chats.stats)."""
+    try:
+        from chats.stats import get_chat_stats
         
-        return Response({
-            'data': {
-                'pending_requests': pending_requests,
-                'active_chats': active_chats,
-                'total_requests': total_requests,
-                'approved_requests': approved_requests,
-                'rejected_requests': rejected_requests,
-            }
-        })
+        return Response({'data': get_chat_stats()})
     except Exception as e:
         # Return default stats on error
         import traceback
@@ -606,19 +757,26 @@ def chat_stats(request):
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def chat_requests(request):
-    """Get all chat requests."""
+    """Get chat requests, newest first.
+    
+    Filters: ?status=pending[,admin_verifying,...], ?type=claim|adoption|general.
+    Paging (optional, unpaged without it): ?limit=N (max 200) and ?before=<id> from pagination.next_before.
+    """
     try:
         from chats.models import ChatRequest
+        from chats.pagination import paginate_newest_first
         from chats.serializers import ChatRequestSerializer
+        from chats.views_chat_requests import filter_chat_requests
         
-        # Get all chat requests, ordered by most recent first
-        # Include all related fields for the new workflow
-        requests = ChatRequest.objects.select_related(
-            'requester', 'target', 'pet', 'admin_verification_room', 'final_chat_room', 'verified_by_admin'
-        ).prefetch_related('pet__category').order_by('-created_at')
-        
-        serializer = ChatRequestSerializer(requests, many=True, context={'request': request})
-        return Response({'data': serializer.data})
+        try:
+            requests = filter_chat_requests(ChatRequest.objects.all(), request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        requests = ChatRequestSerializer.setup_eager_loading(requests, request.user)
+        page, page_info = paginate_newest_first(requests, request.query_params)
+        
+        serializer = ChatRequestSerializer(page, many=True, context={'request': request})
+        return Response({'data': serializer.data, 'pagination': page_info})
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
@@ -735,6 +893,7 @@ def respond_to_chat_request(request, request_id):
         from chats.serializers import ChatRequestSerializer
         from chats.views_chat_requests import admin_approve_request, admin_reject_request
         from django.utils import timezone
+        from .moderation import lease_conflict, lease_conflict_response, release_items
         
         approved = request.data.get('approved', False)
         admin_notes = request.data.get('admin_notes', '')
@@ -748,6 +907,10 @@ def respond_to_chat_request(request, request_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        lease = lease_conflict('chat_request', chat_request.id, request.user)
+        if lease:
+            return Response(lease_conflict_response(lease), status=status.HTTP_409_CONFLICT)
+        
         # Update request with admin notes
         if admin_notes:
             chat_request.admin_notes = admin_notes
@@ -818,7 +981,7 @@ def respond_to_chat_request(request, request_id):
                 )
         
         # Log action
-        AdminLog.objects.create(
+        log_action(
             admin=request.user,
             action='APPROVE' if approved else 'REJECT',
             model_type='ChatRequest',
@@ -826,6 +989,7 @@ def respond_to_chat_request(request, request_id):
             description=f'{"Approved" if approved else "Rejected"} chat request. Notes: {admin_notes}',
             ip_address=request.META.get('REMOTE_ADDR')
         )
+        release_items('chat_request', [chat_request.id])
         
         serializer = ChatRequestSerializer(chat_request)
         return Response({
@@ -854,6 +1018,84 @@ def respond_to_chat_request(request, request_id):
         )
 
 
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def moderation_claim(request):
+    """Lease a batch of the oldest pending items to the calling admin.
+    
+    Body: {"type": "pet" | "chat_request", "size": N (default 10, max 50)}.
+    Items leased by other admins are skipped; calling again renews the admin's
+    current batch. Approving or rejecting an item releases its lease.
+    """
+    try:
+        from .moderation import DEFAULT_CLAIM_SIZE, claim_items, pending_queryset
+        
+        item_type = request.data.get('type', 'pet')
+        try:
+            size = int(request.data.get('size', DEFAULT_CLAIM_SIZE))
+            object_ids, expires_at = claim_items(request.user, item_type, size)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        items = pending_queryset(item_type).filter(id__in=object_ids)
+        if item_type == 'pet':
+            from pets.serializers import PetListSerializer
+            items = items.select_related('category', 'owner', 'posted_by').prefetch_related('images')
+            data = PetListSerializer(items, many=True, context={'request': request}).data
+        else:
+            from chats.serializers import ChatRequestSerializer
+            items = ChatRequestSerializer.setup_eager_loading(items, request.user)
+            data = ChatRequestSerializer(items, many=True, context={'request': request}).data
+        
+        return Response({
+            'data': data,
+            'type': item_type,
+            'lease_expires_at': expires_at.isoformat(),
+        })
+    except Exception as e:
+        import traceback
+        print(f"Error in moderation_claim: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def moderation_release(request):
+    """Hand leased items back to the queue without deciding them.
+    
+    Body: {"type": "pet" | "chat_request", "ids": [...]}; omit ids to release the whole batch.
+    """
+    try:
+        from .models import ModerationLease
+        from .moderation import release_items
+        
+        item_type = request.data.get('type', 'pet')
+        if item_type not in dict(ModerationLease.ITEM_TYPE_CHOICES):
+            return Response(
+                {'error': f'Unknown moderation item type: {item_type}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        ids = request.data.get('ids')
+        if ids is None:
+            ids = ModerationLease.objects.filter(
+                item_type=item_type, admin=request.user
+            ).values_list('object_id', flat=True)
+        released = release_items(item_type, list(ids), admin=request.user)
+        return Response({'released': released})
+    except Exception as e:
+        import traceback
+        print(f"Error in moderation_release: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def accept_adoption_request(request, pet_id):
@@ -882,7 +1124,7 @@ def accept_adoption_request(request, pet_id):
     pet.save()
     
     # Log action
-    AdminLog.objects.create(
+    log_action(
         admin=request.user,
         action='APPROVE',
         model_type='AdoptionApplication',
@@ -924,7 +1166,7 @@ def close_chat_room(request, room_id):
     room.save()
     
     # Log action
-    AdminLog.objects.create(
+    log_action(
         admin=request.user,
         action='UPDATE',
         model_type='ChatRoom',
@@ -1015,6 +1257,8 @@ def all_found(request):
 @permission_classes([IsAdminUser])
 def approve_pet(request, pet_id):
     """Approve/verify a pet."""
+    from .moderation import lease_conflict, lease_conflict_response, release_items
+    
     try:
         pet = Pet.objects.get(id=pet_id)
     except Pet.DoesNotExist:
@@ -1023,34 +1267,16 @@ def approve_pet(request, pet_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
+    lease = lease_conflict('pet', pet.id, request.user)
+    if lease:
+        return Response(lease_conflict_response(lease), status=status.HTTP_409_CONFLICT)
+    
+    from .bulk_actions import approved_status
     pet.is_verified = True
-    original_status = pet.adoption_status
-    if pet.adoption_status == 'Pending':
-        # Determine status based on found_date field (most reliable)
-        # Found pets have found_date set, lost pets don't
-        if pet.found_date is not None:
-            # This is a found pet - set status to 'Found'
-            # After 15 days, it will automatically move to 'Available for Adoption'
-            pet.adoption_status = 'Found'
-        else:
-            # This is a lost pet - set status to 'Lost'
-            pet.adoption_status = 'Lost'
-        
-        # Fallback: If found_date check doesn't work, use type parameter or pet name
-        # (This should rarely be needed, but kept as backup)
-        if pet.adoption_status == 'Pending':
-            report_type = request.data.get('type', '').lower()
-            # Check if name starts with "Found" or "Lost"
-            if 'found' in report_type or (pet.name and 'found' in pet.name.lower()):
-                pet.adoption_status = 'Found'
-            elif 'lost' in report_type or (pet.name and 'lost' in pet.name.lower()):
-                pet.adoption_status = 'Lost'
-            else:
-                # Last resort: Default to 'Lost' if we can't determine (safer than Adoption)
-                pet.adoption_status = 'Lost'
+    pet.adoption_status = approved_status(pet)
     
     # Log action
-    AdminLog.objects.create(
+    log_action(
         admin=request.user,
         action='APPROVE',
         model_type='Pet',
@@ -1085,6 +1311,7 @@ def approve_pet(request, pet_id):
     
     # Save pet with update_fields to prevent signal from creating duplicate notification
     pet.save(update_fields=['is_verified', 'adoption_status'])
+    release_items('pet', [pet.id])
     
     from pets.serializers import PetSerializer
     return Response({'data': PetSerializer(pet, context={'request': request}).data})
@@ -1094,6 +1321,8 @@ def approve_pet(request, pet_id):
 @permission_classes([IsAdminUser])
 def reject_pet(request, pet_id):
     """Reject a pet report."""
+    from .moderation import lease_conflict, lease_conflict_response, release_items
+    
     try:
         pet = Pet.objects.get(id=pet_id)
     except Pet.DoesNotExist:
@@ -1102,10 +1331,14 @@ def reject_pet(request, pet_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
+    lease = lease_conflict('pet', pet.id, request.user)
+    if lease:
+        return Response(lease_conflict_response(lease), status=status.HTTP_409_CONFLICT)
+    
     reason = request.data.get('reason', 'No reason provided')
     
     # Log action
-    AdminLog.objects.create(
+    log_action(
         admin=request.user,
         action='REJECT',
         model_type='Pet',
@@ -1128,17 +1361,81 @@ def reject_pet(request, pet_id):
     
     # Optionally delete or deactivate the pet
     # pet.delete()  # Uncomment if you want to delete rejected pets
+    release_items('pet', [pet.id])
     
     return Response({'message': 'Pet report rejected', 'data': {'id': pet_id}})
 
 
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_approve_pets(request):
+    """Approve many pet reports at once. Body: {"ids": [...]}."""
+    try:
+        from .bulk_actions import approve_pets, parse_ids
+        
+        try:
+            ids = parse_ids(request.data.get('ids'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        result = approve_pets(request.user, ids, request.META.get('REMOTE_ADDR'))
+        return Response({'message': f"Approved {len(result['updated'])} pet reports", 'data': result})
+    except Exception as e:
+        import traceback
+        print(f"Error in bulk_approve_pets: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_reject_pets(request):
+    """Reject many pet reports at once. Body: {"ids": [...], "reason": "..."}."""
+    try:
+        from .bulk_actions import parse_ids, reject_pets
+        
+        try:
+            ids = parse_ids(request.data.get('ids'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        result = reject_pets(
+            request.user, ids, request.data.get('reason', 'No reason provided'), request.META.get('REMOTE_ADDR')
+        )
+        return Response({'message': f"Rejected {len(result['updated'])} pet reports", 'data': result})
+    except Exception as e:
+        import traceback
+        print(f"Error in bulk_reject_pets: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def all_logs(request):
-    """Get all admin logs."""
-    logs = AdminLog.objects.select_related('admin').all()
+    """Get admin logs, newest first.
+    
+    Query params: action, model_type, admin (filters), limit (default 50, max
+    200), before (the next_before cursor of the previous page) and
+    include_archived=true to continue into archived logs.
+    """
+    from .audit import filter_logs, paginate_logs, wants_archive
+    from .models import ArchivedAdminLog
+    
+    try:
+        logs = filter_logs(AdminLog.objects.select_related('admin'), request.query_params)
+        archive = None
+        if wants_archive(request.query_params):
+            archive = filter_logs(ArchivedAdminLog.objects.select_related('admin'), request.query_params)
+        logs, page_info = paginate_logs(logs, request.query_params, archive)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     serializer = AdminLogSerializer(logs, many=True, context={'request': request})
-    return Response({'data': serializer.data})
+    return Response({'data': serializer.data, 'pagination': page_info})
 
 
 @api_view(['POST'])
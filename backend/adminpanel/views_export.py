@@ -0,0 +1,177 @@
+"""
+Streaming data exports for admins: pets, users, adoption applications and logs.
+
+Each endpoint streams the filtered table as NDJSON (default) or CSV through
+backend.streaming, reading rows in primary-key order with
+QuerySet.iterator(chunk_size=...), so memory stays flat however many rows are
+exported. Add ?gzip=true to download the file gzip-compressed.
+
+Common query params:
+  output        'ndjson' or 'csv'
+  since/until   ISO date or datetime bounds on the row's creation time
+  status        comma-separated status values (per endpoint, see below)
+"""
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from backend.streaming import EXPORT_FORMATS, export_response, iter_rows, parse_bound, wants_gzip
+
+PET_EXPORT_FIELDS = [
+    ('id', 'id'), ('name', 'name'), ('category', 'category__name'), ('breed', 'breed'),
+    ('age', 'age'), ('gender', 'gender'), ('size', 'size'), ('adoption_status', 'adoption_status'),
+    ('is_verified', 'is_verified'), ('location', 'location'), ('pincode', 'pincode'),
+    ('posted_by_id', 'posted_by_id'), ('posted_by_email', 'posted_by__email'), ('owner_id', 'owner_id'),
+    ('found_date', 'found_date'), ('reunited_at', 'reunited_at'),
+    ('created_at', 'created_at'), ('updated_at', 'updated_at'),
+]
+USER_EXPORT_FIELDS = [
+    ('id', 'id'), ('email', 'email'), ('name', 'name'), ('role', 'role'), ('phone', 'phone'),
+    ('pincode', 'pincode'), ('region', 'region'), ('is_active', 'is_active'), ('is_staff', 'is_staff'),
+    ('is_volunteer', 'is_volunteer'), ('is_shelter_provider', 'is_shelter_provider'),
+    ('date_joined', 'date_joined'), ('last_login', 'last_login'),
+]
+APPLICATION_EXPORT_FIELDS = [
+    ('id', 'id'), ('pet_id', 'pet_id'), ('pet_name', 'pet__name'), ('applicant_id', 'applicant_id'),
+    ('applicant_email', 'applicant__email'), ('status', 'status'), ('applied_at', 'applied_at'),
+    ('reviewed_at', 'reviewed_at'), ('reviewed_by_id', 'reviewed_by_id'),
+]
+LOG_EXPORT_FIELDS = [
+    ('id', 'id'), ('admin_id', 'admin_id'), ('admin_email', 'admin__email'), ('action', 'action'),
+    ('model_type', 'model_type'), ('object_id', 'object_id'), ('description', 'description'),
+    ('ip_address', 'ip_address'), ('created_at', 'created_at'),
+]
+
+
+def _values(params, name):
+    """Comma-separated query param -> list of values (empty when absent)."""
+    return [value.strip() for value in params.get(name, '').split(',') if value.strip()]
+
+
+def _date_range(queryset, params, field):
+    since = parse_bound(params.get('since'))
+    until = parse_bound(params.get('until'), end_of_day=True)
+    if since:
+        queryset = queryset.filter(**{f'{field}__gte': since})
+    if until:
+        queryset = queryset.filter(**{f'{field}__lte': until})
+    return queryset
+
+
+def _stream(request, name, fields, querysets):
+    """Validate ?output= and stream the querysets (already filtered) as one file."""
+    output = request.query_params.get('output', 'ndjson').lower()
+    if output not in EXPORT_FORMATS:
+        return Response({'error': "output must be 'ndjson' or 'csv'"}, status=status.HTTP_400_BAD_REQUEST)
+    columns = [column for column, _ in fields]
+    lookups = [lookup for _, lookup in fields]
+    rows = iter_rows([queryset.order_by('id').values_list(*lookups) for queryset in querysets])
+    filename = f'{name}-{timezone.now():%Y%m%d%H%M}'
+    return export_response(request, columns, rows, output, filename, wants_gzip(request.query_params))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_pets(request):
+    """Stream pets.
+
+    Filters: status (adoption_status values), since/until (created_at),
+    region (matches location), pincode (prefix), verified ('true'/'false').
+    """
+    from pets.models import Pet
+
+    params = request.query_params
+    try:
+        queryset = _date_range(Pet.objects.all(), params, 'created_at')
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if _values(params, 'status'):
+        queryset = queryset.filter(adoption_status__in=_values(params, 'status'))
+    if params.get('region'):
+        queryset = queryset.filter(location__icontains=params['region'])
+    if params.get('pincode'):
+        queryset = queryset.filter(pincode__startswith=params['pincode'])
+    if params.get('verified'):
+        queryset = queryset.filter(is_verified=params['verified'].lower() in ('1', 'true', 'yes'))
+    return _stream(request, 'pets', PET_EXPORT_FIELDS, [queryset])
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_users(request):
+    """Stream users.
+
+    Filters: status ('active'/'inactive'), role (comma-separated),
+    since/until (date_joined), region (assigned region or address), pincode (prefix).
+    """
+    from users.models import User
+
+    params = request.query_params
+    try:
+        queryset = _date_range(User.objects.all(), params, 'date_joined')
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    statuses = _values(params, 'status')
+    if statuses:
+        unknown = [value for value in statuses if value not in ('active', 'inactive')]
+        if unknown:
+            return Response({'error': "status must be 'active' or 'inactive'"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(statuses) == 1:
+            queryset = queryset.filter(is_active=statuses[0] == 'active')
+    if _values(params, 'role'):
+        queryset = queryset.filter(role__in=_values(params, 'role'))
+    if params.get('region'):
+        queryset = queryset.filter(Q(region__icontains=params['region']) | Q(address__icontains=params['region']))
+    if params.get('pincode'):
+        queryset = queryset.filter(pincode__startswith=params['pincode'])
+    return _stream(request, 'users', USER_EXPORT_FIELDS, [queryset])
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_applications(request):
+    """Stream adoption applications.
+
+    Filters: status (Pending/Approved/Rejected...), since/until (applied_at),
+    region (matches the pet's location), pincode (pet's pincode prefix).
+    """
+    from pets.models import AdoptionApplication
+
+    params = request.query_params
+    try:
+        queryset = _date_range(AdoptionApplication.objects.all(), params, 'applied_at')
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if _values(params, 'status'):
+        queryset = queryset.filter(status__in=_values(params, 'status'))
+    if params.get('region'):
+        queryset = queryset.filter(pet__location__icontains=params['region'])
+    if params.get('pincode'):
+        queryset = queryset.filter(pet__pincode__startswith=params['pincode'])
+    return _stream(request, 'adoption-applications', APPLICATION_EXPORT_FIELDS, [queryset])
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_logs(request):
+    """Stream admin logs, archived ones first.
+
+    Filters: status (action values, e.g. APPROVE,REJECT), model_type, admin (id),
+    since/until (created_at).
+    """
+    from .audit import filter_logs
+    from .models import AdminLog, ArchivedAdminLog
+
+    params = request.query_params
+    querysets = []
+    try:
+        for model in (ArchivedAdminLog, AdminLog):
+            queryset = filter_logs(_date_range(model.objects.all(), params, 'created_at'), params)
+            if _values(params, 'status'):
+                queryset = queryset.filter(action__in=_values(params, 'status'))
+            querysets.append(queryset)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return _stream(request, 'admin-logs', LOG_EXPORT_FIELDS, querysets)
@@ -0,0 +1,219 @@
+"""
+End-to-end API benchmarks, run in-process through the Django test client.
+
+Every scenario is a real HTTP request through the full middleware, JWT
+authentication and serializer stack against whatever database is configured
+(see `manage.py run_benchmarks`). For each one we record latency percentiles,
+the number of SQL queries per request and the memory allocated while serving
+it (tracemalloc peak), and compare them against a stored JSON baseline.
+"""
+import contextlib
+import io
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+BASELINE_VERSION = 1
+
+# A metric regresses when it is worse than the baseline by more than the
+# relative tolerance AND by more than the absolute slack (tiny values are noisy)
+LATENCY_SLACK_MS = 2.0
+ALLOC_SLACK_KB = 16.0
+
+
+class Scenario:
+    """One benchmarked request. `path` may contain {pet_id}/{room_id} placeholders."""
+
+    def __init__(self, name, method, path, auth=None, data=None, iterations=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.auth = auth  # None, 'user' or 'admin'
+        self.data = data
+        self.iterations = iterations  # caps the run-wide --iterations (e.g. login hashes a password)
+
+
+SCENARIOS = [
+    Scenario('pet_list', 'get', '/api/pets/'),
+    Scenario('pet_detail', 'get', '/api/pets/{pet_id}/'),
+    Scenario('pet_search', 'get', '/api/pets/?search={search}'),
+    Scenario('lost_list', 'get', '/api/pets/lost/'),
+    Scenario('found_list', 'get', '/api/pets/found/'),
+    Scenario('chat_rooms', 'get', '/api/chats/rooms/', auth='user'),
+    Scenario('message_history', 'get', '/api/chats/rooms/{room_id}/messages/', auth='user'),
+    Scenario('notification_unread_count', 'get', '/api/notifications/unread-count/', auth='user'),
+    Scenario('dashboard_stats', 'get', '/api/admin/dashboard', auth='admin'),
+    Scenario('login', 'post', '/api/auth/login/', data={'email': '{email}', 'password': '{password}'}, iterations=10),
+]
+SCENARIO_NAMES = [scenario.name for scenario in SCENARIOS]
+
+
+def pick_fixtures(password=None):
+    """Choose the pet, room and users the scenarios run against.
+
+    The benchmark user is a participant of the room with the newest message
+    (so they have history and rooms); the admin is the first active staff user.
+    """
+    from chats.models import Message
+    from pets.models import Pet
+    from users.models import User
+
+    fixtures = {'search': 'Labrador', 'password': password}
+    fixtures['pet_id'] = Pet.objects.order_by('-id').values_list('id', flat=True).first()
+    newest = Message.objects.order_by('-id').select_related('room').first()
+    if newest:
+        fixtures['room_id'] = newest.room_id
+        fixtures['user'] = newest.room.participants.order_by('id').first()
+    else:
+        fixtures['room_id'] = None
+        fixtures['user'] = User.objects.filter(is_active=True).order_by('id').first()
+    fixtures['admin'] = User.objects.filter(is_active=True, is_staff=True).order_by('id').first()
+    fixtures['email'] = fixtures['user'].email if fixtures['user'] else None
+    return fixtures
+
+
+def missing_fixture(scenario, fixtures):
+    """Name of the fixture the scenario needs but the database lacks, or None."""
+    needed = [scenario.auth] if scenario.auth else []
+    template = scenario.path + json.dumps(scenario.data or {})
+    needed += [key for key in ('pet_id', 'room_id', 'email', 'password') if '{%s}' % key in template]
+    for key in needed:
+        if not fixtures.get(key):
+            return key
+    return None
+
+
+def _client(scenario, fixtures):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = Client()
+    if scenario.auth:
+        token = RefreshToken.for_user(fixtures[scenario.auth]).access_token
+        client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+
+def _request(client, scenario, path, body):
+    if scenario.method == 'get':
+        return client.get(path)
+    return getattr(client, scenario.method)(path, data=body, content_type='application/json')
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_scenario(scenario, fixtures, iterations=50, warmup=3):
+    """Benchmark one scenario; returns its metrics dict. Raises on non-2xx responses."""
+    client = _client(scenario, fixtures)
+    path = scenario.path.format(**fixtures)
+    body = {key: value.format(**fixtures) for key, value in (scenario.data or {}).items()}
+    iterations = min(iterations, scenario.iterations or iterations)
+
+    def call():
+        response = _request(client, scenario, path, body)
+        if response.status_code >= 300:
+            raise RuntimeError(f'{scenario.name}: {scenario.method.upper()} {path} returned {response.status_code}')
+        return response
+
+    # The views print debug output; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            call()
+
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        # CaptureQueriesContext diffs the length of the query log, which stops
+        # growing once the log is full (e.g. right after seeding)
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            call()
+
+        allocations = []
+        tracemalloc.start()
+        try:
+            for _ in range(3):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                call()
+                allocations.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(_percentile(timings, 50), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'p99_ms': round(_percentile(timings, 99), 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'queries': len(queries.captured_queries),
+        'alloc_kb': round(statistics.median(allocations), 1),
+    }
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'database': connection.vendor,
+    }
+
+
+def dataset_size():
+    from chats.models import Message
+    from notifications.models import Notification
+    from pets.models import Pet
+    from users.models import User
+
+    return {
+        'users': User.objects.count(),
+        'pets': Pet.objects.count(),
+        'messages': Message.objects.count(),
+        'notifications': Notification.objects.count(),
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results, meta):
+    with open(path, 'w') as f:
+        json.dump({'version': BASELINE_VERSION, **meta, 'scenarios': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baseline, latency_tolerance=0.5, alloc_tolerance=0.25):
+    """Return a list of regression messages (empty when everything is within budget).
+
+    Query counts must not grow at all; p95 latency and allocations may grow by
+    their relative tolerance (plus a small absolute slack).
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = (baseline.get('scenarios') or {}).get(name)
+        if not previous:
+            continue
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: {current['queries']} queries (baseline {previous['queries']})")
+        limit = max(previous['p95_ms'] * (1 + latency_tolerance), previous['p95_ms'] + LATENCY_SLACK_MS)
+        if current['p95_ms'] > limit:
+            regressions.append(f"{name}: p95 {current['p95_ms']}ms (baseline {previous['p95_ms']}ms, limit {limit:.2f}ms)")
+        limit = max(previous['alloc_kb'] * (1 + alloc_tolerance), previous['alloc_kb'] + ALLOC_SLACK_KB)
+        if current['alloc_kb'] > limit:
+            regressions.append(f"{name}: {current['alloc_kb']}KB allocated (baseline {previous['alloc_kb']}KB, limit {limit:.1f}KB)")
+    return regressions
@@ -0,0 +1,26 @@
+"""
+Helpers for bulk data loading commands (import_csv, generate_synthetic_data).
+"""
+from contextlib import contextmanager
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Keep the timestamps set on instances instead of letting auto_now/auto_now_add overwrite them.
+
+    bulk_create runs each field's pre_save, which replaces auto_now and
+    auto_now_add values with the current time. Only for single-process
+    commands: the flags are switched off on the shared field objects.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,53 @@
+"""
+Generate a production-sized synthetic dataset for load tests and benchmarks.
+Usage: python manage.py generate_synthetic_data [--users 1000] [--pets 5000] [--rooms 1000]
+       [--messages-per-room 20] [--images-per-pet 2] [--notifications-per-user 5]
+       [--feeding-points 50] [--feeding-records 2000] [--days 365] [--seed 42]
+
+Never run it against production: it writes through bulk_create, which skips
+model signals (no notifications, chat events or cache invalidation). The
+dashboard counters are recounted at the end; run rollup_daily_metrics with
+--since afterwards for the trend charts.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from api.synthetic import SyntheticDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, pets, chats, notifications and feeding records in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Users to create')
+        parser.add_argument('--pets', type=int, default=5000, help='Pets to create (all statuses)')
+        parser.add_argument('--images-per-pet', type=int, default=2, help='Maximum gallery images per pet')
+        parser.add_argument('--rooms', type=int, default=1000, help='Two-person chat rooms to create')
+        parser.add_argument('--messages-per-room', type=int, default=20, help='Average messages per room')
+        parser.add_argument('--notifications-per-user', type=int, default=5, help='Average notifications per user')
+        parser.add_argument('--feeding-points', type=int, default=50, help='Feeding points to create')
+        parser.add_argument('--feeding-records', type=int, default=2000, help='Feeding records to create')
+        parser.add_argument('--days', type=int, default=365, help='Spread timestamps over this many past days')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed, same data)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create')
+        parser.add_argument('--prefix', default='synthetic', help='Email prefix of generated users')
+
+    def handle(self, *args, **options):
+        if options['users'] < 2:
+            raise CommandError('--users must be at least 2 (chat rooms need two people)')
+
+        generator = SyntheticDataGenerator(
+            seed=options['seed'], days=options['days'], batch_size=max(1, options['batch_size']),
+            prefix=options['prefix'], log=self.stdout.write,
+        )
+        user_ids = generator.users(options['users'])
+        pet_ids = generator.pets(options['pets'], user_ids, options['images_per_pet'])
+        if options['rooms']:
+            generator.chat_rooms(options['rooms'], user_ids, max(1, options['messages_per_room']))
+        if options['notifications_per_user']:
+            generator.notifications(options['notifications_per_user'], user_ids, pet_ids)
+        generator.feeding(options['feeding_points'], options['feeding_records'], user_ids)
+
+        from adminpanel.models import DashboardStats
+        from chats.stats import invalidate_chat_stats
+        DashboardStats.get_latest().update_stats()
+        invalidate_chat_stats()
+        self.stdout.write(self.style.SUCCESS('Synthetic data generated'))
@@ -1,22 +1,82 @@
+"""
+Import users and pets from CSV exports.
+Usage: python manage.py import_csv [--users PATH] [--pets PATH] [--only users|pets]
+                                   [--chunk-size 5000] [--offset N] [--dry-run]
+
+Rows are read in chunks. Each chunk resolves its categories and users with one
+query each and is written with one bulk upsert (INSERT ... ON CONFLICT (id)
+DO UPDATE), so the number of queries grows with the number of chunks instead
+of the number of rows. A progress line is printed after every chunk; to
+resume an interrupted import pass its row count as --offset together with --only.
+
+Bulk writes skip model signals, so no notifications are sent for imported
+rows; the dashboard counters are recounted once at the end instead.
+"""
 import csv
 import os
+import time
 from datetime import datetime
-from django.core.management.base import BaseCommand
+from itertools import islice
 from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 from django.utils import timezone
+from api.bulk import explicit_timestamps
 from users.models import User
 from pets.models import Pet, Category
 
+DEFAULT_CHUNK_SIZE = 5000
+WRITE_BATCH_SIZE = 1000
+
+USER_UPDATE_FIELDS = [
+    'email', 'is_superuser', 'is_staff', 'is_active', 'date_joined', 'last_login', 'role',
+    'phone', 'pincode', 'age', 'gender', 'name', 'country_code', 'address', 'landmark',
+    'is_shelter_provider', 'is_volunteer', 'shelter_verified', 'volunteer_verified',
+    'admin_level', 'region',
+]
+PET_UPDATE_FIELDS = [
+    'name', 'breed', 'age', 'gender', 'size', 'description', 'adoption_status', 'location',
+    'pincode', 'last_seen', 'image', 'is_verified', 'is_featured', 'views_count', 'category',
+    'owner', 'posted_by', 'days_in_care', 'found_date', 'is_reunited', 'moved_to_adoption',
+    'moved_to_adoption_date', 'owner_consent_for_adoption', 'reunited_at', 'cloudinary_url',
+    'cloudinary_public_id', 'image_url', 'created_at', 'updated_at',
+]
+PET_COORDINATE_FIELDS = ['location_latitude', 'location_longitude']
+
+
 class Command(BaseCommand):
-    help = 'Imports data from CSV files'
+    help = 'Imports users and pets from CSV files with chunked bulk upserts'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
         base_dir = settings.BASE_DIR.parent  # backend/.. -> petadoption
-        users_csv = os.path.join(base_dir, 'users.csv')
-        pets_csv = os.path.join(base_dir, 'pets_pet.csv')
+        parser.add_argument('--users', default=os.path.join(base_dir, 'users.csv'), help='Users CSV path')
+        parser.add_argument('--pets', default=os.path.join(base_dir, 'pets_pet.csv'), help='Pets CSV path')
+        parser.add_argument('--only', choices=['users', 'pets'], help='Import just one of the files')
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help='Rows read, resolved and written per step'
+        )
+        parser.add_argument(
+            '--offset', type=int, default=0,
+            help='Skip this many data rows of the file (resume an interrupted import; needs --only)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Parse and validate without writing')
+
+    def handle(self, *args, **options):
+        if options['offset'] and not options['only']:
+            raise CommandError('--offset applies to one file; pass --only users or --only pets')
+        self.chunk_size = max(1, options['chunk_size'])
+        self.offset = max(0, options['offset'])
+        self.dry_run = options['dry_run']
 
-        self.import_users(users_csv)
-        self.import_pets(pets_csv)
+        if options['only'] != 'pets':
+            self.import_users(options['users'])
+        if options['only'] != 'users':
+            self.import_pets(options['pets'])
+
+        if not self.dry_run:
+            self.finish()
 
     def parse_bool(self, val):
         if not val: return False
@@ -29,59 +89,185 @@ class Command(BaseCommand):
         except ValueError:
             return None
 
+    def parse_int(self, val, default=None):
+        return int(val) if val not in (None, '') else default
+
+    def read_chunks(self, filepath):
+        """Yield (rows read before this chunk, list of row dicts), starting at --offset."""
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            rows = islice(csv.DictReader(f), self.offset, None)
+            position = self.offset
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                yield position, chunk
+                position += len(chunk)
+
+    def report(self, label, done, created, updated, skipped, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        rate = (done - self.offset) / elapsed
+        verb = 'would write' if self.dry_run else 'written'
+        self.stdout.write(
+            f"{label}: {done} rows read, {created + updated} {verb} ({created} new, {updated} updated), "
+            f"{skipped} skipped, {rate:.0f} rows/s  [resume: --only {label} --offset {done}]"
+        )
+
+    def finish(self):
+        """Move PostgreSQL id sequences past the imported ids and recount the dashboard."""
+        statements = connection.ops.sequence_reset_sql(no_style(), [User, Pet, Category])
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+        from adminpanel.models import DashboardStats
+        DashboardStats.get_latest().update_stats()
+
+    # Users
+
+    def build_user(self, row):
+        user = User(
+            id=int(row['id']),
+            email=row['email'],
+            is_superuser=self.parse_bool(row.get('is_superuser')),
+            is_staff=self.parse_bool(row.get('is_staff')),
+            is_active=self.parse_bool(row.get('is_active')),
+            date_joined=self.parse_date(row.get('date_joined')) or timezone.now(),
+            last_login=self.parse_date(row.get('last_login')),
+            role=row.get('role', 'user'),
+            phone=row.get('phone', ''),
+            pincode=row.get('pincode', ''),
+            age=int(row['age']) if row.get('age') and row['age'].isdigit() else None,
+            gender=row.get('gender', ''),
+            name=row.get('name', ''),
+            country_code=row.get('country_code', '+91'),
+            address=row.get('address', ''),
+            landmark=row.get('landmark', ''),
+            is_shelter_provider=self.parse_bool(row.get('is_shelter_provider')),
+            is_volunteer=self.parse_bool(row.get('is_volunteer')),
+            shelter_verified=self.parse_bool(row.get('shelter_verified')),
+            volunteer_verified=self.parse_bool(row.get('volunteer_verified')),
+            admin_level=row.get('admin_level'),
+            region=row.get('region'),
+        )
+        # Assuming CSV has hashed password 'pbkdf2_sha256$...' so we just store it.
+        user.password = row.get('password') or ''
+        return user
+
     def import_users(self, filepath):
         if not os.path.exists(filepath):
             self.stdout.write(self.style.WARNING(f"File not found: {filepath}"))
             return
 
         self.stdout.write(f"Importing Users from {filepath}...")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
+        started = time.monotonic()
+        done, created, updated, skipped = self.offset, 0, 0, 0
+        for position, rows in self.read_chunks(filepath):
+            users = {}
+            for row in rows:
+                if not row.get('id') or not row.get('email'):
+                    skipped += 1
+                    continue
                 try:
-                    user_id = row.get('id')
-                    email = row.get('email')
-                    
-                    if not user_id or not email:
-                        continue
-
-                    # Update logic using update_or_create to ensure fields are fresh if needed
-                    # Note: Using update_or_create on User with password hashing is tricky if password in CSV is literal hash.
-                    # Assuming CSV has hashed password 'pbkdf2_sha256$...' so we just store it.
-                    
-                    defaults = {
-                        'email': email,
-                        'is_superuser': self.parse_bool(row.get('is_superuser')),
-                        'is_staff': self.parse_bool(row.get('is_staff')),
-                        'is_active': self.parse_bool(row.get('is_active')),
-                        'date_joined': self.parse_date(row.get('date_joined')) or timezone.now(),
-                        'last_login': self.parse_date(row.get('last_login')),
-                        'role': row.get('role', 'user'),
-                        'phone': row.get('phone', ''),
-                        'pincode': row.get('pincode', ''),
-                        'age': int(row['age']) if row.get('age') and row['age'].isdigit() else None,
-                        'gender': row.get('gender', ''),
-                        'name': row.get('name', ''),
-                        'country_code': row.get('country_code', '+91'),
-                        'address': row.get('address', ''),
-                        'landmark': row.get('landmark', ''),
-                        'is_shelter_provider': self.parse_bool(row.get('is_shelter_provider')),
-                        'is_volunteer': self.parse_bool(row.get('is_volunteer')),
-                        'shelter_verified': self.parse_bool(row.get('shelter_verified')),
-                        'volunteer_verified': self.parse_bool(row.get('volunteer_verified')),
-                        'admin_level': row.get('admin_level'),
-                        'region': row.get('region'),
-                    }
-                    if row.get('password'):
-                        defaults['password'] = row.get('password')
-
-                    user, created = User.objects.update_or_create(id=user_id, defaults=defaults)
-                    count += 1
-                except Exception as e:
+                    user = self.build_user(row)
+                    users[user.id] = user
+                except (TypeError, ValueError) as e:
                     self.stdout.write(self.style.ERROR(f"Error importing user row {row.get('id')}: {e}"))
-            
-            self.stdout.write(self.style.SUCCESS(f"Successfully processed {count} users."))
+                    skipped += 1
+
+            # An email already used by a different id would fail the whole chunk on its unique constraint
+            email_owner = dict(
+                User.objects.filter(email__in=[u.email for u in users.values()]).values_list('email', 'id')
+            )
+            for user in list(users.values()):
+                owner = email_owner.setdefault(user.email, user.id)
+                if owner != user.id:
+                    self.stdout.write(self.style.ERROR(
+                        f"Error importing user row {user.id}: email {user.email} belongs to user {owner}"
+                    ))
+                    del users[user.id]
+                    skipped += 1
+
+            existing = set(User.objects.filter(id__in=list(users)).values_list('id', flat=True))
+            if not self.dry_run:
+                self.write_users(list(users.values()))
+            created += len(users) - len(existing)
+            updated += len(existing)
+            done = position + len(rows)
+            self.report('users', done, created, updated, skipped, started)
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully processed {created + updated} users."))
+
+    def write_users(self, users):
+        # Rows without a password keep the stored one, so they upsert without that column
+        with_password = [user for user in users if user.password]
+        without_password = [user for user in users if not user.password]
+        with transaction.atomic():
+            for batch, fields in ((with_password, USER_UPDATE_FIELDS + ['password']), (without_password, USER_UPDATE_FIELDS)):
+                if batch:
+                    User.objects.bulk_create(
+                        batch, update_conflicts=True, unique_fields=['id'],
+                        update_fields=fields, batch_size=WRITE_BATCH_SIZE
+                    )
+
+    # Pets
+
+    def category_name(self, row):
+        # Fix: Use 'name' column as category if available (since CSV stores type in name)
+        category_name = row.get('name')
+        if category_name and not category_name.isdigit():
+            return category_name.strip().capitalize()
+        return None
+
+    def resolve_categories(self, names):
+        """{name: Category} for the chunk, creating missing ones (one lookup, one insert)."""
+        names = set(names) | {'Uncategorized'}
+        categories = Category.objects.in_bulk(names, field_name='name')
+        missing = names - set(categories)
+        if missing and not self.dry_run:
+            Category.objects.bulk_create([Category(name=name) for name in missing], ignore_conflicts=True)
+            categories = Category.objects.in_bulk(names, field_name='name')
+        return categories
+
+    def build_pet(self, row, categories, known_users):
+        owner_id = self.parse_int(row.get('owner_id'))
+        posted_by_id = self.parse_int(row.get('posted_by_id'))
+        pet = Pet(
+            id=int(row['id']),
+            name=row.get('name', ''),
+            breed=row.get('breed', ''),
+            age=self.parse_int(row.get('age')),
+            gender=row.get('gender', ''),
+            size=row.get('size'),
+            description=row.get('description', ''),
+            adoption_status=row.get('adoption_status', 'Available for Adoption'),
+            location=row.get('location', ''),
+            pincode=row.get('pincode', ''),
+            last_seen=self.parse_date(row.get('last_seen')),
+            image=row.get('image', ''),
+            created_at=self.parse_date(row.get('created_at')) or timezone.now(),
+            updated_at=self.parse_date(row.get('updated_at')) or timezone.now(),
+            is_verified=self.parse_bool(row.get('is_verified')),
+            is_featured=self.parse_bool(row.get('is_featured')),
+            views_count=self.parse_int(row.get('views_count'), 0),
+            category=categories.get(self.category_name(row)) or categories.get('Uncategorized'),
+            owner_id=owner_id if owner_id in known_users else None,
+            posted_by_id=posted_by_id if posted_by_id in known_users else None,
+            days_in_care=self.parse_int(row.get('days_in_care'), 0),
+            found_date=self.parse_date(row.get('found_date')),
+            is_reunited=self.parse_bool(row.get('is_reunited')),
+            moved_to_adoption=self.parse_bool(row.get('moved_to_adoption')),
+            moved_to_adoption_date=self.parse_date(row.get('moved_to_adoption_date')),
+            owner_consent_for_adoption=self.parse_bool(row.get('owner_consent_for_adoption')),
+            reunited_at=self.parse_date(row.get('reunited_at')),
+            cloudinary_url=row.get('cloudinary_url', ''),
+            cloudinary_public_id=row.get('cloudinary_public_id', ''),
+            image_url=row.get('cloudinary_url', '') if row.get('cloudinary_url') else '',
+        )
+        for field in PET_COORDINATE_FIELDS:
+            if row.get(field):
+                setattr(pet, field, row[field])
+        return pet
 
     def import_pets(self, filepath):
         if not os.path.exists(filepath):
@@ -89,79 +275,46 @@ class Command(BaseCommand):
             return
 
         self.stdout.write(f"Importing Pets from {filepath}...")
-        
-        default_category, _ = Category.objects.get_or_create(name="Uncategorized")
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            columns = csv.DictReader(f).fieldnames or []
+        # Coordinates are only overwritten when the file has them at all
+        update_fields = PET_UPDATE_FIELDS + [field for field in PET_COORDINATE_FIELDS if field in columns]
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            count = 0
-            for row in reader:
+        started = time.monotonic()
+        done, created, updated, skipped = self.offset, 0, 0, 0
+        for position, chunk in self.read_chunks(filepath):
+            rows = [row for row in chunk if row.get('id')]
+            skipped += len(chunk) - len(rows)
+            categories = self.resolve_categories(filter(None, (self.category_name(row) for row in rows)))
+            user_ids = {
+                self.parse_int(row.get(column))
+                for row in rows for column in ('owner_id', 'posted_by_id')
+                if (row.get(column) or '').isdigit()
+            }
+            known_users = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+
+            pets = {}
+            for row in rows:
                 try:
-                    pet_id = row.get('id')
-                    if not pet_id: continue
-                    
-                    category_id = row.get('category_id')
-                    
-                    # Fix: Use 'name' column as category if available (since CSV stores type in name)
-                    category_name = row.get('name')
-                    if category_name and not category_name.isdigit():
-                        # Clean up the name (capitalize)
-                        category_name = category_name.strip().capitalize()
-                        category, _ = Category.objects.get_or_create(name=category_name)
-                    else:
-                        category = default_category # weak mapping for now
-
-                    owner_id = row.get('owner_id')
-                    owner = User.objects.filter(id=owner_id).first() if owner_id else None
-                    
-                    posted_by_id = row.get('posted_by_id')
-                    posted_by = User.objects.filter(id=posted_by_id).first() if posted_by_id else None
-
-                    defaults = {
-                        'name': row.get('name', ''),
-                        'breed': row.get('breed', ''),
-                        'age': row.get('age') if row.get('age') else None,
-                        'gender': row.get('gender', ''),
-                        'size': row.get('size'),
-                        'description': row.get('description', ''),
-                        'adoption_status': row.get('adoption_status', 'Available for Adoption'),
-                        'location': row.get('location', ''),
-                        'pincode': row.get('pincode', ''),
-                        'last_seen': self.parse_date(row.get('last_seen')),
-                        'image': row.get('image', ''),
-                        'created_at': self.parse_date(row.get('created_at')) or timezone.now(),
-                        'updated_at': self.parse_date(row.get('updated_at')) or timezone.now(),
-                        'is_verified': self.parse_bool(row.get('is_verified')),
-                        'is_featured': self.parse_bool(row.get('is_featured')),
-                        'views_count': int(row.get('views_count', 0)),
-                        'category': category,
-                        'owner': owner,
-                        'posted_by': posted_by,
-                        'days_in_care': int(row.get('days_in_care', 0)) if row.get('days_in_care') else 0,
-                        'found_date': self.parse_date(row.get('found_date')),
-                        'is_reunited': self.parse_bool(row.get('is_reunited')),
-                        'moved_to_adoption': self.parse_bool(row.get('moved_to_adoption')),
-                        'moved_to_adoption_date': self.parse_date(row.get('moved_to_adoption_date')),
-                        'owner_consent_for_adoption': self.parse_bool(row.get('owner_consent_for_adoption')),
-                        'reunited_at': self.parse_date(row.get('reunited_at')),
-                        'cloudinary_url': row.get('cloudinary_url', ''),
-                        'cloudinary_public_id': row.get('cloudinary_public_id', ''),
-                        'image_url': row.get('cloudinary_url', '') if row.get('cloudinary_url') else '',
-                    }
-                    
-                    if 'location_latitude' in row and row['location_latitude']:
-                        defaults['location_latitude'] = row['location_latitude']
-                    if 'location_longitude' in row and row['location_longitude']:
-                        defaults['location_longitude'] = row['location_longitude']
-
-                    pet, created = Pet.objects.update_or_create(id=pet_id, defaults=defaults)
-                    
-                    if created:
-                        self.stdout.write(f"Created Pet {pet_id}")
-                    else:
-                        self.stdout.write(f"Updated Pet {pet_id}")
-                    count += 1
-                except Exception as e:
+                    pet = self.build_pet(row, categories, known_users)
+                    pets[pet.id] = pet
+                except (TypeError, ValueError) as e:
                     self.stdout.write(self.style.ERROR(f"Error importing pet row {row.get('id')}: {e}"))
+                    skipped += 1
+
+            existing = set(Pet.objects.filter(id__in=list(pets)).values_list('id', flat=True))
+            if not self.dry_run:
+                self.write_pets(list(pets.values()), update_fields)
+            created += len(pets) - len(existing)
+            updated += len(existing)
+            done = position + len(chunk)
+            self.report('pets', done, created, updated, skipped, started)
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully processed {created + updated} pets."))
 
-            self.stdout.write(self.style.SUCCESS(f"Successfully processed {count} pets."))
+    def write_pets(self, pets, update_fields):
+        with transaction.atomic(), explicit_timestamps(Pet):
+            Pet.objects.bulk_create(
+                pets, update_conflicts=True, unique_fields=['id'],
+                update_fields=update_fields, batch_size=WRITE_BATCH_SIZE
+            )
@@ -0,0 +1,131 @@
+"""
+Benchmark the hot API endpoints and compare against a stored baseline.
+Usage: python manage.py run_benchmarks --seed-data [--iterations 50] [--only pet_list,login]
+       python manage.py run_benchmarks --seed-data --update-baseline
+
+--seed-data runs against a throwaway test database filled by the synthetic
+data generator (same seed, same data), which is what the tracked baseline in
+api/benchmark_baseline.json was recorded with. Without it the benchmarks run
+against the configured database as is. The command exits non-zero when a
+scenario regresses: more queries than the baseline, or p95 latency /
+allocations above the baseline by more than the tolerance.
+"""
+import os
+from django.core.management.base import BaseCommand, CommandError
+from api import benchmarks
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(benchmarks.__file__), 'benchmark_baseline.json')
+SYNTHETIC_PASSWORD = 'Synthetic@12345'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the hot API endpoints (latency, queries, allocations) against a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-data', action='store_true', help='Run against a fresh, synthetically seeded test database')
+        parser.add_argument('--users', type=int, default=500, help='Users to seed (with --seed-data)')
+        parser.add_argument('--pets', type=int, default=5000, help='Pets to seed (with --seed-data)')
+        parser.add_argument('--rooms', type=int, default=500, help='Chat rooms to seed (with --seed-data)')
+        parser.add_argument('--messages-per-room', type=int, default=40, help='Messages per room (with --seed-data)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for --seed-data')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per scenario')
+        parser.add_argument('--only', help=f"Comma-separated scenarios ({', '.join(benchmarks.SCENARIO_NAMES)})")
+        parser.add_argument('--password', default=SYNTHETIC_PASSWORD, help='Password of the benchmark user (login scenario)')
+        parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+        parser.add_argument('--update-baseline', action='store_true', help='Write this run as the new baseline instead of comparing')
+        parser.add_argument('--latency-tolerance', type=float, default=0.5, help='Allowed relative p95 increase')
+        parser.add_argument('--alloc-tolerance', type=float, default=0.25, help='Allowed relative allocation increase')
+        parser.add_argument('--output', help='Also write this run\'s results to this JSON file')
+
+    def handle(self, *args, **options):
+        scenarios = benchmarks.SCENARIOS
+        if options['only']:
+            names = [name.strip() for name in options['only'].split(',') if name.strip()]
+            unknown = set(names) - set(benchmarks.SCENARIO_NAMES)
+            if unknown:
+                raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+            scenarios = [scenario for scenario in scenarios if scenario.name in names]
+
+        from django.test.utils import setup_test_environment, teardown_test_environment
+        setup_test_environment()
+        runner = old_config = None
+        try:
+            if options['seed_data']:
+                from django.test.runner import DiscoverRunner
+                runner = DiscoverRunner(verbosity=0, interactive=False)
+                old_config = runner.setup_databases()
+                self.seed(options)
+            results, meta = self.run(scenarios, options)
+        finally:
+            if runner:
+                runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        if options['output']:
+            benchmarks.save_baseline(options['output'], results, meta)
+        if options['update_baseline']:
+            benchmarks.save_baseline(options['baseline'], results, meta)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['baseline']}"))
+            return
+        self.compare(results, meta, options)
+
+    def seed(self, options):
+        from api.synthetic import SyntheticDataGenerator
+        from adminpanel.models import DashboardStats
+        from users.models import User
+
+        self.stdout.write('Seeding test database...')
+        generator = SyntheticDataGenerator(seed=options['seed'], log=lambda message: None)
+        user_ids = generator.users(max(2, options['users']), password=options['password'])
+        pet_ids = generator.pets(options['pets'], user_ids)
+        generator.chat_rooms(options['rooms'], user_ids, max(1, options['messages_per_room']))
+        generator.notifications(5, user_ids, pet_ids)
+        User.objects.filter(id=user_ids[0]).update(is_staff=True)
+        DashboardStats.get_latest().update_stats()
+
+    def run(self, scenarios, options):
+        fixtures = benchmarks.pick_fixtures(password=options['password'])
+        meta = {'environment': benchmarks.environment(), 'dataset': benchmarks.dataset_size()}
+        self.stdout.write(f"Dataset: {meta['dataset']}")
+        self.stdout.write(f"{'scenario':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'alloc KB':>10}")
+
+        results = {}
+        for scenario in scenarios:
+            missing = benchmarks.missing_fixture(scenario, fixtures)
+            if missing:
+                self.stdout.write(self.style.WARNING(f'{scenario.name:<28}skipped (no {missing} in the database)'))
+                continue
+            try:
+                result = benchmarks.run_scenario(
+                    scenario, fixtures, iterations=max(1, options['iterations']), warmup=max(0, options['warmup'])
+                )
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            results[scenario.name] = result
+            self.stdout.write(
+                f"{scenario.name:<28}{result['p50_ms']:>9}{result['p95_ms']:>9}{result['p99_ms']:>9}"
+                f"{result['queries']:>9}{result['alloc_kb']:>10}"
+            )
+        return results, meta
+
+    def compare(self, results, meta, options):
+        baseline = benchmarks.load_baseline(options['baseline'])
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f"No baseline at {options['baseline']}; run with --update-baseline to record one"))
+            return
+        for key in ('environment', 'dataset'):
+            if baseline.get(key) != meta[key]:
+                self.stdout.write(self.style.WARNING(
+                    f'Baseline {key} differs ({baseline.get(key)} vs {meta[key]}); latencies may not be comparable'
+                ))
+
+        regressions = benchmarks.compare(
+            results, baseline,
+            latency_tolerance=options['latency_tolerance'], alloc_tolerance=options['alloc_tolerance'],
+        )
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(f'{len(regressions)} benchmark regression(s)')
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} scenarios within baseline'))
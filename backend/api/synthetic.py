@@ -0,0 +1,382 @@
+"""
+Synthetic data for load and benchmark environments.
+
+SyntheticDataGenerator writes users, pets (every adoption status) with gallery
+images, chat rooms with message histories (search-indexed, with read marks),
+notifications, feeding points and feeding records using bulk_create in
+batches. Everything is drawn from one
+random.Random(seed), so the same seed against the same starting database
+produces the same data. Locations are spread around the Telangana cities used
+by scripts/populate_fake_data.py, weighted towards Hyderabad; timestamps are
+spread over the last `days` days, denser towards the present like real growth.
+
+Rows are generated lazily and inserted batch by batch, and rows needed by
+later steps are read back in id windows, so memory use does not grow with the
+dataset size. Used by `manage.py generate_synthetic_data`.
+"""
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from .bulk import explicit_timestamps
+
+TELANGANA_CITIES = [
+    {"name": "Hyderabad", "lat": 17.3850, "lng": 78.4867, "weight": 40},
+    {"name": "Warangal", "lat": 17.9689, "lng": 79.5941, "weight": 10},
+    {"name": "Nizamabad", "lat": 18.6725, "lng": 78.0941, "weight": 6},
+    {"name": "Karimnagar", "lat": 18.4386, "lng": 79.1288, "weight": 6},
+    {"name": "Khammam", "lat": 17.2473, "lng": 80.1514, "weight": 5},
+    {"name": "Secunderabad", "lat": 17.4399, "lng": 78.4983, "weight": 18},
+    {"name": "Gachibowli", "lat": 17.4401, "lng": 78.3489, "weight": 15},
+]
+CITY_WEIGHTS = [city['weight'] for city in TELANGANA_CITIES]
+
+FIRST_NAMES = ["Aarav", "Vihaan", "Aditya", "Sai", "Pavan", "Rohan", "Karthik", "Ananya", "Diya", "Saanvi", "Lakshmi", "Priya"]
+LAST_NAMES = ["Reddy", "Rao", "Kumar", "Sharma", "Verma", "Singh", "Patel", "Gupta"]
+
+PET_NAMES = ["Bruno", "Max", "Luna", "Simba", "Coco", "Rocky", "Bella", "Tiger", "Milo", "Sheru", "Moti", "Kitty", "Snowy", "Tommy", "Chintu"]
+BREEDS = {
+    'Dog': ["Indie", "Labrador", "German Shepherd", "Golden Retriever", "Beagle", "Pug"],
+    'Cat': ["Indian Domestic", "Persian", "Siamese", "Bengal"],
+    'Bird': ["Parrot", "Budgie", "Cockatiel"],
+    'Rabbit': ["Dutch", "Lionhead"],
+}
+# Roughly what a production listing table looks like
+PET_STATUS_WEIGHTS = {
+    'Available for Adoption': 30, 'Adopted': 15, 'Pending': 10,
+    'Lost': 20, 'Found': 15, 'Reunited': 10,
+}
+USER_ROLE_WEIGHTS = {'user': 85, 'volunteer': 10, 'shelter': 5}
+
+MESSAGE_LINES = [
+    "Hi, I think I saw your pet near the market.",
+    "Is the dog still available for adoption?",
+    "Can you share more photos?",
+    "Yes, he is vaccinated and very friendly.",
+    "When can I come and meet her?",
+    "Thank you so much for helping!",
+    "Which area was the pet last seen in?",
+    "I can bring food and water tomorrow morning.",
+    "Please call me when you are free.",
+    "Great, see you at the shelter at 5 pm.",
+]
+FEEDING_MENUS = ["Rice and curd", "Dog biscuits", "Chicken and rice", "Milk and bread", "Dry kibble", "Boiled eggs"]
+NOTIFICATION_TEMPLATES = [
+    ('new_message', 'New Message', 'You have a new message in your chat.'),
+    ('pet_approved', 'Pet Report Approved!', 'Your pet report has been approved and is now live!'),
+    ('lost_pet_matched', 'Possible Match Found', 'A found pet report may match your lost pet.'),
+    ('admin_announcement', 'Vaccination Camp', 'A free vaccination camp is being held near you this weekend.'),
+    ('adoption_approved', 'Adoption Approved', 'Your adoption application has been approved!'),
+    ('pet_verified', 'Pet Verified', 'Your pet has been verified and is now live!'),
+]
+
+
+def get_random_location(rng=random):
+    """A point near a Telangana city (within about 5 km), with a matching pincode."""
+    city = rng.choices(TELANGANA_CITIES, weights=CITY_WEIGHTS)[0]
+    return {
+        "city": city["name"],
+        "lat": round(city["lat"] + rng.uniform(-0.05, 0.05), 6),
+        "lng": round(city["lng"] + rng.uniform(-0.05, 0.05), 6),
+        "state": "Telangana",
+        "pincode": f"500{rng.randint(100, 999)}",
+    }
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class SyntheticDataGenerator:
+    def __init__(self, seed=42, days=365, batch_size=5000, prefix='synthetic', log=print):
+        self.rng = random.Random(seed)
+        self.days = days
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.log = log
+        self.now = timezone.now()
+
+    def _timestamp(self, after=None):
+        """A moment in the window (or after `after`), denser towards now."""
+        start = after or self.now - timedelta(days=self.days)
+        span = (self.now - start).total_seconds()
+        return self.now - timedelta(seconds=span * self.rng.random() ** 2)
+
+    def _choice(self, weights):
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _insert(self, model, objects, label):
+        """bulk_create the generated objects batch by batch; returns the id they start after."""
+        started = time.monotonic()
+        after_id = model.objects.aggregate(last=Max('id'))['last'] or 0
+        count = 0
+        with explicit_timestamps(model):
+            for batch in _chunks(objects, self.batch_size):
+                with transaction.atomic():
+                    model.objects.bulk_create(batch, batch_size=self.batch_size)
+                count += len(batch)
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.log(f'{label}: {count} rows in {elapsed:.1f}s ({count / elapsed:.0f} rows/s)')
+        return after_id
+
+    def _read_back(self, model, after_id, fields):
+        """Yield lists of `fields` tuples for rows with id > after_id, one id window at a time."""
+        while True:
+            rows = list(
+                model.objects.filter(id__gt=after_id).order_by('id').values_list('id', *fields)[:self.batch_size]
+            )
+            if not rows:
+                return
+            yield rows
+            after_id = rows[-1][0]
+
+    def _ids(self, model, after_id):
+        return list(model.objects.filter(id__gt=after_id).order_by('id').values_list('id', flat=True))
+
+    def users(self, count, password='Synthetic@12345'):
+        """Create `count` users; returns their ids."""
+        from users.models import User
+
+        # One hash for everybody: hashing per user would dominate the run
+        password_hash = make_password(password)
+        first = User.objects.filter(email__startswith=f'{self.prefix}.').count()
+
+        def generate():
+            for n in range(first, first + count):
+                first_name, last_name = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+                location = get_random_location(self.rng)
+                role = self._choice(USER_ROLE_WEIGHTS)
+                yield User(
+                    email=f'{self.prefix}.{n}@example.com',
+                    password=password_hash,
+                    name=f'{first_name} {last_name}',
+                    role=role,
+                    phone=f'9{self.rng.randint(100000000, 999999999)}',
+                    country_code='+91',
+                    pincode=location['pincode'],
+                    address=f"{self.rng.randint(1, 500)}, {location['city']} Main Road",
+                    is_volunteer=role == 'volunteer',
+                    is_shelter_provider=role == 'shelter',
+                    is_active=self.rng.random() > 0.03,
+                    date_joined=self._timestamp(),
+                )
+
+        return self._ids(User, self._insert(User, generate(), 'users'))
+
+    def _categories(self):
+        from pets.models import Category
+
+        categories = dict(Category.objects.values_list('name', 'id'))
+        if not categories:
+            Category.objects.bulk_create([Category(name=name) for name in [*BREEDS, 'Other']], ignore_conflicts=True)
+            categories = dict(Category.objects.values_list('name', 'id'))
+        return categories
+
+    def pets(self, count, user_ids, max_images=2):
+        """Create `count` pets across all statuses, plus up to `max_images` gallery images each; returns pet ids."""
+        from pets.models import Pet, PetImage
+
+        categories = self._categories()
+        category_names = list(categories)
+
+        def generate():
+            for _ in range(count):
+                status = self._choice(PET_STATUS_WEIGHTS)
+                category = self.rng.choice(category_names)
+                location = get_random_location(self.rng)
+                created_at = self._timestamp()
+                posted_by = self.rng.choice(user_ids)
+                seed = self.rng.randint(1, 10 ** 9)
+                image_url = f'https://picsum.photos/seed/{seed}/600/400'
+                pet = Pet(
+                    name=self.rng.choice(PET_NAMES),
+                    breed=self.rng.choice(BREEDS.get(category, ['Mixed'])),
+                    age=self.rng.randint(0, 15),
+                    gender=self.rng.choice(['Male', 'Female', 'Unknown']),
+                    size=self.rng.choice(['Small', 'Medium', 'Large', 'Extra Large']),
+                    description=f'{status} {category.lower()} near {location["city"]}.',
+                    category_id=categories[category],
+                    adoption_status=status,
+                    location=f"{location['city']}, {location['state']}",
+                    pincode=location['pincode'],
+                    location_latitude=location['lat'],
+                    location_longitude=location['lng'],
+                    image_url=image_url,
+                    cloudinary_url=image_url,
+                    posted_by_id=posted_by,
+                    owner_id=self.rng.choice(user_ids) if status == 'Adopted' else posted_by,
+                    created_at=created_at,
+                    updated_at=self._timestamp(after=created_at),
+                    is_verified=status != 'Pending' and self.rng.random() > 0.05,
+                    views_count=int(self.rng.expovariate(1 / 40)),
+                )
+                if status in ('Lost', 'Reunited'):
+                    pet.last_seen = created_at - timedelta(hours=self.rng.randint(1, 72))
+                if status in ('Found', 'Reunited') or (status == 'Pending' and self.rng.random() < 0.5):
+                    pet.found_date = created_at - timedelta(hours=self.rng.randint(1, 48))
+                if status == 'Reunited':
+                    pet.is_reunited = True
+                    pet.reunited_at = self._timestamp(after=created_at)
+                yield pet
+
+        after_id = self._insert(Pet, generate(), 'pets')
+
+        def images():
+            for rows in self._read_back(Pet, after_id, ['created_at']):
+                for pet_id, created_at in rows:
+                    for n in range(self.rng.randint(0, max_images)):
+                        url = f'https://picsum.photos/seed/{pet_id}-{n}/600/400'
+                        yield PetImage(
+                            pet_id=pet_id, image=f'pets/gallery/synthetic-{pet_id}-{n}.jpg',
+                            cloudinary_url=url, caption=f'Photo {n + 1}', created_at=created_at,
+                        )
+
+        if max_images:
+            self._insert(PetImage, images(), 'pet images')
+        return self._ids(Pet, after_id)
+
+    def chat_rooms(self, count, user_ids, messages_per_room=20):
+        """Create `count` two-person rooms with about `messages_per_room` messages each, plus read marks."""
+        from chats.models import ChatRoom, ChatRoomMember, Message
+
+        def rooms():
+            seen = set()
+            attempts = 0
+            while len(seen) < count and attempts < count * 10:
+                attempts += 1
+                a, b = sorted(self.rng.sample(user_ids, 2))
+                if (a, b) in seen:
+                    continue
+                seen.add((a, b))
+                created_at = self._timestamp()
+                yield ChatRoom(
+                    room_id=f'{a}_{b}', user_a_id=a, user_b_id=b,
+                    # Rooms sort by updated_at: it is the time of the room's last message
+                    created_at=created_at, updated_at=self._timestamp(after=created_at),
+                    is_active=self.rng.random() > 0.1,
+                )
+
+        after_id = self._insert(ChatRoom, rooms(), 'chat rooms')
+
+        Participant = ChatRoom.participants.through
+        self._insert(Participant, (
+            Participant(chatroom_id=room_id, user_id=user_id)
+            for rows in self._read_back(ChatRoom, after_id, ['user_a_id', 'user_b_id'])
+            for room_id, a, b in rows for user_id in (a, b)
+        ), 'chat participants')
+
+        def messages():
+            fields = ['user_a_id', 'user_b_id', 'created_at', 'updated_at']
+            for rows in self._read_back(ChatRoom, after_id, fields):
+                for room_id, a, b, created_at, updated_at in rows:
+                    total = max(1, int(self.rng.expovariate(1 / messages_per_room)))
+                    span = (updated_at - created_at).total_seconds()
+                    offsets = sorted(self.rng.random() * span for _ in range(total - 1)) + [span]
+                    for n, offset in enumerate(offsets):
+                        yield Message(
+                            room_id=room_id,
+                            sender_id=a if self.rng.random() < 0.5 else b,
+                            content=self.rng.choice(MESSAGE_LINES),
+                            read_status=n < total - 2,
+                            created_at=created_at + timedelta(seconds=offset),
+                        )
+
+        message_after_id = self._insert(Message, messages(), 'messages')
+        # bulk_create sends no signals, so index_message never ran for these
+        from chats.search import index_messages_after
+        index_messages_after(message_after_id)
+        self._insert(ChatRoomMember, self._read_marks(after_id), 'read marks')
+
+    def _read_marks(self, after_id):
+        """Read marks for the rooms with id > after_id, matching the messages' read_status.
+
+        A participant has read up to the message before the first unread one
+        someone else sent them.
+        """
+        from chats.models import ChatRoom, ChatRoomMember, Message
+
+        for rooms in self._read_back(ChatRoom, after_id, ['user_a_id', 'user_b_id']):
+            history = {}
+            for row in (
+                Message.objects.filter(room_id__in=[room[0] for room in rooms]).order_by('room_id', 'id')
+                .values_list('room_id', 'id', 'sender_id', 'read_status', 'created_at')
+            ):
+                history.setdefault(row[0], []).append(row[1:])
+            for room_id, a, b in rooms:
+                for user_id in (a, b):
+                    mark = None
+                    for message_id, sender_id, read_status, created_at in history.get(room_id, []):
+                        if sender_id != user_id and not read_status:
+                            break
+                        mark = (message_id, created_at)
+                    if mark:
+                        yield ChatRoomMember(
+                            room_id=room_id, user_id=user_id,
+                            last_read_message_id=mark[0], updated_at=mark[1],
+                        )
+
+    def notifications(self, per_user, user_ids, pet_ids):
+        """About `per_user` notifications for every user, most of them read."""
+        from notifications.models import Notification
+
+        def generate():
+            for user_id in user_ids:
+                for _ in range(self.rng.randint(0, per_user * 2)):
+                    notification_type, title, message = self.rng.choice(NOTIFICATION_TEMPLATES)
+                    pet_id = self.rng.choice(pet_ids) if pet_ids and notification_type != 'admin_announcement' else None
+                    yield Notification(
+                        user_id=user_id, title=title, message=message,
+                        notification_type=notification_type,
+                        link_target=f'/pets/{pet_id}' if pet_id else None,
+                        related_pet_id=pet_id,
+                        is_read=self.rng.random() < 0.7,
+                        created_at=self._timestamp(),
+                    )
+
+        self._insert(Notification, generate(), 'notifications')
+
+    def feeding(self, points, records, user_ids):
+        """Create `points` feeding points and `records` feeding records."""
+        from users.models import FeedingPoint, FeedingRecord
+
+        def generate_points():
+            for n in range(points):
+                location = get_random_location(self.rng)
+                created_at = self._timestamp()
+                yield FeedingPoint(
+                    name=f"Feeding Spot - {location['city']} {n + 1}",
+                    address=f"Municipal Park Area, {location['city']}",
+                    city=location['city'], state=location['state'], pincode=location['pincode'],
+                    latitude=location['lat'], longitude=location['lng'],
+                    created_by_id=self.rng.choice(user_ids),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+
+        point_ids = self._ids(FeedingPoint, self._insert(FeedingPoint, generate_points(), 'feeding points'))
+
+        def generate_records():
+            for _ in range(records):
+                location = get_random_location(self.rng)
+                created_at = self._timestamp()
+                yield FeedingRecord(
+                    user_id=self.rng.choice(user_ids),
+                    feeding_point_id=self.rng.choice(point_ids) if point_ids and self.rng.random() < 0.7 else None,
+                    menu=self.rng.choice(FEEDING_MENUS),
+                    feeding_date=created_at.date(),
+                    number_of_pets=self.rng.randint(1, 12),
+                    location_address=f"{location['city']}, {location['state']}",
+                    latitude=location['lat'], longitude=location['lng'],
+                    created_at=created_at,
+                )
+
+        self._insert(FeedingRecord, generate_records(), 'feeding records')
@@ -0,0 +1,214 @@
+"""
+Per-request instrumentation: query counts, SQL/view/render time, response size.
+
+RequestMetricsMiddleware wraps every request in connection.execute_wrapper()
+to count queries and time them, and uses the process_view /
+process_template_response hooks to split the view from rendering (JSON
+serialization of DRF responses). Staff users get a Server-Timing header on
+every response; everyone else only when REQUEST_METRICS_SERVER_TIMING is on
+(by default only under DEBUG). Every request is recorded either way: requests
+over REQUEST_METRICS_BUDGET_MS or REQUEST_METRICS_QUERY_BUDGET are printed as
+[SLOW REQUEST] lines, and the last REQUEST_METRICS_SAMPLES requests of every
+endpoint (method + URL route, not the raw path) are kept in a ring buffer for
+the admin metrics endpoint. Numbers are per process.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+UNMATCHED_ENDPOINT = '<unmatched>'
+
+_lock = threading.Lock()
+_endpoints = {}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class QueryTimer:
+    """execute_wrapper that counts queries and adds up their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+class EndpointStats:
+    """Lifetime counters plus a ring buffer of the most recent request samples."""
+
+    def __init__(self, size):
+        self.requests = 0
+        self.slow = 0
+        self.errors = 0
+        self.samples = deque(maxlen=size)
+
+    def add(self, sample, slow):
+        self.requests += 1
+        self.slow += slow
+        self.errors += sample['status'] >= 500
+        self.samples.append(sample)
+
+
+def record(endpoint, sample, slow=False):
+    with _lock:
+        stats = _endpoints.get(endpoint)
+        if stats is None:
+            stats = _endpoints[endpoint] = EndpointStats(_setting('REQUEST_METRICS_SAMPLES', 500))
+        stats.add(sample, slow)
+
+
+def reset():
+    with _lock:
+        _endpoints.clear()
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def _summary(values, percentiles=(50, 95, 99)):
+    ordered = sorted(values)
+    summary = {f'p{pct}': round(_percentile(ordered, pct), 2) for pct in percentiles}
+    summary['max'] = round(ordered[-1], 2)
+    return summary
+
+
+def _histogram(durations):
+    buckets = dict.fromkeys([f'le_{bound}' for bound in HISTOGRAM_BOUNDS_MS] + ['inf'], 0)
+    for duration in durations:
+        bound = next((bound for bound in HISTOGRAM_BOUNDS_MS if duration <= bound), None)
+        buckets[f'le_{bound}' if bound else 'inf'] += 1
+    return buckets
+
+
+def snapshot(endpoint=None):
+    """Per-endpoint summaries of the buffered samples, slowest p95 first."""
+    with _lock:
+        items = [
+            (name, stats.requests, stats.slow, stats.errors, list(stats.samples))
+            for name, stats in _endpoints.items()
+            if endpoint is None or endpoint in name
+        ]
+
+    results = []
+    for name, requests, slow, errors, samples in items:
+        if not samples:
+            continue
+        sizes = [sample['bytes'] for sample in samples if sample['bytes'] is not None]
+        results.append({
+            'endpoint': name,
+            'requests': requests,
+            'slow_requests': slow,
+            'server_errors': errors,
+            'samples': len(samples),
+            'total_ms': _summary([sample['total_ms'] for sample in samples]),
+            'view_ms': _summary([sample['view_ms'] for sample in samples], (50, 95)),
+            'render_ms': _summary([sample['render_ms'] for sample in samples], (50, 95)),
+            'sql_ms': _summary([sample['sql_ms'] for sample in samples], (50, 95)),
+            'queries': _summary([sample['queries'] for sample in samples], (50, 95)),
+            'response_bytes': _summary(sizes, (50, 95)) if sizes else None,
+            'histogram_ms': _histogram(sample['total_ms'] for sample in samples),
+        })
+    results.sort(key=lambda result: result['total_ms']['p95'], reverse=True)
+    return results
+
+
+def server_timing(sample):
+    return ', '.join([
+        f'db;dur={sample["sql_ms"]:.1f};desc="{sample["queries"]} queries"',
+        f'view;dur={sample["view_ms"]:.1f}',
+        f'render;dur={sample["render_ms"]:.1f}',
+        f'total;dur={sample["total_ms"]:.1f}',
+    ])
+
+
+class RequestMetricsMiddleware:
+    """Measures each request; see the module docstring. Keep it first in MIDDLEWARE."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _setting('REQUEST_METRICS_ENABLED', True):
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        request._metrics = {'view_started': None, 'view_finished': None, 'rendered': None}
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        try:
+            self.finish(request, response, timer, started, finished)
+        except Exception as e:
+            print(f"Error recording request metrics: {e}")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_metrics'):
+            request._metrics['view_started'] = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        # The view has returned; rendering (DRF's JSON serialization) comes next
+        marks = getattr(request, '_metrics', None)
+        if marks is not None:
+            marks['view_finished'] = time.perf_counter()
+
+            def rendered(response):
+                marks['rendered'] = time.perf_counter()
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, timer, started, finished):
+        marks = request._metrics
+        view_started = marks['view_started'] or started
+        view_finished = marks['view_finished'] or finished
+        rendered = marks['rendered'] or view_finished
+        sample = {
+            'status': response.status_code,
+            'total_ms': (finished - started) * 1000,
+            'view_ms': (view_finished - view_started) * 1000,
+            'render_ms': (rendered - view_finished) * 1000,
+            'sql_ms': timer.seconds * 1000,
+            'queries': timer.count,
+            'bytes': None if response.streaming else len(response.content),
+        }
+
+        match = getattr(request, 'resolver_match', None)
+        endpoint = f'{request.method} /{match.route}' if match and match.route else UNMATCHED_ENDPOINT
+        slow = (
+            sample['total_ms'] > _setting('REQUEST_METRICS_BUDGET_MS', 500)
+            or sample['queries'] > _setting('REQUEST_METRICS_QUERY_BUDGET', 50)
+        )
+        record(endpoint, sample, slow)
+
+        if slow:
+            print(
+                f"[SLOW REQUEST] {request.method} {request.path} -> {endpoint}: "
+                f"{sample['total_ms']:.1f}ms, {sample['queries']} queries ({sample['sql_ms']:.1f}ms SQL), "
+                f"view {sample['view_ms']:.1f}ms, render {sample['render_ms']:.1f}ms, "
+                f"{sample['bytes'] if sample['bytes'] is not None else 'streamed'} bytes"
+            )
+        # DRF copies the authenticated (JWT) user back onto the Django request
+        user = getattr(request, 'user', None)
+        if _setting('REQUEST_METRICS_SERVER_TIMING', settings.DEBUG) or getattr(user, 'is_staff', False):
+            response['Server-Timing'] = server_timing(sample)
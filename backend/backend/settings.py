@@ -3,6 +3,7 @@ Django settings for backend project.
 """
 
 import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -23,6 +24,9 @@ SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-change-this-in-production'
 DEBUG_ENV = os.getenv('DEBUG', 'True').lower()
 DEBUG = DEBUG_ENV in ('true', '1', 'yes', 'on')
 
+# True under `manage.py test` (e.g. admin logs are written synchronously)
+TESTING = sys.argv[1:2] == ['test']
+
 # ALLOWED_HOSTS - always set, even in development
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1,0.0.0.0').split(',')
 # Remove empty strings from the list
@@ -67,6 +71,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.instrumentation.RequestMetricsMiddleware',  # Query counts, timings and Server-Timing for every request
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'backend.middleware.RenderHostMiddleware',  # Allow .onrender.com domains
@@ -75,6 +80,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'adminpanel.audit.AdminLogBufferMiddleware',  # Writes a request's admin logs in one INSERT
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -301,5 +307,41 @@ CORS_ALLOW_HEADERS = [
 ]
 
 # Expose headers for CORS
-CORS_EXPOSE_HEADERS = ['content-type', 'authorization']
-
+CORS_EXPOSE_HEADERS = ['content-type', 'authorization', 'server-timing']
+
+
+# Chat WebSocket tuning
+# Read receipts are coalesced for this many milliseconds before being written
+CHAT_READ_RECEIPT_FLUSH_MS = int(os.getenv('CHAT_READ_RECEIPT_FLUSH_MS', '50'))
+# Batch message inserts across sockets (0 = write each message immediately)
+CHAT_MESSAGE_BATCH_MS = int(os.getenv('CHAT_MESSAGE_BATCH_MS', '0'))
+# Typing broadcasts: at most one per user per room per interval, auto-stop after timeout
+CHAT_TYPING_INTERVAL_MS = int(os.getenv('CHAT_TYPING_INTERVAL_MS', '3000'))
+CHAT_TYPING_TIMEOUT_MS = int(os.getenv('CHAT_TYPING_TIMEOUT_MS', '6000'))
+# Presence: delay before announcing offline, and how long a silent connection counts as online
+CHAT_PRESENCE_GRACE_MS = int(os.getenv('CHAT_PRESENCE_GRACE_MS', '5000'))
+CHAT_PRESENCE_TTL_SECONDS = int(os.getenv('CHAT_PRESENCE_TTL_SECONDS', '90'))
+# SSE message stream: seconds between database polls per connected client
+SSE_POLL_SECONDS = float(os.getenv('SSE_POLL_SECONDS', '3'))
+# room_key -> chat room id mappings are cached this long (membership is always checked live)
+CHAT_ROOM_CACHE_SECONDS = int(os.getenv('CHAT_ROOM_CACHE_SECONDS', '30'))
+# Chat history archival (python manage.py archive_chat_messages)
+CHAT_ARCHIVE_AFTER_DAYS = int(os.getenv('CHAT_ARCHIVE_AFTER_DAYS', '180'))
+CHAT_DELETED_RETENTION_DAYS = int(os.getenv('CHAT_DELETED_RETENTION_DAYS', '30'))
+# Admin chat statistics cache (dropped on ChatRequest/ChatRoom changes)
+CHAT_STATS_CACHE_SECONDS = int(os.getenv('CHAT_STATS_CACHE_SECONDS', '30'))
+# Moderation queue: how long a claimed item stays reserved for one admin
+MODERATION_LEASE_SECONDS = int(os.getenv('MODERATION_LEASE_SECONDS', '300'))
+# Admin logs are written after commit in one INSERT per request (False, and always under tests: write each one synchronously)
+ADMIN_LOG_BUFFERED = os.getenv('ADMIN_LOG_BUFFERED', 'True').lower() == 'true'
+# Logs older than this are moved to the archive table by `manage.py archive_admin_logs`
+ADMIN_LOG_ARCHIVE_AFTER_DAYS = int(os.getenv('ADMIN_LOG_ARCHIVE_AFTER_DAYS', '180'))
+# Request instrumentation (backend.instrumentation): Server-Timing header, slow-request log, per-endpoint samples
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True').lower() == 'true'
+# Server-Timing goes to every client only when this is on (default: DEBUG); staff users always get it
+REQUEST_METRICS_SERVER_TIMING = os.getenv('REQUEST_METRICS_SERVER_TIMING', str(DEBUG)).lower() == 'true'
+# Requests slower than this, or running more queries than this, are logged as [SLOW REQUEST]
+REQUEST_METRICS_BUDGET_MS = int(os.getenv('REQUEST_METRICS_BUDGET_MS', '500'))
+REQUEST_METRICS_QUERY_BUDGET = int(os.getenv('REQUEST_METRICS_QUERY_BUDGET', '50'))
+# Most recent requests kept per endpoint for /api/admin/metrics/requests
+REQUEST_METRICS_SAMPLES = int(os.getenv('REQUEST_METRICS_SAMPLES', '500'))
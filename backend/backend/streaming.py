@@ -0,0 +1,132 @@
+"""
+Helpers for streaming exports (CSV / NDJSON, optionally gzipped).
+
+Rows come from QuerySet.iterator(chunk_size=...) and are encoded one line at
+a time, so memory use does not depend on how many rows are exported. Used by
+the chat transcript export and the admin data exports.
+"""
+import csv
+import json
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('ndjson', 'csv')
+GZIP_FLUSH_BYTES = 64 * 1024
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each row straight back."""
+
+    def write(self, value):
+        return value
+
+
+def parse_bound(value, end_of_day=False):
+    """Accept an ISO datetime or a plain date (a date upper bound includes the whole day)."""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date: {value}')
+        parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def wants_gzip(query_params):
+    return str(query_params.get('gzip', '')).lower() in ('1', 'true', 'yes')
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def iter_rows(querysets, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield rows (lists) of values_list() querysets in turn, dates as ISO strings."""
+    for queryset in querysets:
+        for row in queryset.iterator(chunk_size=chunk_size):
+            yield [_plain(value) for value in row]
+
+
+def ndjson_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row))) + '\n'
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def gzip_chunks(lines, flush_bytes=GZIP_FLUSH_BYTES):
+    """Compress text lines into gzip member bytes, yielding about `flush_bytes` at a time."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    pending = []
+    size = 0
+    for line in lines:
+        data = compressor.compress(line.encode())
+        if data:
+            pending.append(data)
+            size += len(data)
+            if size >= flush_bytes:
+                yield b''.join(pending)
+                pending, size = [], 0
+    pending.append(compressor.flush())
+    yield b''.join(pending)
+
+
+async def async_chunks(chunks, per_chunk=500):
+    """Pull chunks from the sync generator a batch at a time on the ORM thread.
+
+    Django buffers sync iterators completely when serving over ASGI, so
+    exports have to be handed to daphne as an async iterator.
+    """
+    def next_batch():
+        batch = list(islice(chunks, per_chunk))
+        return batch[0][:0].join(batch) if batch else None
+
+    next_chunk = sync_to_async(next_batch, thread_sensitive=True)
+    while True:
+        chunk = await next_chunk()
+        if not chunk:
+            break
+        yield chunk
+
+
+def export_response(request, header, rows, output, filename, compress=False):
+    """StreamingHttpResponse of `rows` as CSV or NDJSON, gzipped when `compress`.
+
+    `request` is the DRF or Django request; `filename` has no extension.
+    """
+    lines = csv_lines(header, rows) if output == 'csv' else ndjson_lines(header, rows)
+    content_type = 'text/csv' if output == 'csv' else 'application/x-ndjson'
+    filename = f'{filename}.{output}'
+    per_chunk = 500
+    if compress:
+        lines = gzip_chunks(lines)
+        content_type = 'application/gzip'
+        filename += '.gz'
+        per_chunk = 1
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        lines = async_chunks(lines, per_chunk)
+
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
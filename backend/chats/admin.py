@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ChatRoom, Message
+from .models import ArchivedMessage, ChatRoom, ChatRoomMember, Message
 
 
 @admin.register(ChatRoom)
@@ -15,3 +15,16 @@ class MessageAdmin(admin.ModelAdmin):
     list_filter = ('read_status', 'created_at')
     search_fields = ('content', 'sender__name', 'sender__email')
 
+
+
+@admin.register(ArchivedMessage)
+class ArchivedMessageAdmin(admin.ModelAdmin):
+    list_display = ('id', 'sender', 'room', 'created_at', 'archived_at')
+    list_filter = ('archived_at',)
+    search_fields = ('content', 'sender__name', 'sender__email')
+
+
+@admin.register(ChatRoomMember)
+class ChatRoomMemberAdmin(admin.ModelAdmin):
+    list_display = ('room', 'user', 'last_read_message_id', 'updated_at')
+    search_fields = ('user__email', 'user__name', 'room__room_id')
@@ -0,0 +1,65 @@
+"""
+Archival of old chat history.
+
+Messages older than CHAT_ARCHIVE_AFTER_DAYS, and all messages of closed rooms
+(is_active=False), are moved from Message into ArchivedMessage in batches, so
+the live table and its (room, created_at) / (room, id) indexes only cover
+recent conversations. The history API reads the archive lazily through
+chats.pagination when a page reaches past the live rows.
+
+Soft-deleted messages are not archived; once deleted_at is older than
+CHAT_DELETED_RETENTION_DAYS they are purged from both tables.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import ArchivedMessage, Message
+
+ARCHIVED_FIELDS = [
+    'id', 'room_id', 'sender_id', 'content', 'message_type', 'image', 'cloudinary_url',
+    'cloudinary_public_id', 'is_deleted', 'deleted_at', 'read_status', 'created_at',
+]
+
+
+def archivable_messages(older_than_days=None, include_closed_rooms=True):
+    """Live messages that are due for archival."""
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'CHAT_ARCHIVE_AFTER_DAYS', 180)
+    lookup = Q(created_at__lt=timezone.now() - timedelta(days=older_than_days))
+    if include_closed_rooms:
+        lookup |= Q(room__is_active=False)
+    return Message.objects.filter(lookup, is_deleted=False)
+
+
+def archive_messages(queryset, batch_size=1000):
+    """Move the messages in `queryset` to the archive, one transaction per batch.
+
+    Returns the number of messages moved.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by('id').values(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                break
+            ArchivedMessage.objects.bulk_create(
+                [ArchivedMessage(**row) for row in rows],
+                ignore_conflicts=True,
+            )
+            Message.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
+        if len(rows) < batch_size:
+            break
+    return moved
+
+
+def purge_deleted_messages(retention_days=None):
+    """Permanently remove soft-deleted messages past their retention window."""
+    if retention_days is None:
+        retention_days = getattr(settings, 'CHAT_DELETED_RETENTION_DAYS', 30)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    live, _ = Message.objects.filter(is_deleted=True, deleted_at__lt=cutoff).delete()
+    archived, _ = ArchivedMessage.objects.filter(is_deleted=True, deleted_at__lt=cutoff).delete()
+    return live + archived
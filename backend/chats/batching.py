@@ -0,0 +1,152 @@
+"""
+Coalescing database writers for the chat WebSocket hot path.
+
+Read receipts arrive once per message per participant; writing each one as its own
+UPDATE is pure write amplification because read marks are high-water marks. The
+writers here collect items for a few milliseconds and persist them in one batch
+off the event loop.
+"""
+import asyncio
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+from channels.db import database_sync_to_async
+
+
+class CoalescingWriter:
+    """Collects submitted items for `delay` seconds, then writes them with one call to `write_batch`.
+
+    `write_batch` runs in a worker thread, receives the list of items and returns one
+    result per item. `submit` returns a future resolved with that item's result
+    (None if the batch failed).
+    """
+
+    def __init__(self, delay, write_batch):
+        self.delay = delay
+        self.write_batch = write_batch
+        self._pending = []
+        self._flush_task = None
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_delay())
+        return future
+
+    async def _flush_after_delay(self):
+        await asyncio.sleep(self.delay)
+        self._flush_task = None
+        await self._write(self._take_pending())
+
+    async def flush(self):
+        """Write everything pending right now (e.g. when a socket disconnects)."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._write(self._take_pending())
+
+    def _take_pending(self):
+        batch, self._pending = self._pending, []
+        return batch
+
+    async def _write(self, batch):
+        if not batch:
+            return
+        try:
+            results = await database_sync_to_async(self.write_batch)([item for item, _ in batch])
+        except Exception as e:
+            print(f"[WebSocket] Batched write failed ({len(batch)} items): {e}")
+            results = [None] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def write_read_marks(receipts):
+    """Persist (room_id, user_id, message_id) receipts as one read-mark advance per (room, user).
+
+    Marks are clamped to the newest message of each room, as in ChatRoomMember.mark_read.
+    """
+    from .models import ChatRoom, ChatRoomMember
+
+    newest = ChatRoom.latest_message_ids({room_id for room_id, _, _ in receipts})
+    latest = {}
+    for room_id, user_id, message_id in receipts:
+        key = (room_id, user_id)
+        latest[key] = max(latest.get(key, 0), min(message_id, newest.get(room_id, 0)))
+
+    lookup = Q()
+    for room_id, user_id in latest:
+        lookup |= Q(room_id=room_id, user_id=user_id)
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            (member.room_id, member.user_id): member
+            for member in ChatRoomMember.objects.select_for_update().filter(lookup)
+        }
+        to_update = []
+        to_create = []
+        for (room_id, user_id), message_id in latest.items():
+            member = existing.get((room_id, user_id))
+            if member is None:
+                to_create.append(ChatRoomMember(room_id=room_id, user_id=user_id, last_read_message_id=message_id))
+            elif member.last_read_message_id < message_id:
+                member.last_read_message_id = message_id
+                member.updated_at = now
+                to_update.append(member)
+        if to_update:
+            ChatRoomMember.objects.bulk_update(to_update, ['last_read_message_id', 'updated_at'])
+        if to_create:
+            ChatRoomMember.objects.bulk_create(to_create, ignore_conflicts=True)
+    return [None] * len(receipts)
+
+
+def write_messages(items):
+    """Insert text messages ({'room_id', 'sender_id', 'content'}) with one bulk_create.
+
+    Returns {'id', 'timestamp'} per item, in order. post_save is sent for each row so
+    notification signals behave exactly as with Message.objects.create().
+    """
+    from .models import ChatRoom, Message
+
+    messages = [
+        Message(room_id=item['room_id'], sender_id=item['sender_id'], content=item['content'])
+        for item in items
+    ]
+    with transaction.atomic():
+        Message.objects.bulk_create(messages)
+        ChatRoom.objects.filter(pk__in={item['room_id'] for item in items}).update(updated_at=timezone.now())
+    for message in messages:
+        post_save.send(sender=Message, instance=message, created=True, update_fields=None, raw=False, using=message._state.db)
+    return [{'id': message.id, 'timestamp': message.created_at.isoformat()} for message in messages]
+
+
+_writers = {}
+
+
+def _writer(name, delay, write_batch):
+    """One writer per event loop, so every consumer in the process shares the same batch."""
+    loop = asyncio.get_running_loop()
+    writer_loop, writer = _writers.get(name, (None, None))
+    if writer_loop is not loop:
+        writer = CoalescingWriter(delay, write_batch)
+        _writers[name] = (loop, writer)
+    return writer
+
+
+def get_read_receipt_writer():
+    delay = getattr(settings, 'CHAT_READ_RECEIPT_FLUSH_MS', 50) / 1000
+    return _writer('read_receipts', delay, write_read_marks)
+
+
+def get_message_writer():
+    """Shared message writer, or None when message batching is disabled (the default)."""
+    delay_ms = getattr(settings, 'CHAT_MESSAGE_BATCH_MS', 0)
+    if not delay_ms:
+        return None
+    return _writer('messages', delay_ms / 1000, write_messages)
@@ -1,8 +1,11 @@
 import json
+import functools
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from .models import ChatRoom, Message, ChatRequest
+from .batching import get_message_writer, get_read_receipt_writer
+from .presence import get_presence_registry, get_typing_throttle
 from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth.models import AnonymousUser
@@ -30,9 +33,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.user = user
             print(f"WebSocket user authenticated: {user.id}")
             
-            # Verify user has access to this room
-            has_access = await self.verify_room_access(self.room_id, user)
-            if not has_access:
+            # Verify user has access to this room; the room is fixed for the life of the socket
+            self.room = await self.get_accessible_room(self.room_id, user)
+            if self.room is None:
                 print(f"WebSocket connection rejected: User {user.id} does not have access to room {self.room_id}")
                 await self.close(code=4003)  # Forbidden
                 return
@@ -48,19 +51,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.accept()
             print(f"WebSocket connection accepted for room {self.room_id}, user {user.id}")
             
-            # Send presence update
-            try:
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        'type': 'presence_update',
-                        'user_id': user.id,
-                        'user_name': getattr(user, 'name', user.email),
-                        'status': 'online'
-                    }
-                )
-            except Exception as e:
-                print(f"Error sending presence update: {e}")
+            # Send presence update (skipped if this user is already online in the room)
+            await self.join_presence(self.room_id)
         except Exception as e:
             print(f"Error in WebSocket connect: {e}")
             import traceback
@@ -68,23 +60,18 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.close(code=4000)  # Internal error
     
     async def disconnect(self, close_code):
+        # Persist any read receipts still waiting in the batch
+        await get_read_receipt_writer().flush()
+        
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
         
-        # Send presence update
-        if hasattr(self, 'user'):
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'presence_update',
-                    'user_id': self.user.id,
-                    'user_name': self.user.name,
-                    'status': 'offline'
-                }
-            )
+        # Send presence update (deferred, so a quick reconnect announces nothing)
+        if getattr(self, 'room', None) is not None:
+            await self.leave_presence(self.room_id)
     
     async def receive(self, text_data):
         """Receive message from WebSocket."""
@@ -92,32 +79,46 @@ class ChatConsumer(AsyncWebsocketConsumer):
             data = json.loads(text_data)
             message_type = data.get('type')
             
+            # Any frame (including an explicit 'heartbeat') keeps presence fresh
+            get_presence_registry().heartbeat(self.room_id, self.user.id)
+            
             if message_type == 'message':
-                await self.handle_message(data)
+                await self.handle_message(data, self.room)
             elif message_type == 'typing':
-                await self.handle_typing(data)
+                await self.handle_typing(data, self.room)
             elif message_type == 'read':
-                await self.handle_read(data)
+                await self.handle_read(data, self.room)
         except json.JSONDecodeError:
             await self.send(text_data=json.dumps({
                 'type': 'error',
                 'message': 'Invalid JSON'
             }))
     
-    async def handle_message(self, data):
+    async def handle_message(self, data, room):
         """Handle incoming message."""
         content = data.get('content', '').strip()
         if not content:
             return
         
         # Save message to database
-        message = await self.save_message(self.room_id, self.user.id, content)
+        message_writer = get_message_writer()
+        if message_writer:
+            message = await message_writer.submit({
+                'room_id': room.pk,
+                'sender_id': self.user.id,
+                'content': content,
+            })
+        else:
+            message = await self.save_message(room, content)
+        if not message:
+            return
         
         # Send message to room group
         await self.channel_layer.group_send(
-            self.room_group_name,
+            f'chat_{room.room_id}',
             {
                 'type': 'chat_message',
+                'room_id': room.room_id,
                 'message': {
                     'id': message['id'],
                     'sender': {
@@ -132,25 +133,59 @@ class ChatConsumer(AsyncWebsocketConsumer):
             }
         )
     
-    async def handle_typing(self, data):
-        """Handle typing indicator."""
-        is_typing = data.get('typing', False)
-        
+    async def handle_typing(self, data, room):
+        """Handle typing indicator. Keystroke bursts are throttled before broadcasting."""
+        is_typing = bool(data.get('typing', False))
+        broadcast = functools.partial(self.broadcast_typing, room.room_id)
+        if get_typing_throttle().typing(room.room_id, self.user.id, is_typing, broadcast):
+            await self.broadcast_typing(room.room_id, is_typing)
+    
+    async def broadcast_typing(self, room_id, is_typing):
         await self.channel_layer.group_send(
-            self.room_group_name,
+            f'chat_{room_id}',
             {
                 'type': 'typing_indicator',
+                'room_id': room_id,
                 'user_id': self.user.id,
                 'user_name': self.user.name,
                 'typing': is_typing
             }
         )
     
-    async def handle_read(self, data):
-        """Handle read receipt."""
-        message_id = data.get('message_id')
+    async def join_presence(self, room_id):
+        if get_presence_registry().connected(room_id, self.user.id):
+            await self.send_presence(room_id, 'online')
+    
+    async def leave_presence(self, room_id):
+        if get_typing_throttle().stop(room_id, self.user.id):
+            await self.broadcast_typing(room_id, False)
+        get_presence_registry().disconnected(
+            room_id, self.user.id, functools.partial(self.send_presence, room_id, 'offline')
+        )
+    
+    async def send_presence(self, room_id, status):
+        try:
+            await self.channel_layer.group_send(
+                f'chat_{room_id}',
+                {
+                    'type': 'presence_update',
+                    'room_id': room_id,
+                    'user_id': self.user.id,
+                    'user_name': getattr(self.user, 'name', self.user.email),
+                    'status': status
+                }
+            )
+        except Exception as e:
+            print(f"Error sending presence update: {e}")
+    
+    async def handle_read(self, data, room):
+        """Handle read receipt. Receipts are coalesced and written in batches."""
+        try:
+            message_id = int(data.get('message_id') or 0)
+        except (TypeError, ValueError):
+            return
         if message_id:
-            await self.mark_message_read(message_id, self.user.id)
+            get_read_receipt_writer().submit((room.pk, self.user.id, message_id))
     
     # WebSocket message handlers
     async def chat_message(self, event):
@@ -223,73 +258,95 @@ class ChatConsumer(AsyncWebsocketConsumer):
             return AnonymousUser()
     
     @database_sync_to_async
-    def verify_room_access(self, room_id, user):
-        """Verify user has access to this chat room."""
+    def get_accessible_room(self, room_id, user):
+        """Return the chat room if the user has access to it, otherwise None."""
         try:
             room = ChatRoom.objects.get(room_id=room_id)
             # Check if user is in participants (most reliable)
             if room.participants.filter(id=user.id).exists():
-                return True
+                return room
             # Fallback: check user_a and user_b
-            if room.user_a and room.user_a.id == user.id:
-                return True
-            if room.user_b and room.user_b.id == user.id:
-                return True
-            return False
+            if user.id in (room.user_a_id, room.user_b_id):
+                return room
+            return None
         except ChatRoom.DoesNotExist:
-            return False
+            return None
         except Exception as e:
             print(f"Error verifying room access: {e}")
-            return False
+            return None
     
     @database_sync_to_async
-    def save_message(self, room_id, user_id, content):
-        """Save message to database."""
+    def save_message(self, room, content):
+        """Save message to database using the room and user resolved at connect."""
         try:
-            room = ChatRoom.objects.get(room_id=room_id)
-            user = User.objects.get(id=user_id)
-            
             message = Message.objects.create(
                 room=room,
-                sender=user,
+                sender=self.user,
                 content=content
             )
             
             # Update room's updated_at
             from django.utils import timezone
-            room.updated_at = timezone.now()
-            room.save(update_fields=['updated_at'])
+            ChatRoom.objects.filter(pk=room.pk).update(updated_at=timezone.now())
             
             return {
                 'id': message.id,
                 'timestamp': message.created_at.isoformat(),
             }
-        except ChatRoom.DoesNotExist:
-            print(f"[WebSocket] Error saving message: Room {room_id} not found")
-            return None
-        except User.DoesNotExist:
-            print(f"[WebSocket] Error saving message: User {user_id} not found")
-            return None
         except Exception as e:
             print(f"[WebSocket] Error saving message: {e}")
             import traceback
             traceback.print_exc()
             return None
+
+
+class NotificationEventsMixin:
+    """Channel-layer handlers for events sent to the user_<id> group."""
     
-    @database_sync_to_async
-    def mark_message_read(self, message_id, user_id):
-        """Mark message as read."""
-        try:
-            message = Message.objects.get(id=message_id)
-            # Only mark as read if user is not the sender
-            if message.sender.id != user_id:
-                message.read_status = True
-                message.save(update_fields=['read_status'])
-        except Message.DoesNotExist:
-            pass
+    async def chat_request(self, event):
+        """Send chat request notification."""
+        await self.send(text_data=json.dumps({
+            'type': 'chat.request',
+            'data': event['data']
+        }))
+    
+    async def admin_approved(self, event):
+        """Send admin approval notification."""
+        await self.send(text_data=json.dumps({
+            'type': 'chat.admin_approved',
+            'data': event['data']
+        }))
+    
+    async def user_accepted(self, event):
+        """Send user acceptance notification."""
+        await self.send(text_data=json.dumps({
+            'type': 'chat.user_accepted',
+            'data': event['data']
+        }))
+    
+    async def chat_rejected(self, event):
+        """Send chat rejection notification."""
+        await self.send(text_data=json.dumps({
+            'type': 'chat.rejected',
+            'data': event['data']
+        }))
+    
+    async def verification_started(self, event):
+        """Send admin verification started notification."""
+        await self.send(text_data=json.dumps({
+            'type': 'chat.verification_started',
+            'data': event['data']
+        }))
+    
+    async def chat_status_update(self, event):
+        """Send chat status update notification."""
+        await self.send(text_data=json.dumps({
+            'type': 'chat.status_update',
+            'data': event['data']
+        }))
 
 
-class UserNotificationConsumer(AsyncWebsocketConsumer):
+class UserNotificationConsumer(NotificationEventsMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for user notifications (chat requests, etc.)."""
     
     async def connect(self):
@@ -322,35 +379,6 @@ class UserNotificationConsumer(AsyncWebsocketConsumer):
         """Receive message from WebSocket."""
         pass
     
-    # Notification handlers
-    async def chat_request(self, event):
-        """Send chat request notification."""
-        await self.send(text_data=json.dumps({
-            'type': 'chat.request',
-            'data': event['data']
-        }))
-    
-    async def admin_approved(self, event):
-        """Send admin approval notification."""
-        await self.send(text_data=json.dumps({
-            'type': 'chat.admin_approved',
-            'data': event['data']
-        }))
-    
-    async def user_accepted(self, event):
-        """Send user acceptance notification."""
-        await self.send(text_data=json.dumps({
-            'type': 'chat.user_accepted',
-            'data': event['data']
-        }))
-    
-    async def chat_rejected(self, event):
-        """Send chat rejection notification."""
-        await self.send(text_data=json.dumps({
-            'type': 'chat.rejected',
-            'data': event['data']
-        }))
-    
     @database_sync_to_async
     def get_user_from_token(self):
         """Extract user from JWT token."""
@@ -375,3 +403,144 @@ class UserNotificationConsumer(AsyncWebsocketConsumer):
         except (TokenError, InvalidToken, User.DoesNotExist, Exception):
             return AnonymousUser()
 
+
+
+class MultiplexConsumer(NotificationEventsMixin, ChatConsumer):
+    """One WebSocket per user carrying every subscribed room plus notifications.
+    
+    The socket authenticates once and joins the user's notification group. Rooms are
+    added and removed with control frames:
+      {"type": "subscribe", "room_id": "..."}
+      {"type": "unsubscribe", "room_id": "..."}
+    Room frames ("message", "typing", "read") carry a room_id, and every room event
+    sent back to the client includes the room_id it belongs to.
+    """
+    
+    MAX_SUBSCRIPTIONS = 100
+    
+    async def connect(self):
+        try:
+            user = await self.get_user_from_token()
+            if not user or isinstance(user, AnonymousUser):
+                await self.close(code=4001)  # Unauthorized
+                return
+            
+            self.user = user
+            self.rooms = {}
+            self.notification_groups = [f'user_{user.id}']
+            if user.is_staff:
+                self.notification_groups.append('admin_notifications')
+            
+            for group_name in self.notification_groups:
+                await self.channel_layer.group_add(group_name, self.channel_name)
+            
+            await self.accept()
+            await self.send(text_data=json.dumps({
+                'type': 'connected',
+                'user_id': user.id,
+            }))
+        except Exception as e:
+            print(f"Error in multiplexed WebSocket connect: {e}")
+            import traceback
+            traceback.print_exc()
+            await self.close(code=4000)  # Internal error
+    
+    async def disconnect(self, close_code):
+        if not hasattr(self, 'user'):
+            return
+        
+        await get_read_receipt_writer().flush()
+        
+        for room_id in list(self.rooms):
+            await self.leave_room(room_id)
+        for group_name in self.notification_groups:
+            await self.channel_layer.group_discard(group_name, self.channel_name)
+    
+    async def receive(self, text_data):
+        """Receive a control or room frame from the WebSocket."""
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            await self.send_error('Invalid JSON')
+            return
+        
+        message_type = data.get('type')
+        room_id = str(data.get('room_id') or '')
+        
+        presence = get_presence_registry()
+        for subscribed_room_id in self.rooms:
+            presence.heartbeat(subscribed_room_id, self.user.id)
+        
+        if message_type == 'subscribe':
+            await self.handle_subscribe(room_id)
+        elif message_type == 'unsubscribe':
+            if room_id in self.rooms:
+                await self.leave_room(room_id)
+            await self.send(text_data=json.dumps({'type': 'unsubscribed', 'room_id': room_id}))
+        elif message_type in ('message', 'typing', 'read'):
+            room = self.rooms.get(room_id)
+            if room is None:
+                await self.send_error('Not subscribed to this room', room_id)
+                return
+            if message_type == 'message':
+                await self.handle_message(data, room)
+            elif message_type == 'typing':
+                await self.handle_typing(data, room)
+            else:
+                await self.handle_read(data, room)
+    
+    async def handle_subscribe(self, room_id):
+        if room_id in self.rooms:
+            await self.send(text_data=json.dumps({'type': 'subscribed', 'room_id': room_id}))
+            return
+        if len(self.rooms) >= self.MAX_SUBSCRIPTIONS:
+            await self.send_error('Too many subscribed rooms', room_id)
+            return
+        
+        room = await self.get_accessible_room(room_id, self.user)
+        if room is None:
+            await self.send_error('Room not found or access denied', room_id)
+            return
+        
+        self.rooms[room_id] = room
+        await self.channel_layer.group_add(f'chat_{room_id}', self.channel_name)
+        await self.send(text_data=json.dumps({'type': 'subscribed', 'room_id': room_id}))
+        await self.join_presence(room_id)
+    
+    async def leave_room(self, room_id):
+        self.rooms.pop(room_id, None)
+        await self.channel_layer.group_discard(f'chat_{room_id}', self.channel_name)
+        await self.leave_presence(room_id)
+    
+    async def send_error(self, message, room_id=None):
+        await self.send(text_data=json.dumps({
+            'type': 'error',
+            'room_id': room_id,
+            'message': message
+        }))
+    
+    # Room event handlers (same payloads as ChatConsumer, tagged with room_id)
+    async def chat_message(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'message',
+            'room_id': event.get('room_id'),
+            'data': event['message']
+        }))
+    
+    async def typing_indicator(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'typing',
+            'room_id': event.get('room_id'),
+            'user_id': event['user_id'],
+            'user_name': event['user_name'],
+            'typing': event['typing']
+        }))
+    
+    async def presence_update(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'presence',
+            'room_id': event.get('room_id'),
+            'user_id': event['user_id'],
+            'user_name': event['user_name'],
+            'status': event['status']
+        }))
@@ -0,0 +1,371 @@
+"""
+In-process load harness for the chat sockets and the SSE message stream.
+
+Opens many concurrent clients against the real ASGI application (routing,
+origin check, JWT auth, consumers, channel layer, Django HTTP stack) inside
+one event loop, sends chat messages at a fixed rate and measures:
+
+  - end-to-end delivery latency per transport (send -> frame/event received)
+  - memory held per open connection (tracemalloc, connect phase only)
+  - database queries per second while traffic runs, across all threads
+
+Transports:
+  ws         ChatConsumer, one socket per room (ws/chat/<room_id>/)
+  multiplex  MultiplexConsumer, one socket per user subscribed to its room
+  sse        stream_messages, which polls the database every SSE_POLL_SECONDS
+
+Every room gets two listeners (one per participant), taken from the
+transports in the order above. Messages are sent through a socket listener of
+the room, or through an extra "driver" socket when both listeners use SSE. A
+new transport only needs a client class with connect/send/listen/close added
+to CLIENT_CLASSES. Used by `manage.py chat_load_test`.
+"""
+import asyncio
+import json
+import threading
+import time
+import tracemalloc
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from asgiref.testing import ApplicationCommunicator
+from django.db.backends.signals import connection_created
+
+TEST_HOST = 'testserver'
+CONNECT_TIMEOUT = 10
+CONTENT_PREFIX = 'loadtest'
+
+
+class QueryCounter:
+    """Counts queries on every database connection, including ones opened in worker threads."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._attached = []
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def _attach(self, sender=None, connection=None, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+            self._attached.append(connection)
+
+    def install(self):
+        """Count on this thread's open connections and on every connection opened from now on."""
+        from django.db import connections
+
+        connection_created.connect(self._attach)
+        for connection in connections.all(initialized_only=True):
+            self._attach(connection=connection)
+
+    def uninstall(self):
+        connection_created.disconnect(self._attach)
+        for connection in self._attached:
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+        self._attached = []
+
+
+def _message_content(frame):
+    """Content of a chat message frame/event, or None for anything else."""
+    if frame.get('type') != 'message':
+        return None
+    return (frame.get('data') or {}).get('content')
+
+
+class WebSocketClient:
+    """ChatConsumer: one socket bound to one room."""
+
+    transport = 'ws'
+    can_send = True
+
+    def __init__(self, application, room_id, user_id, token):
+        self.room_id = room_id
+        self.user_id = user_id
+        self.communicator = WebsocketCommunicator(
+            application, self.path(token),
+            headers=[(b'host', TEST_HOST.encode()), (b'origin', f'http://{TEST_HOST}'.encode())],
+        )
+
+    def path(self, token):
+        return f'/ws/chat/{self.room_id}/?token={token}'
+
+    async def connect(self):
+        connected, code = await self.communicator.connect(timeout=CONNECT_TIMEOUT)
+        if not connected:
+            raise ConnectionError(f'{self.transport} connection to room {self.room_id} refused ({code})')
+
+    def frame(self, content):
+        return {'type': 'message', 'content': content}
+
+    async def send(self, content):
+        await self.communicator.send_to(text_data=json.dumps(self.frame(content)))
+
+    async def listen(self, on_message):
+        while True:
+            # No timeout: a receive_output timeout would cancel the consumer
+            message = await self.communicator.receive_output(timeout=None)
+            if message['type'] == 'websocket.close':
+                return
+            if message.get('text'):
+                content = _message_content(json.loads(message['text']))
+                if content:
+                    on_message(self, content)
+
+    async def close(self):
+        await self.communicator.disconnect()
+
+
+class MultiplexClient(WebSocketClient):
+    """MultiplexConsumer: one socket per user, subscribed to the client's room."""
+
+    transport = 'multiplex'
+
+    def path(self, token):
+        return f'/ws/chat/multiplex/?token={token}'
+
+    async def connect(self):
+        await super().connect()
+        await self.communicator.send_json_to({'type': 'subscribe', 'room_id': self.room_id})
+        while True:
+            frame = await self.communicator.receive_json_from(timeout=CONNECT_TIMEOUT)
+            if frame.get('type') == 'subscribed':
+                return
+            if frame.get('type') == 'error':
+                raise ConnectionError(f"multiplex subscribe to room {self.room_id} failed: {frame.get('message')}")
+
+    def frame(self, content):
+        return {'type': 'message', 'room_id': self.room_id, 'content': content}
+
+
+class SSEClient:
+    """stream_messages: a streaming GET that the server feeds by polling the database."""
+
+    transport = 'sse'
+    can_send = False
+
+    def __init__(self, application, room_id, user_id, token):
+        self.room_id = room_id
+        self.user_id = user_id
+        path = f'/api/chats/rooms/{room_id}/stream/'
+        self.communicator = ApplicationCommunicator(application, {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': f'token={token}'.encode(),
+            'headers': [(b'host', TEST_HOST.encode())],
+            'client': ('127.0.0.1', 50000),
+            'server': (TEST_HOST, 80),
+        })
+        self.buffer = b''
+
+    async def connect(self):
+        await self.communicator.send_input({'type': 'http.request', 'body': b'', 'more_body': False})
+        start = await self.communicator.receive_output(timeout=CONNECT_TIMEOUT)
+        if start['type'] != 'http.response.start' or start['status'] != 200:
+            raise ConnectionError(f"sse stream for room {self.room_id} returned {start.get('status')}")
+
+    async def listen(self, on_message):
+        while True:
+            message = await self.communicator.receive_output(timeout=None)
+            if message['type'] != 'http.response.body':
+                continue
+            self.buffer += message.get('body', b'')
+            *events, self.buffer = self.buffer.split(b'\n\n')
+            for event in events:
+                if event.startswith(b'data: '):
+                    content = _message_content(json.loads(event[len(b'data: '):]))
+                    if content:
+                        on_message(self, content)
+            if not message.get('more_body'):
+                return
+
+    async def close(self):
+        await self.communicator.send_input({'type': 'http.disconnect'})
+        try:
+            await self.communicator.wait(timeout=CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+
+
+CLIENT_CLASSES = {
+    'ws': WebSocketClient,
+    'multiplex': MultiplexClient,
+    'sse': SSEClient,
+}
+
+
+def _percentiles(samples):
+    if not samples:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+    ordered = sorted(samples)
+
+    def pick(pct):
+        return round(ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))], 1)
+
+    return {'p50_ms': pick(50), 'p95_ms': pick(95), 'p99_ms': pick(99), 'max_ms': round(ordered[-1], 1)}
+
+
+class ChatLoadHarness:
+    """Run one load scenario. `rooms` is a list of (room_id, user_a_id, user_b_id)
+    and `tokens` maps user ids to access tokens; see run() for the report."""
+
+    def __init__(self, application, rooms, tokens, clients, rate=10.0, duration=10.0,
+                 drain=5.0, connect_concurrency=50, log=print):
+        self.application = application
+        self.rooms = rooms
+        self.tokens = tokens
+        self.clients_wanted = clients  # {'ws': N, 'multiplex': N, 'sse': N}
+        self.rate = rate
+        self.duration = duration
+        self.drain = drain
+        self.connect_concurrency = connect_concurrency
+        self.log = log
+
+        self.listeners = []
+        self.drivers = []
+        self.failed = {}  # client -> error
+        self.sent_at = {}
+        self.senders = {}
+        self.expected = {}
+        self.latencies = {transport: [] for transport in CLIENT_CLASSES}
+        self.delivered = {transport: 0 for transport in CLIENT_CLASSES}
+
+    @staticmethod
+    def rooms_needed(clients):
+        return (sum(clients.values()) + 1) // 2
+
+    def _build_clients(self):
+        index = 0
+        for transport in CLIENT_CLASSES:
+            for _ in range(self.clients_wanted.get(transport, 0)):
+                room_id, user_a, user_b = self.rooms[index // 2]
+                user_id = user_a if index % 2 == 0 else user_b
+                self.listeners.append(
+                    CLIENT_CLASSES[transport](self.application, room_id, user_id, self.tokens[user_id])
+                )
+                index += 1
+
+        by_room = {}
+        for client in self.listeners:
+            by_room.setdefault(client.room_id, []).append(client)
+        for room_id, user_a, _ in self.rooms:
+            if room_id not in by_room:
+                continue
+            sender = next((client for client in by_room[room_id] if client.can_send), None)
+            if sender is None:
+                sender = WebSocketClient(self.application, room_id, user_a, self.tokens[user_a])
+                self.drivers.append(sender)
+            self.senders[room_id] = (sender, [client for client in by_room[room_id] if client is not sender])
+
+    async def _connect_all(self, clients):
+        semaphore = asyncio.Semaphore(self.connect_concurrency)
+        timings = []
+
+        async def connect(client):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await client.connect()
+                except Exception as e:
+                    self.failed[client] = str(e)
+                    return
+                timings.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(connect(client) for client in clients))
+        return timings
+
+    def _on_message(self, client, content):
+        sent = self.sent_at.get(content)
+        if sent is None or client is self.senders[client.room_id][0]:
+            return
+        self.latencies[client.transport].append((time.perf_counter() - sent) * 1000)
+        self.delivered[client.transport] += 1
+
+    async def _drive(self):
+        rooms = [room_id for room_id, (sender, _) in self.senders.items() if sender not in self.failed]
+        if not rooms or self.rate <= 0:
+            return 0
+        interval = 1 / self.rate
+        started = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - started < self.duration:
+            delay = started + sent * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            room_id = rooms[sent % len(rooms)]
+            sender, receivers = self.senders[room_id]
+            content = f'{CONTENT_PREFIX} {sent}'
+            for client in receivers:
+                if client not in self.failed:
+                    self.expected[client.transport] = self.expected.get(client.transport, 0) + 1
+            self.sent_at[content] = time.perf_counter()
+            await sender.send(content)
+            sent += 1
+        return sent
+
+    def _all_delivered(self):
+        return all(self.delivered[transport] >= count for transport, count in self.expected.items())
+
+    async def run(self):
+        self._build_clients()
+        clients = self.listeners + self.drivers
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        connect_timings = await self._connect_all(clients)
+        held = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        connected = len(clients) - len(self.failed)
+        self.log(f'{connected}/{len(clients)} connections open')
+
+        open_clients = [client for client in clients if client not in self.failed]
+        tasks = [asyncio.ensure_future(client.listen(self._on_message)) for client in open_clients]
+
+        counter = QueryCounter()
+        # On the ORM thread, so the connection it already holds is counted too
+        await sync_to_async(counter.install)()
+        started = time.perf_counter()
+        try:
+            sent = await self._drive()
+            traffic_seconds = time.perf_counter() - started
+            deadline = time.perf_counter() + self.drain
+            while not self._all_delivered() and time.perf_counter() < deadline:
+                await asyncio.sleep(0.05)
+            elapsed = time.perf_counter() - started
+        finally:
+            counter.uninstall()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*(client.close() for client in open_clients), return_exceptions=True)
+
+        delivery = {}
+        for transport, expected in self.expected.items():
+            delivery[transport] = {
+                'expected': expected,
+                'delivered': self.delivered[transport],
+                **_percentiles(self.latencies[transport]),
+            }
+        return {
+            'connections': {
+                **{transport: self.clients_wanted.get(transport, 0) for transport in CLIENT_CLASSES},
+                'drivers': len(self.drivers),
+                'failed': len(self.failed),
+            },
+            'connect_ms': _percentiles(connect_timings),
+            'memory_kb_per_connection': round(held / 1024 / connected, 1) if connected else None,
+            'messages_sent': sent,
+            'send_rate': round(sent / traffic_seconds, 1) if traffic_seconds else 0,
+            'delivery': delivery,
+            'queries': counter.count,
+            'queries_per_second': round(counter.count / elapsed, 1) if elapsed else 0,
+            'errors': sorted(set(self.failed.values()))[:5],
+        }
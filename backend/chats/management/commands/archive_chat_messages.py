@@ -0,0 +1,41 @@
+"""
+Move old chat history to the archive table and purge expired soft-deleted messages.
+Usage: python manage.py archive_chat_messages [--days 180] [--no-closed-rooms] [--dry-run]
+Run it periodically (e.g. a nightly cron job).
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from chats.archive import archivable_messages, archive_messages, purge_deleted_messages
+
+
+class Command(BaseCommand):
+    help = 'Archive old chat messages and purge soft-deleted messages past retention'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'CHAT_ARCHIVE_AFTER_DAYS', 180),
+            help='Archive messages older than this many days'
+        )
+        parser.add_argument(
+            '--no-closed-rooms', action='store_true',
+            help='Do not archive messages of closed (inactive) rooms regardless of age'
+        )
+        parser.add_argument(
+            '--retention-days', type=int, default=getattr(settings, 'CHAT_DELETED_RETENTION_DAYS', 30),
+            help='Purge soft-deleted messages deleted more than this many days ago'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Messages moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be done')
+
+    def handle(self, *args, **options):
+        queryset = archivable_messages(options['days'], not options['no_closed_rooms'])
+
+        if options['dry_run']:
+            self.stdout.write(f'Would archive {queryset.count()} messages')
+            return
+
+        purged = purge_deleted_messages(options['retention_days'])
+        self.stdout.write(f'Purged {purged} soft-deleted messages')
+
+        moved = archive_messages(queryset, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} messages'))
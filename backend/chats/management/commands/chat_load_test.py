@@ -0,0 +1,142 @@
+"""
+Load-test chat WebSockets and the SSE message stream in-process.
+Usage: python manage.py chat_load_test --seed-data --ws 200 --sse 50 --rate 20 --duration 30
+       python manage.py chat_load_test --seed-data --multiplex 200 --sse 200 --sse-poll-seconds 1
+
+Opens the requested number of ChatConsumer (--ws), MultiplexConsumer
+(--multiplex) and stream_messages (--sse) clients against backend.asgi,
+sends --rate messages per second for --duration seconds and reports delivery
+latency per transport, memory per connection and database queries per second.
+
+--seed-data runs against a throwaway test database with synthetic users and
+rooms; without it, existing two-person rooms are used (newest first). If
+CHANNEL_LAYERS is not configured, the in-memory channel layer is used for the
+run (same process, so it is a fair stand-in for one daphne worker).
+"""
+import contextlib
+import io
+import json
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from chats.loadtest import CLIENT_CLASSES, ChatLoadHarness
+
+
+class Command(BaseCommand):
+    help = 'Measure how many concurrent chat WebSocket/SSE clients one process can serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ws', type=int, default=100, help='ChatConsumer sockets (one room each)')
+        parser.add_argument('--multiplex', type=int, default=0, help='MultiplexConsumer sockets (one room each)')
+        parser.add_argument('--sse', type=int, default=0, help='stream_messages SSE clients')
+        parser.add_argument('--rate', type=float, default=10.0, help='Messages sent per second (all rooms together)')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds of message traffic')
+        parser.add_argument('--drain', type=float, help='Seconds to wait for late deliveries (default: 2 + two SSE polls)')
+        parser.add_argument('--sse-poll-seconds', type=float, help='Override SSE_POLL_SECONDS for this run')
+        parser.add_argument('--connect-concurrency', type=int, default=50, help='Connections opened at the same time')
+        parser.add_argument('--seed-data', action='store_true', help='Run against a fresh test database with synthetic rooms')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for --seed-data')
+        parser.add_argument('--output', help='Also write the report to this JSON file')
+        parser.add_argument('--verbose', action='store_true', help='Show the consumers\' own log output')
+
+    def handle(self, *args, **options):
+        clients = {transport: max(0, options[transport]) for transport in CLIENT_CLASSES}
+        if not sum(clients.values()):
+            raise CommandError('Nothing to do: pass --ws, --multiplex and/or --sse')
+
+        overrides = {}
+        if not getattr(settings, 'CHANNEL_LAYERS', None):
+            overrides['CHANNEL_LAYERS'] = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+        if options['sse_poll_seconds'] is not None:
+            overrides['SSE_POLL_SECONDS'] = options['sse_poll_seconds']
+        poll_seconds = overrides.get('SSE_POLL_SECONDS', getattr(settings, 'SSE_POLL_SECONDS', 3))
+        drain = options['drain'] if options['drain'] is not None else 2 + (2 * poll_seconds if clients['sse'] else 0)
+
+        from django.test.utils import setup_test_environment, teardown_test_environment
+        setup_test_environment()
+        runner = old_config = None
+        try:
+            with override_settings(**overrides):
+                if options['seed_data']:
+                    from django.test.runner import DiscoverRunner
+                    runner = DiscoverRunner(verbosity=0, interactive=False)
+                    old_config = runner.setup_databases()
+                    self.seed(ChatLoadHarness.rooms_needed(clients), options['seed'])
+                rooms, tokens = self.load_rooms(ChatLoadHarness.rooms_needed(clients))
+
+                from asgiref.sync import async_to_sync
+                from backend.asgi import application
+                harness = ChatLoadHarness(
+                    application, rooms, tokens, clients, rate=options['rate'], duration=options['duration'],
+                    drain=drain, connect_concurrency=max(1, options['connect_concurrency']), log=self.stdout.write,
+                )
+                self.stdout.write(
+                    f"Opening {sum(clients.values())} clients in {len(rooms)} rooms "
+                    f"({', '.join(f'{count} {name}' for name, count in clients.items() if count)})"
+                )
+                quiet = contextlib.nullcontext() if options['verbose'] else contextlib.redirect_stdout(io.StringIO())
+                with quiet:
+                    report = async_to_sync(harness.run)()
+        finally:
+            if runner:
+                runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        report['sse_poll_seconds'] = poll_seconds if clients['sse'] else None
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+                f.write('\n')
+
+    def seed(self, rooms, seed):
+        from api.synthetic import SyntheticDataGenerator
+        from users.models import User
+
+        self.stdout.write('Seeding test database...')
+        generator = SyntheticDataGenerator(seed=seed, log=lambda message: None)
+        user_ids = generator.users(max(10, rooms))
+        # The generator deactivates a few users; every seeded room should be usable
+        User.objects.filter(id__in=user_ids).update(is_active=True)
+        generator.chat_rooms(rooms, user_ids, messages_per_room=1)
+
+    def load_rooms(self, count):
+        """(room_id, user_a_id, user_b_id) for `count` two-person rooms, plus an access token per user."""
+        from rest_framework_simplejwt.tokens import AccessToken
+        from chats.models import ChatRoom
+        from users.models import User
+
+        rooms = list(
+            ChatRoom.objects.filter(user_a__isnull=False, user_b__isnull=False, user_a__is_active=True, user_b__is_active=True)
+            .order_by('-updated_at').values_list('room_id', 'user_a_id', 'user_b_id')[:count]
+        )
+        if len(rooms) < count:
+            raise CommandError(f'Need {count} two-person chat rooms, found {len(rooms)} (use --seed-data)')
+        user_ids = {user_id for _, user_a, user_b in rooms for user_id in (user_a, user_b)}
+        tokens = {user.id: str(AccessToken.for_user(user)) for user in User.objects.filter(id__in=user_ids)}
+        return rooms, tokens
+
+    def print_report(self, report):
+        connections = report['connections']
+        self.stdout.write(
+            f"Connections: {', '.join(f'{name}={count}' for name, count in connections.items())}"
+        )
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f'  {error}'))
+        connect = report['connect_ms']
+        self.stdout.write(f"Connect time: p50 {connect['p50_ms']}ms, p95 {connect['p95_ms']}ms")
+        self.stdout.write(f"Memory per connection: {report['memory_kb_per_connection']} KB")
+        self.stdout.write(f"Messages sent: {report['messages_sent']} ({report['send_rate']}/s)")
+        self.stdout.write(f"DB queries: {report['queries']} ({report['queries_per_second']}/s)")
+        self.stdout.write(f"{'transport':<12}{'delivered':>14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for transport, stats in report['delivery'].items():
+            delivered = f"{stats['delivered']}/{stats['expected']}"
+            self.stdout.write(
+                f"{transport:<12}{delivered:>14}{stats['p50_ms']!s:>9}{stats['p95_ms']!s:>9}"
+                f"{stats['p99_ms']!s:>9}{stats['max_ms']!s:>9}"
+            )
+        lost = sum(stats['expected'] - stats['delivered'] for stats in report['delivery'].values())
+        if lost or connections['failed']:
+            self.stdout.write(self.style.WARNING(f"{lost} deliveries missing, {connections['failed']} connections failed"))
+        else:
+            self.stdout.write(self.style.SUCCESS('All messages delivered'))
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_read_marks(apps, schema_editor):
+    """Derive each participant's read mark from the legacy per-message read_status flag.
+
+    read_status was set by the *other* side of the conversation, so a user's mark is the
+    highest read message in the room that someone else sent.
+    """
+    ChatRoom = apps.get_model('chats', 'ChatRoom')
+    Message = apps.get_model('chats', 'Message')
+    ChatRoomMember = apps.get_model('chats', 'ChatRoomMember')
+    from django.db.models import Max
+
+    # {room_id: {sender_id: max read message id}}
+    read_by_room = {}
+    rows = Message.objects.filter(read_status=True).values('room_id', 'sender_id').annotate(latest=Max('id'))
+    for row in rows.iterator():
+        read_by_room.setdefault(row['room_id'], {})[row['sender_id']] = row['latest']
+
+    Participants = ChatRoom.participants.through
+    members = []
+    for room_id, user_id in Participants.objects.values_list('chatroom_id', 'user_id').iterator():
+        senders = read_by_room.get(room_id, {})
+        mark = max((latest for sender_id, latest in senders.items() if sender_id != user_id), default=0)
+        members.append(ChatRoomMember(room_id=room_id, user_id=user_id, last_read_message_id=mark))
+        if len(members) >= 1000:
+            ChatRoomMember.objects.bulk_create(members, ignore_conflicts=True)
+            members = []
+    if members:
+        ChatRoomMember.objects.bulk_create(members, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatRoomMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['room', 'id'], name='chats_messa_room_id_4cae35_idx'),
+        ),
+        migrations.AddField(
+            model_name='chatroommember',
+            name='room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='chats.chatroom'),
+        ),
+        migrations.AddField(
+            model_name='chatroommember',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_memberships', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='chatroommember',
+            index=models.Index(fields=['user', 'room'], name='chats_chatr_user_id_963c3c_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='chatroommember',
+            unique_together={('room', 'user')},
+        ),
+        migrations.RunPython(backfill_read_marks, migrations.RunPython.noop),
+    ]
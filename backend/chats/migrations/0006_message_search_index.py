@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        # Must match SearchVector('content', config='english') in chats.search
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS chats_message_content_search "
+            "ON chats_message USING gin (to_tsvector('english'::regconfig, COALESCE(content, '')))"
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS chats_message_fts "
+            "USING fts5(content, room_id UNINDEXED, tokenize = 'porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO chats_message_fts (rowid, content, room_id) "
+            "SELECT id, COALESCE(content, ''), room_id FROM chats_message"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS chats_message_content_search")
+    elif vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS chats_message_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0005_archivedmessage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
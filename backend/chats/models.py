@@ -56,6 +56,57 @@ class ChatRoom(models.Model):
                     self.room_id = f"{user_ids[0]}_{user_ids[1]}"
         super().save(*args, **kwargs)
 
+    def unread_count_for(self, user):
+        """Count messages from other participants newer than the user's read mark (single query)."""
+        from django.db.models import Subquery
+        from django.db.models.functions import Coalesce
+
+        mark = ChatRoomMember.objects.filter(
+            room_id=self.pk, user_id=user.id
+        ).values('last_read_message_id')[:1]
+        return self.messages.filter(
+            id__gt=Coalesce(Subquery(mark), 0)
+        ).exclude(sender_id=user.id).count()
+
+    @staticmethod
+    def unread_count_annotation(user):
+        """Expression for queryset.annotate(): unread_count_for(user) as a correlated subquery."""
+        from django.db.models import Count, IntegerField, OuterRef, Subquery
+        from django.db.models.functions import Coalesce
+
+        mark = ChatRoomMember.objects.filter(
+            room_id=OuterRef(OuterRef('pk')), user_id=user.id
+        ).values('last_read_message_id')[:1]
+        unread = Message.objects.filter(
+            room_id=OuterRef('pk'), id__gt=Coalesce(Subquery(mark), 0)
+        ).exclude(sender_id=user.id).order_by().values('room_id').annotate(n=Count('id')).values('n')
+        return Coalesce(Subquery(unread, output_field=IntegerField()), 0)
+
+    @staticmethod
+    def latest_message_ids(room_pks):
+        """Return {room pk: id of its newest message}; rooms with no messages are left out.
+
+        The archive only holds a room's oldest messages, so it is consulted just for
+        rooms whose live table is empty.
+        """
+        from django.db.models import Max
+
+        latest = dict(
+            Message.objects.filter(room_id__in=room_pks).order_by()
+            .values('room_id').annotate(latest=Max('id')).values_list('room_id', 'latest')
+        )
+        missing = set(room_pks) - set(latest)
+        if missing:
+            latest.update(
+                ArchivedMessage.objects.filter(room_id__in=missing).order_by()
+                .values('room_id').annotate(latest=Max('id')).values_list('room_id', 'latest')
+            )
+        return latest
+
+    def read_marks(self):
+        """Return {user_id: last_read_message_id} for everyone who has read this room."""
+        return dict(self.memberships.values_list('user_id', 'last_read_message_id'))
+
 
 class Message(models.Model):
     """Message model for chat conversations."""
@@ -84,6 +135,7 @@ class Message(models.Model):
         ordering = ['created_at']
         indexes = [
             models.Index(fields=['room', 'created_at']),
+            models.Index(fields=['room', 'id']),  # Unread counts: room = X AND id > mark
         ]
 
     def __str__(self):
@@ -126,6 +178,94 @@ class Message(models.Model):
         self.save(update_fields=['is_deleted', 'deleted_at', 'cloudinary_url', 'cloudinary_public_id'])
 
 
+class ArchivedMessage(models.Model):
+    """Cold-storage copy of a chat message moved out of the live Message table.
+    
+    Keeps the original message id as primary key, so id cursors used by the
+    history API stay valid across the live table and the archive.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='archived_messages')
+    sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_messages'
+    )
+    content = models.TextField(blank=True)
+    message_type = models.CharField(max_length=10, choices=Message.MESSAGE_TYPE_CHOICES, default='text')
+    image = models.ImageField(upload_to='chat_images/', null=True, blank=True)
+    cloudinary_url = models.URLField(blank=True, null=True)
+    cloudinary_public_id = models.CharField(max_length=255, blank=True, null=True)
+    is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    read_status = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['room', 'id']),
+        ]
+
+    def __str__(self):
+        return f"Archived message {self.id} in {self.room_id}"
+
+
+class ChatRoomMember(models.Model):
+    """Per-participant read state for a chat room.
+
+    Instead of flipping read_status on every message, each participant keeps a
+    high-water mark: every message with id <= last_read_message_id has been read
+    by that user. A missing row means nothing has been read yet (mark 0).
+    """
+    room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='chat_memberships'
+    )
+    last_read_message_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['room', 'user']
+        indexes = [
+            models.Index(fields=['user', 'room']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} read {self.room_id} up to {self.last_read_message_id}"
+
+    @classmethod
+    def mark_read(cls, room, user, message_id=None):
+        """Advance the user's read mark to message_id (or the latest message in the room).
+
+        The mark only ever moves forward, so late or out-of-order receipts are no-ops.
+        message_id is clamped to the newest message in the room, so a client cannot
+        mark messages that don't exist yet as read. Returns the mark that was requested.
+        """
+        try:
+            message_id = int(message_id) if message_id is not None else None
+        except (TypeError, ValueError):
+            message_id = None
+        latest = ChatRoom.latest_message_ids([room.pk]).get(room.pk, 0)
+        message_id = latest if message_id is None else max(0, min(message_id, latest))
+
+        updated = cls.objects.filter(
+            room_id=room.pk,
+            user_id=user.id,
+            last_read_message_id__lt=message_id
+        ).update(last_read_message_id=message_id, updated_at=timezone.now())
+        if not updated:
+            cls.objects.get_or_create(
+                room_id=room.pk,
+                user_id=user.id,
+                defaults={'last_read_message_id': message_id}
+            )
+        return message_id
+
+
 class ChatRequest(models.Model):
     """Model for chat requests between users with approval workflow."""
     STATUS_CHOICES = [
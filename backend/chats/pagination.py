@@ -0,0 +1,118 @@
+"""
+Cursor paging for chat message history.
+
+Clients page with message ids instead of offsets:
+  ?limit=N              newest N messages
+  ?before=<id>&limit=N  N messages older than <id> (scrolling back)
+  ?after=<id>&limit=N   N messages newer than <id> (catching up)
+  ?all=true             full history in one response (export only)
+
+Pages are always returned oldest-first so they can be appended/prepended as-is.
+
+Archived messages (see chats.archive) keep their ids, so when an archive
+queryset is passed each page is the live and archived rows merged by id.
+"""
+
+DEFAULT_MESSAGE_PAGE_SIZE = 50
+MAX_MESSAGE_PAGE_SIZE = 200
+
+
+def _parse_int(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def wants_full_history(query_params):
+    """True when the caller explicitly asked for the whole room (export)."""
+    return str(query_params.get('all', '')).lower() in ('1', 'true', 'yes')
+
+
+def full_history(queryset, archive_queryset=None):
+    """Every message of the room (live and archived), oldest-first by id."""
+    messages = list(queryset.order_by('id'))
+    if archive_queryset is not None:
+        messages = sorted(messages + list(archive_queryset.order_by('id')), key=lambda message: message.id)
+    return messages
+
+
+def _window(querysets, order, limit):
+    """The first `limit` rows of several querysets merged by id (`order` is 'id' or '-id')."""
+    rows = []
+    for queryset in querysets:
+        rows += list(queryset.order_by(order)[:limit])
+    rows.sort(key=lambda message: message.id, reverse=order.startswith('-'))
+    return rows[:limit]
+
+
+def paginate_messages(queryset, query_params, archive_queryset=None):
+    """Return (messages, page_info) for a Message queryset already filtered to one room.
+
+    Uses the (room, id) index, so every page is a bounded index range scan
+    regardless of how long the conversation is. `archive_queryset` is the same
+    room's ArchivedMessage rows. Archived and live ids can interleave (e.g. old
+    soft-deleted messages stay live), so both sources are read for the same id
+    range and merged.
+    """
+    limit = _parse_int(query_params.get('limit')) or DEFAULT_MESSAGE_PAGE_SIZE
+    limit = max(1, min(limit, MAX_MESSAGE_PAGE_SIZE))
+    before = _parse_int(query_params.get('before'))
+    after = _parse_int(query_params.get('after'))
+
+    querysets = [queryset] if archive_queryset is None else [queryset, archive_queryset]
+    if after is not None:
+        page = _window([qs.filter(id__gt=after) for qs in querysets], 'id', limit + 1)
+        has_more = len(page) > limit
+        page = page[:limit]
+    else:
+        if before is not None:
+            querysets = [qs.filter(id__lt=before) for qs in querysets]
+        page = _window(querysets, '-id', limit + 1)
+        has_more = len(page) > limit
+        page = page[:limit]
+        page.reverse()
+
+    page_info = {
+        'limit': limit,
+        'direction': 'after' if after is not None else 'before',
+        'has_more': has_more,
+        # Pass as ?before= to load older messages, or ?after= to poll for newer ones
+        'next_before': page[0].id if page else before,
+        'next_after': page[-1].id if page else after,
+    }
+    return page, page_info
+
+
+DEFAULT_LIST_PAGE_SIZE = 50
+MAX_LIST_PAGE_SIZE = 200
+
+
+def paginate_newest_first(queryset, query_params):
+    """Return (items, page_info) for a newest-first list paged with ?before=<id>&limit=N.
+
+    Used for chat request queues: ordering by -id keeps every page an index range
+    scan and stays stable while new requests arrive at the head of the list.
+    Paging is opt-in: without ?limit and ?before the whole list comes back (the
+    admin queue shows every pending request).
+    """
+    if query_params.get('limit') is None and query_params.get('before') is None:
+        items = list(queryset.order_by('-id'))
+        return items, {'limit': None, 'has_more': False, 'next_before': None}
+
+    limit = _parse_int(query_params.get('limit')) or DEFAULT_LIST_PAGE_SIZE
+    limit = max(1, min(limit, MAX_LIST_PAGE_SIZE))
+    before = _parse_int(query_params.get('before'))
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+
+    items = list(queryset.order_by('-id')[:limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+    page_info = {
+        'limit': limit,
+        'has_more': has_more,
+        # Pass as ?before= to load the next (older) page
+        'next_before': items[-1].id if has_more else None,
+    }
+    return items, page_info
@@ -0,0 +1,187 @@
+"""
+Typing-indicator and presence coalescing for the chat WebSocket consumers.
+
+Clients send a typing frame on every keystroke and reconnect freely on flaky
+networks. Relaying each of those to the room group multiplies channel-layer
+traffic by the number of listeners, so both are filtered here first:
+
+- Typing: at most one "typing" broadcast per (room, user) per interval, an
+  explicit "stopped" only if "typing" was actually announced, and an automatic
+  "stopped" when no typing frame arrives for the timeout.
+- Presence: connections are counted per (room, user). "online" is announced
+  once, "offline" only after the last connection has been gone for a grace
+  period, so a quick reconnect announces nothing. Entries not seen (frame or
+  heartbeat) within the TTL are treated as stale and announced again.
+
+State is per process, which is enough to absorb bursts from a single socket.
+Suppressed events are counted in `metrics`.
+"""
+import asyncio
+import time
+from collections import Counter
+from django.conf import settings
+
+
+metrics = Counter()
+
+
+def get_metrics():
+    """Snapshot of sent/suppressed typing and presence events in this process."""
+    return dict(metrics)
+
+
+class TypingThrottle:
+    """Rate-limits typing broadcasts per (room, user)."""
+
+    def __init__(self, interval, timeout):
+        self.interval = interval
+        self.timeout = timeout
+        self._sent_at = {}
+        self._stop_tasks = {}
+
+    def typing(self, room_id, user_id, is_typing, broadcast):
+        """Record a typing frame; return True if it should be broadcast now.
+
+        `broadcast(is_typing)` is a coroutine function used for the automatic stop.
+        """
+        key = (room_id, user_id)
+        if not is_typing:
+            if self.stop(room_id, user_id):
+                return True
+            metrics['typing_suppressed'] += 1
+            return False
+
+        self._schedule_stop(key, broadcast)
+        now = time.monotonic()
+        sent_at = self._sent_at.get(key)
+        if sent_at is not None and now - sent_at < self.interval:
+            metrics['typing_suppressed'] += 1
+            return False
+        self._sent_at[key] = now
+        metrics['typing_sent'] += 1
+        return True
+
+    def stop(self, room_id, user_id):
+        """Forget the user's typing state; return True if a stop should be broadcast."""
+        key = (room_id, user_id)
+        task = self._stop_tasks.pop(key, None)
+        if task is not None:
+            task.cancel()
+        if self._sent_at.pop(key, None) is None:
+            return False
+        metrics['typing_sent'] += 1
+        return True
+
+    def _schedule_stop(self, key, broadcast):
+        task = self._stop_tasks.get(key)
+        if task is not None:
+            task.cancel()
+        self._stop_tasks[key] = asyncio.get_running_loop().create_task(self._auto_stop(key, broadcast))
+
+    async def _auto_stop(self, key, broadcast):
+        await asyncio.sleep(self.timeout)
+        self._stop_tasks.pop(key, None)
+        if self._sent_at.pop(key, None) is not None:
+            metrics['typing_auto_stopped'] += 1
+            try:
+                await broadcast(False)
+            except Exception as e:
+                print(f"[WebSocket] Error sending typing stop: {e}")
+
+
+class PresenceRegistry:
+    """Tracks live connections per (room, user) and decides when presence changes are real."""
+
+    def __init__(self, grace, ttl):
+        self.grace = grace
+        self.ttl = ttl
+        self._entries = {}
+
+    def connected(self, room_id, user_id):
+        """Register a connection; return True if "online" should be broadcast."""
+        key = (room_id, user_id)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry['last_seen'] > self.ttl:
+            # Never heard from again (e.g. the worker lost the disconnect); start over
+            self._cancel_offline(entry)
+            entry = None
+
+        if entry is None:
+            self._entries[key] = {'connections': 1, 'last_seen': now, 'offline_task': None}
+            metrics['presence_sent'] += 1
+            return True
+
+        entry['connections'] += 1
+        entry['last_seen'] = now
+        if self._cancel_offline(entry):
+            # Reconnected within the grace period: neither offline nor online goes out
+            metrics['presence_suppressed'] += 2
+        else:
+            metrics['presence_suppressed'] += 1
+        return False
+
+    def heartbeat(self, room_id, user_id):
+        entry = self._entries.get((room_id, user_id))
+        if entry is not None:
+            entry['last_seen'] = time.monotonic()
+
+    def disconnected(self, room_id, user_id, broadcast):
+        """Drop a connection; "offline" is broadcast via `broadcast()` after the grace period."""
+        entry = self._entries.get((room_id, user_id))
+        if entry is None:
+            return
+        entry['connections'] = max(entry['connections'] - 1, 0)
+        if entry['connections']:
+            metrics['presence_suppressed'] += 1
+            return
+        self._cancel_offline(entry)
+        entry['offline_task'] = asyncio.get_running_loop().create_task(
+            self._announce_offline((room_id, user_id), entry, broadcast)
+        )
+
+    def _cancel_offline(self, entry):
+        task = entry.get('offline_task')
+        entry['offline_task'] = None
+        if task is not None and not task.done():
+            task.cancel()
+            return True
+        return False
+
+    async def _announce_offline(self, key, entry, broadcast):
+        await asyncio.sleep(self.grace)
+        if self._entries.get(key) is not entry or entry['connections']:
+            return
+        del self._entries[key]
+        metrics['presence_sent'] += 1
+        try:
+            await broadcast()
+        except Exception as e:
+            print(f"[WebSocket] Error sending presence update: {e}")
+
+
+_registries = {}
+
+
+def _registry(name, factory):
+    """One instance per event loop, shared by every consumer in the process."""
+    loop = asyncio.get_running_loop()
+    registry_loop, registry = _registries.get(name, (None, None))
+    if registry_loop is not loop:
+        registry = factory()
+        _registries[name] = (loop, registry)
+    return registry
+
+
+def get_typing_throttle():
+    return _registry('typing', lambda: TypingThrottle(
+        getattr(settings, 'CHAT_TYPING_INTERVAL_MS', 3000) / 1000,
+        getattr(settings, 'CHAT_TYPING_TIMEOUT_MS', 6000) / 1000,
+    ))
+
+
+def get_presence_registry():
+    return _registry('presence', lambda: PresenceRegistry(
+        getattr(settings, 'CHAT_PRESENCE_GRACE_MS', 5000) / 1000,
+        getattr(settings, 'CHAT_PRESENCE_TTL_SECONDS', 90),
+    ))
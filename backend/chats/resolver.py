@@ -0,0 +1,82 @@
+"""
+Shared lookup and access check for chat rooms addressed by numeric id or room_id.
+
+URLs accept either the primary key ("12") or the room_id string ("3_6"). Only
+the room_key -> primary key mapping is cached; the room row and the user's
+membership (an EXISTS subquery) are always read from the database in one
+query by primary key. The default cache is per process, so caching the access
+check itself would let other workers keep serving a removed participant. A
+stale mapping is harmless: the fetched room is checked against the key and a
+mismatch falls back to the full lookup. chats.signals drops mappings when a
+room is saved or deleted.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+from .models import ChatRoom
+
+
+def _timeout():
+    return getattr(settings, 'CHAT_ROOM_CACHE_SECONDS', 30)
+
+
+def room_cache_key(room_key):
+    return f'chat_room_pk:{room_key}'
+
+
+def _with_membership(queryset, user):
+    membership = ChatRoom.participants.through.objects.filter(
+        chatroom_id=OuterRef('pk'), user_id=user.id
+    )
+    return queryset.annotate(is_participant=Exists(membership))
+
+
+def _matches(room, room_key):
+    return str(room.pk) == room_key or room.room_id == room_key
+
+
+def resolve_room(room_key, user):
+    """Return (room, is_participant) for a numeric id or room_id string.
+
+    Numeric keys match the primary key first, then room_id. If several legacy
+    rooms share a room_id, the one the user participates in wins. Raises
+    ChatRoom.DoesNotExist when nothing matches.
+    """
+    room_key = str(room_key)
+    room_pk = cache.get(room_cache_key(room_key))
+    if room_pk is not None:
+        room = _with_membership(ChatRoom.objects.filter(pk=room_pk), user).first()
+        if room is not None and _matches(room, room_key):
+            member = room.is_participant
+            del room.is_participant
+            return room, member
+        cache.delete(room_cache_key(room_key))
+
+    # One query: candidate rooms with the user's membership as an EXISTS column
+    lookup = Q(room_id=room_key)
+    if room_key.isdigit():
+        lookup |= Q(id=int(room_key))
+    candidates = list(_with_membership(ChatRoom.objects.filter(lookup), user)[:10])
+    if not candidates:
+        raise ChatRoom.DoesNotExist(f'Chat room {room_key} not found')
+
+    by_id = [r for r in candidates if room_key.isdigit() and r.id == int(room_key)]
+    by_room_id = [r for r in candidates if r.room_id == room_key]
+    if by_id:
+        room = by_id[0]
+    elif len(by_room_id) > 1:
+        # Duplicate room_ids: the answer depends on the user, so don't cache it
+        print(f"Warning: Multiple rooms found for room_id {room_key}")
+        room = next((r for r in by_room_id if r.is_participant), by_room_id[0])
+        return room, room.is_participant
+    else:
+        room = by_room_id[0]
+
+    member = room.is_participant
+    del room.is_participant
+    cache.set(room_cache_key(room_key), room.pk, _timeout())
+    return room, member
+
+
+def invalidate_room(room):
+    cache.delete_many([room_cache_key(room.pk), room_cache_key(room.room_id)])
@@ -2,6 +2,8 @@ from django.urls import re_path
 from . import consumers
 
 websocket_urlpatterns = [
+    # One socket per user for all rooms + notifications (must come before the room pattern)
+    re_path(r'ws/chat/multiplex/$', consumers.MultiplexConsumer.as_asgi()),
     re_path(r'ws/chat/(?P<room_id>\w+)/$', consumers.ChatConsumer.as_asgi()),
     re_path(r'ws/chat/user/(?P<user_id>\d+)/$', consumers.UserNotificationConsumer.as_asgi()),
 ]
@@ -0,0 +1,168 @@
+"""
+Full-text search over chat message content.
+
+- PostgreSQL: a GIN index on to_tsvector('english', content) (migration 0006),
+  queried with websearch_to_tsquery and ts_headline for snippets.
+- SQLite: an FTS5 shadow table chats_message_fts (rowid = message id) kept in
+  sync by the Message signals in chats.signals.
+- Anything else falls back to an icontains scan.
+
+Results are newest-first and cursor-paged with ?before=<message id>. Snippets
+are HTML-escaped with matches wrapped in <mark>...</mark>.
+"""
+import html
+from django.db import DatabaseError, connection, transaction
+from .models import Message
+
+FTS_TABLE = 'chats_message_fts'
+SEARCH_CONFIG = 'english'
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
+
+# Private-use markers survive escaping and are swapped for <mark> afterwards
+_MARK_START = '\ue000'
+_MARK_END = '\ue001'
+
+
+def _highlight(snippet):
+    snippet = html.escape(snippet or '')
+    return snippet.replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+
+
+def _fts5_query(query):
+    """Quote every term so user input can't inject FTS5 syntax; terms are ANDed."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+
+def index_message(message):
+    """Add or refresh a message in the SQLite FTS table (no-op on other databases)."""
+    if connection.vendor != 'sqlite':
+        return
+    # Never let indexing break message delivery (e.g. migration 0006 not applied yet)
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [message.id])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, content, room_id) VALUES (%s, %s, %s)',
+                [message.id, message.content or '', message.room_id]
+            )
+    except DatabaseError as e:
+        print(f"[Chat] Could not index message {message.id} for search: {e}")
+
+
+def index_messages_after(after_id):
+    """Add every message with id > after_id to the SQLite FTS table in one statement.
+
+    For bulk loads (bulk_create sends no signals); same statement as migration 0006.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, content, room_id) "
+            "SELECT id, COALESCE(content, ''), room_id FROM chats_message WHERE id > %s",
+            [after_id]
+        )
+
+
+def unindex_message(message_id):
+    if connection.vendor != 'sqlite':
+        return
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [message_id])
+    except DatabaseError as e:
+        print(f"[Chat] Could not remove message {message_id} from search index: {e}")
+
+
+def search_messages(query, room=None, before=None, limit=DEFAULT_SEARCH_PAGE_SIZE):
+    """Return (messages, page_info). Each message gets a `snippet` attribute.
+
+    `room` scopes the search to one room (participants); None searches every
+    room (staff moderation).
+    """
+    limit = max(1, min(limit or DEFAULT_SEARCH_PAGE_SIZE, MAX_SEARCH_PAGE_SIZE))
+    query = (query or '').strip()
+    if not query:
+        return [], {'limit': limit, 'has_more': False, 'next_before': None}
+
+    if connection.vendor == 'postgresql':
+        messages = _search_postgres(query, room, before, limit + 1)
+    elif connection.vendor == 'sqlite':
+        messages = _search_sqlite(query, room, before, limit + 1)
+    else:
+        messages = _search_fallback(query, room, before, limit + 1)
+
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    page_info = {
+        'limit': limit,
+        'has_more': has_more,
+        'next_before': messages[-1].id if messages else None,
+    }
+    return messages, page_info
+
+
+def _base_queryset(room, before):
+    queryset = Message.objects.select_related('sender', 'room')
+    if room is not None:
+        queryset = queryset.filter(room=room)
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    return queryset
+
+
+def _search_postgres(query, room, before, limit):
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchVector
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    messages = list(
+        _base_queryset(room, before)
+        # Same expression as the GIN index, so the planner can use it
+        .annotate(search=SearchVector('content', config=SEARCH_CONFIG))
+        .filter(search=search_query)
+        .annotate(headline=SearchHeadline(
+            'content', search_query, config=SEARCH_CONFIG,
+            start_sel=_MARK_START, stop_sel=_MARK_END, max_words=20, min_words=5,
+        ))
+        .order_by('-id')[:limit]
+    )
+    for message in messages:
+        message.snippet = _highlight(message.headline)
+    return messages
+
+
+def _search_sqlite(query, room, before, limit):
+    match = _fts5_query(query)
+    if not match:
+        return []
+    sql = (
+        f"SELECT rowid, snippet({FTS_TABLE}, 0, %s, %s, '…', 16) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [_MARK_START, _MARK_END, match]
+    if room is not None:
+        sql += ' AND room_id = %s'
+        params.append(room.pk)
+    if before is not None:
+        sql += ' AND rowid < %s'
+        params.append(before)
+    sql += ' ORDER BY rowid DESC LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        snippets = dict(cursor.fetchall())
+
+    messages = list(_base_queryset(room, before).filter(id__in=snippets).order_by('-id'))
+    for message in messages:
+        message.snippet = _highlight(snippets[message.id])
+    return messages
+
+
+def _search_fallback(query, room, before, limit):
+    messages = list(_base_queryset(room, before).filter(content__icontains=query).order_by('-id')[:limit])
+    for message in messages:
+        message.snippet = html.escape(message.content or '')
+    return messages
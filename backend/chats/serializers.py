@@ -14,6 +14,7 @@ class MessageSerializer(serializers.ModelSerializer):
     message_type = serializers.SerializerMethodField()
     image = serializers.SerializerMethodField()
     is_deleted = serializers.SerializerMethodField()
+    read_status = serializers.SerializerMethodField()
 
     class Meta:
         model = Message
@@ -39,6 +40,19 @@ class MessageSerializer(serializers.ModelSerializer):
             pass
         return None
     
+    def get_read_status(self, obj):
+        """Read if any participant other than the sender has a read mark at or past this message.
+
+        Views pass the room's marks once as context['read_marks'] ({user_id: last_read_message_id});
+        without them we fall back to the legacy per-message flag.
+        """
+        read_marks = self.context.get('read_marks')
+        if read_marks is None:
+            return getattr(obj, 'read_status', False)
+        return any(
+            mark >= obj.id for user_id, mark in read_marks.items() if user_id != obj.sender_id
+        )
+    
     def get_is_deleted(self, obj):
         """Get is_deleted field safely."""
         try:
@@ -127,6 +141,15 @@ class MessageSerializer(serializers.ModelSerializer):
         return None
 
 
+class MessageSearchResultSerializer(MessageSerializer):
+    """Message search hit with its highlighted snippet (see chats.search)."""
+    snippet = serializers.CharField(read_only=True)
+    room_id = serializers.CharField(source='room.room_id', read_only=True)
+
+    class Meta(MessageSerializer.Meta):
+        fields = MessageSerializer.Meta.fields + ['room_id', 'snippet']
+
+
 class ChatRoomSerializer(serializers.ModelSerializer):
     """Serializer for ChatRoom model."""
     participants = UserSerializer(many=True, read_only=True)
@@ -151,7 +174,11 @@ class ChatRoomSerializer(serializers.ModelSerializer):
 
     def get_last_message(self, obj):
         try:
-            last_msg = obj.messages.last()
+            # Prefetched as a one-row slice by ChatRequestSerializer.setup_eager_loading
+            if hasattr(obj, 'latest_messages'):
+                last_msg = obj.latest_messages[0] if obj.latest_messages else None
+            else:
+                last_msg = obj.messages.last()
             if last_msg:
                 return MessageSerializer(last_msg, context=self.context).data
         except Exception:
@@ -159,9 +186,11 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         return None
 
     def get_unread_count(self, obj):
+        if hasattr(obj, 'annotated_unread_count'):
+            return obj.annotated_unread_count
         request = self.context.get('request')
-        if request and request.user:
-            return obj.messages.filter(read_status=False).exclude(sender=request.user).count()
+        if request and request.user and request.user.is_authenticated:
+            return obj.unread_count_for(request.user)
         return 0
 
     def create(self, validated_data):
@@ -271,6 +300,16 @@ class ChatRoomListSerializer(serializers.ModelSerializer):
         return None
 
     def get_last_message(self, obj):
+        # Admin overview annotates the last message (see adminpanel.views.all_chats)
+        if hasattr(obj, 'last_message_at'):
+            if obj.last_message_at is None:
+                return None
+            content = obj.last_message_content or ''
+            return {
+                'content': content[:50] + '...' if len(content) > 50 else content,
+                'created_at': obj.last_message_at.isoformat(),
+                'sender': obj.last_message_sender
+            }
         try:
             if hasattr(obj, 'messages'):
                 # Use values() to avoid loading full Message objects and accessing fields that might not exist
@@ -298,11 +337,12 @@ class ChatRoomListSerializer(serializers.ModelSerializer):
         return None
 
     def get_unread_count(self, obj):
+        if hasattr(obj, 'annotated_unread_count'):
+            return obj.annotated_unread_count
         try:
             request = self.context.get('request')
-            if request and request.user:
-                # Use values() to avoid loading full Message objects
-                return obj.messages.filter(read_status=False).exclude(sender_id=request.user.id).count()
+            if request and request.user and request.user.is_authenticated:
+                return obj.unread_count_for(request.user)
         except Exception:
             pass
         return 0
@@ -400,6 +440,35 @@ class ChatRequestSerializer(serializers.ModelSerializer):
     admin_verification_room = serializers.SerializerMethodField()
     final_chat_room = serializers.SerializerMethodField()
     
+    @staticmethod
+    def setup_eager_loading(queryset, user):
+        """Load everything the serializer touches in a fixed number of queries.
+
+        Both rooms come with their users, participants, last message and the
+        viewer's unread count, and the pet with its category, poster and images,
+        so serializing a page never queries per row.
+        """
+        from django.db.models import Prefetch
+
+        rooms = ChatRoom.objects.select_related('user_a', 'user_b').annotate(
+            annotated_unread_count=ChatRoom.unread_count_annotation(user)
+        ).prefetch_related(
+            'participants',
+            Prefetch(
+                'messages',
+                queryset=Message.objects.select_related('sender').order_by('-created_at', '-id')[:1],
+                to_attr='latest_messages'
+            ),
+        )
+        return queryset.select_related(
+            'requester', 'target', 'verified_by_admin', 'chat_room',
+            'pet', 'pet__category', 'pet__posted_by',
+        ).prefetch_related(
+            'pet__images',
+            Prefetch('admin_verification_room', queryset=rooms),
+            Prefetch('final_chat_room', queryset=rooms),
+        )
+    
     def get_admin_verification_room(self, obj):
         """Get admin_verification_room safely."""
         try:
@@ -475,43 +544,18 @@ class ChatRequestSerializer(serializers.ModelSerializer):
         """Get room_id if chat is active."""
         try:
             if obj.status == 'active':
-                # Try to get chat_room relationship (OneToOne)
+                # Reverse one-to-one; select_related by setup_eager_loading
                 try:
-                    if hasattr(obj, 'chat_room'):
-                        chat_room = getattr(obj, 'chat_room', None)
-                        if chat_room:
-                            room_id = getattr(chat_room, 'room_id', None)
-                            if room_id:
-                                return str(room_id)
-                                return str(room_id)
-                except Exception:
-                    pass
-                
-                # If chat_room not loaded, try to get it from database
-                try:
-                    from .models import ChatRoom
-                    room = ChatRoom.objects.filter(chat_request=obj).first()
-                    if room:
-                        room_id = getattr(room, 'room_id', None)
-                        if room_id:
-                            return str(room_id)
-                        if room_id:
-                            return str(room_id)
-                except Exception:
+                    room_id = obj.chat_room.room_id
+                    if room_id:
+                        return str(room_id)
+                except ChatRoom.DoesNotExist:
                     pass
                 
                 # Generate room_id from requester and target (fallback)
-                try:
-                    if hasattr(obj, 'requester') and hasattr(obj, 'target'):
-                        requester = getattr(obj, 'requester', None)
-                        target = getattr(obj, 'target', None)
-                        if requester and target and hasattr(requester, 'id') and hasattr(target, 'id'):
-                            user_ids = sorted([requester.id, target.id])
-                            return f"{user_ids[0]}_{user_ids[1]}"
-                            user_ids = sorted([requester.id, target.id])
-                            return f"{user_ids[0]}_{user_ids[1]}"
-                except Exception:
-                    pass
+                if obj.requester_id and obj.target_id:
+                    user_ids = sorted([obj.requester_id, obj.target_id])
+                    return f"{user_ids[0]}_{user_ids[1]}"
         except Exception:
             pass
         return None
@@ -0,0 +1,35 @@
+"""
+Keep the room resolver cache in sync with ChatRoom changes, the message
+search index in sync with Message, and drop cached chat stats when requests
+or rooms change.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import ChatRequest, ChatRoom, Message
+from .resolver import invalidate_room
+from .search import index_message, unindex_message
+from .stats import invalidate_chat_stats
+
+
+@receiver(post_save, sender=ChatRoom)
+@receiver(post_delete, sender=ChatRoom)
+def invalidate_room_cache(sender, instance, **kwargs):
+    invalidate_room(instance)
+    invalidate_chat_stats()
+
+
+@receiver(post_save, sender=ChatRequest)
+@receiver(post_delete, sender=ChatRequest)
+def invalidate_request_stats(sender, instance, **kwargs):
+    invalidate_chat_stats()
+
+
+@receiver(post_save, sender=Message)
+def update_search_index(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or 'content' in update_fields:
+        index_message(instance)
+
+
+@receiver(post_delete, sender=Message)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_message(instance.id)
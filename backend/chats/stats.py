@@ -0,0 +1,73 @@
+"""
+Chat statistics for the admin dashboard.
+
+Each table is read with one conditional aggregate (per-status and time-window
+counts in the same statement) and the result is cached briefly. chats.signals
+drops the cached value whenever a ChatRequest or ChatRoom is saved or deleted;
+bulk queryset updates skip signals, so the timeout bounds staleness there.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import ChatRequest, ChatRoom
+
+CHAT_STATS_CACHE_KEY = 'admin_chat_stats'
+
+
+def _timeout():
+    return getattr(settings, 'CHAT_STATS_CACHE_SECONDS', 30)
+
+
+def compute_chat_stats():
+    """Two queries: one aggregate over ChatRequest, one over ChatRoom."""
+    now = timezone.now()
+    windows = {'24h': now - timedelta(hours=24), '7d': now - timedelta(days=7)}
+
+    request_counts = {'total': Count('id')}
+    for value, _ in ChatRequest.STATUS_CHOICES:
+        request_counts[f'status_{value}'] = Count('id', filter=Q(status=value))
+    for label, since in windows.items():
+        request_counts[f'created_{label}'] = Count('id', filter=Q(created_at__gte=since))
+    request_agg = ChatRequest.objects.aggregate(**request_counts)
+
+    room_counts = {
+        'total': Count('id'),
+        'active': Count('id', filter=Q(is_active=True)),
+    }
+    for label, since in windows.items():
+        room_counts[f'created_{label}'] = Count('id', filter=Q(created_at__gte=since))
+        room_counts[f'active_{label}'] = Count('id', filter=Q(updated_at__gte=since))
+    room_agg = ChatRoom.objects.aggregate(**room_counts)
+
+    by_status = {value: request_agg[f'status_{value}'] for value, _ in ChatRequest.STATUS_CHOICES}
+    return {
+        # Keys the admin dashboard already reads
+        'pending_requests': by_status['pending'],
+        'active_chats': room_agg['active'],
+        'total_requests': request_agg['total'],
+        'approved_requests': by_status['admin_approved'] + by_status['active'],
+        'rejected_requests': by_status['rejected'],
+        'requests_by_status': by_status,
+        'requests_last_24h': request_agg['created_24h'],
+        'requests_last_7d': request_agg['created_7d'],
+        'total_chats': room_agg['total'],
+        'chats_created_last_24h': room_agg['created_24h'],
+        'chats_created_last_7d': room_agg['created_7d'],
+        'chats_active_last_24h': room_agg['active_24h'],
+        'chats_active_last_7d': room_agg['active_7d'],
+        'generated_at': now.isoformat(),
+    }
+
+
+def get_chat_stats():
+    stats = cache.get(CHAT_STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_chat_stats()
+        cache.set(CHAT_STATS_CACHE_KEY, stats, _timeout())
+    return stats
+
+
+def invalidate_chat_stats():
+    cache.delete(CHAT_STATS_CACHE_KEY)
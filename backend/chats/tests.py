@@ -0,0 +1,146 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from django.utils import timezone
+from users.models import User
+from .archive import archive_messages
+from .batching import write_read_marks
+from .models import ArchivedMessage, ChatRequest, ChatRoom, ChatRoomMember, Message
+from .pagination import full_history, paginate_messages
+from .resolver import resolve_room, room_cache_key
+
+
+class ArchivedHistoryPagingTests(TestCase):
+    """Paging must reach every message when archived and live ids interleave."""
+
+    def setUp(self):
+        self.user_a = User.objects.create_user(email='a@example.com', password='x', name='A')
+        self.user_b = User.objects.create_user(email='b@example.com', password='x', name='B')
+        self.room = ChatRoom.objects.create(room_id='a_b', user_a=self.user_a, user_b=self.user_b)
+        self.ids = [
+            Message.objects.create(room=self.room, sender=self.user_a, content=f'm{n}').id
+            for n in range(1, 101)
+        ]
+        # An old soft-deleted message is never archived and stays live with a low id
+        Message.objects.filter(id=self.ids[9]).update(is_deleted=True, deleted_at=timezone.now())
+        archive_messages(Message.objects.filter(id__lte=self.ids[79], is_deleted=False))
+
+    def querysets(self):
+        return Message.objects.filter(room=self.room), ArchivedMessage.objects.filter(room=self.room)
+
+    def test_paging_back_reaches_every_message(self):
+        self.assertEqual(ArchivedMessage.objects.count(), 79)
+        seen = []
+        params = {'limit': '20'}
+        while True:
+            live, archived = self.querysets()
+            page, info = paginate_messages(live, params, archived)
+            seen = [message.id for message in page] + seen
+            if not info['has_more']:
+                break
+            params = {'limit': '20', 'before': str(info['next_before'])}
+        self.assertEqual(seen, self.ids)
+
+    def test_paging_forward_reaches_every_message(self):
+        seen = []
+        params = {'limit': '20', 'after': '0'}
+        while True:
+            live, archived = self.querysets()
+            page, info = paginate_messages(live, params, archived)
+            seen += [message.id for message in page]
+            if not info['has_more']:
+                break
+            params = {'limit': '20', 'after': str(info['next_after'])}
+        self.assertEqual(seen, self.ids)
+
+    def test_full_history_is_in_id_order(self):
+        live, archived = self.querysets()
+        self.assertEqual([message.id for message in full_history(live, archived)], self.ids)
+
+
+class ReadMarkClampTests(TestCase):
+    """Client-supplied read marks can't run ahead of the room's newest message."""
+
+    def setUp(self):
+        self.user_a = User.objects.create_user(email='a@example.com', password='x', name='A')
+        self.user_b = User.objects.create_user(email='b@example.com', password='x', name='B')
+        self.room = ChatRoom.objects.create(room_id='a_b', user_a=self.user_a, user_b=self.user_b)
+        self.latest = Message.objects.create(room=self.room, sender=self.user_a, content='hi').id
+
+    def mark(self):
+        return ChatRoomMember.objects.get(room=self.room, user=self.user_b).last_read_message_id
+
+    def test_mark_read_clamps_to_newest_message(self):
+        self.assertEqual(ChatRoomMember.mark_read(self.room, self.user_b, self.latest + 1000), self.latest)
+        self.assertEqual(self.mark(), self.latest)
+        # A message sent afterwards is still unread
+        Message.objects.create(room=self.room, sender=self.user_a, content='later')
+        self.assertEqual(self.room.unread_count_for(self.user_b), 1)
+
+    def test_mark_read_uses_archive_when_live_table_is_empty(self):
+        archive_messages(Message.objects.filter(room=self.room))
+        self.assertEqual(ChatRoomMember.mark_read(self.room, self.user_b, 10 ** 9), self.latest)
+
+    def test_batched_receipts_are_clamped(self):
+        write_read_marks([(self.room.pk, self.user_b.id, self.latest + 1000)])
+        self.assertEqual(self.mark(), self.latest)
+
+
+class ResolveRoomTests(TestCase):
+    """Only the key -> id mapping is cached; membership is checked on every call."""
+
+    def setUp(self):
+        cache.clear()
+        self.user_a = User.objects.create_user(email='a@example.com', password='x', name='A')
+        self.user_b = User.objects.create_user(email='b@example.com', password='x', name='B')
+        self.room = ChatRoom.objects.create(room_id='a_b', user_a=self.user_a, user_b=self.user_b)
+        self.room.participants.add(self.user_a, self.user_b)
+
+    def test_removed_participant_loses_access_without_invalidation(self):
+        self.assertEqual(resolve_room('a_b', self.user_b), (self.room, True))
+        # Another worker removes the participant; this process gets no signal
+        ChatRoom.participants.through.objects.filter(chatroom_id=self.room.pk, user_id=self.user_b.id).delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_room('a_b', self.user_b), (self.room, False))
+
+    def test_stale_mapping_falls_back_to_lookup(self):
+        resolve_room('a_b', self.user_a)
+        ChatRoom.objects.filter(pk=self.room.pk).update(room_id='moved')
+        other = ChatRoom.objects.create(room_id='a_b', user_a=self.user_a, user_b=self.user_b)
+        # The save signal dropped the mapping here, but not in other workers
+        cache.set(room_cache_key('a_b'), self.room.pk)
+        self.assertEqual(resolve_room('a_b', self.user_a)[0], other)
+
+
+class ChatRequestListTests(TestCase):
+    """Request lists are unpaged unless the client asks for ?limit / ?before."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(email='admin@example.com', password='x', name='Admin', is_staff=True)
+        requester = User.objects.create_user(email='a@example.com', password='x', name='A')
+        # The oldest requests are the pending ones
+        ChatRequest.objects.bulk_create(
+            [ChatRequest(requester=requester, status='pending') for _ in range(5)]
+            + [ChatRequest(requester=requester, status='rejected') for _ in range(60)]
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_admin_queue_without_paging_params_has_every_request(self):
+        for url in ('/api/admin/chats/requests', '/api/chats/requests/all/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['data']), 65)
+            self.assertEqual(sum(item['status'] == 'pending' for item in response.data['data']), 5)
+            self.assertFalse(response.data['pagination']['has_more'])
+
+    def test_paging_walks_back_with_before(self):
+        seen = []
+        params = {'limit': 20}
+        while True:
+            response = self.client.get('/api/chats/requests/all/', params)
+            seen += [item['id'] for item in response.data['data']]
+            if not response.data['pagination']['has_more']:
+                break
+            params = {'limit': 20, 'before': response.data['pagination']['next_before']}
+        self.assertEqual(seen, sorted(ChatRequest.objects.values_list('id', flat=True), reverse=True))
@@ -2,6 +2,7 @@ from django.urls import path
 from . import views
 from . import views_chat_requests
 from . import views_sse
+from . import views_export
 
 urlpatterns = [
     # Chat room endpoints
@@ -14,6 +15,7 @@ urlpatterns = [
     path('rooms/<int:room_id>/read/', views.mark_messages_read, name='mark-messages-read'),
     path('rooms/<str:room_id>/read/', views.mark_messages_read_by_room_id, name='mark-messages-read-by-room-id'),
     path('rooms/<str:room_id>/messages/', views.get_room_messages, name='get-room-messages-by-id'),
+    path('rooms/<str:room_id>/search/', views.search_room_messages, name='search-room-messages'),
     path('messages/<int:message_id>/delete-image/', views.delete_message_image, name='delete-message-image'),
     
     # New chat request workflow endpoints
@@ -30,6 +32,9 @@ urlpatterns = [
     # Admin read-only chat view
     path('rooms/<str:room_id>/admin-view/', views_chat_requests.admin_view_chat_readonly, name='admin-view-chat-readonly'),
     
+    # Streaming transcript export (admin only)
+    path('export/', views_export.export_chat_transcript, name='export-chat-transcript'),
+    
     # Mark pet as reunited (admin only)
     path('rooms/<str:room_id>/mark-reunified/', views_chat_requests.mark_pet_reunified, name='mark-pet-reunified'),
     
@@ -39,5 +44,8 @@ urlpatterns = [
     
     # Server-Sent Events (SSE) for real-time updates (alternative to WebSocket)
     path('rooms/<str:room_id>/stream/', views_sse.stream_messages, name='stream-messages'),
+    
+    # WebSocket typing/presence throttling counters (admin only)
+    path('realtime/metrics/', views.realtime_metrics, name='chat-realtime-metrics'),
 ]
 
@@ -1,11 +1,13 @@
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from django.db.models import Q
 from django.utils import timezone
-from .models import ChatRoom, Message, ChatRequest
-from .serializers import ChatRoomSerializer, ChatRoomListSerializer, MessageSerializer, ChatRequestSerializer
+from .models import ArchivedMessage, ChatRoom, ChatRoomMember, Message, ChatRequest
+from .serializers import ChatRoomSerializer, ChatRoomListSerializer, MessageSerializer, MessageSearchResultSerializer, ChatRequestSerializer
+from .pagination import full_history, paginate_messages, wants_full_history
+from .resolver import resolve_room
 
 
 class ChatRoomListView(generics.ListCreateAPIView):
@@ -319,37 +321,31 @@ class ChatRoomDetailView(generics.RetrieveAPIView):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_room_messages(request, room_id):
-    """Get messages for a room by room_id."""
+    """Get messages for a room by room_id.
+
+    Returns the newest page by default; see chats.pagination for ?before/?after/?limit.
+    Pass ?all=true to get the full history (export).
+    """
     try:
-        # Check for numeric ID first (if passed as string but is number)
-        if str(room_id).isdigit():
-            try:
-                room = ChatRoom.objects.get(id=int(room_id))
-            except ChatRoom.DoesNotExist:
-                # If not found by ID, try as room_id field
-                room = ChatRoom.objects.get(room_id=room_id)
-        else:
-            try:
-                room = ChatRoom.objects.get(room_id=room_id)
-            except ChatRoom.MultipleObjectsReturned:
-                # Handle duplicate room_ids
-                print(f"Warning: Multiple rooms found for room_id {room_id}")
-                rooms = ChatRoom.objects.filter(room_id=room_id)
-                # Try to find one where user is participant
-                room = rooms.filter(participants=request.user).first()
-                if not room:
-                    room = rooms.first()
+        room, is_participant = resolve_room(room_id, request.user)
 
         # Verify user has access
-        if request.user not in room.participants.all() and not request.user.is_staff:
+        if not is_participant and not request.user.is_staff:
             return Response(
                 {'error': 'Permission denied'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        messages = Message.objects.filter(room=room).select_related('sender').order_by('created_at')
-        serializer = MessageSerializer(messages, many=True, context={'request': request})
-        return Response({'data': serializer.data})
+        messages = Message.objects.filter(room=room).select_related('sender')
+        archived = ArchivedMessage.objects.filter(room=room).select_related('sender')
+        if wants_full_history(request.query_params):
+            messages, page_info = full_history(messages, archived), None
+        else:
+            messages, page_info = paginate_messages(messages, request.query_params, archived)
+        serializer = MessageSerializer(
+            messages, many=True, context={'request': request, 'read_marks': room.read_marks()}
+        )
+        return Response({'data': serializer.data, 'pagination': page_info})
 
     except ChatRoom.DoesNotExist:
         return Response(
@@ -366,6 +362,48 @@ def get_room_messages(request, room_id):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_room_messages(request, room_id):
+    """Full-text search within one room: ?q=<terms>&limit=N&before=<message id>.
+
+    Newest matches first; pass pagination.next_before as ?before= for the next page.
+    """
+    from .search import search_messages
+    from .pagination import _parse_int
+    try:
+        room, is_participant = resolve_room(room_id, request.user)
+        if not is_participant and not request.user.is_staff:
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        messages, page_info = search_messages(
+            request.query_params.get('q', ''),
+            room=room,
+            before=_parse_int(request.query_params.get('before')),
+            limit=_parse_int(request.query_params.get('limit')),
+        )
+        serializer = MessageSearchResultSerializer(
+            messages, many=True, context={'request': request, 'read_marks': room.read_marks()}
+        )
+        return Response({'data': serializer.data, 'pagination': page_info})
+    except ChatRoom.DoesNotExist:
+        return Response(
+            {'error': 'Room not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        import traceback
+        print(f"Error in search_room_messages: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'error': f'Server error: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def get_or_create_room(request, user_id):
@@ -465,26 +503,10 @@ def send_message(request, room_id):
 def send_message_by_room_id(request, room_id):
     """Send a message to a chat room by room_id (string like '3_6'). Supports text and images."""
     try:
-        # Check for numeric ID first (if passed as string but is number)
-        if str(room_id).isdigit():
-            try:
-                room = ChatRoom.objects.get(id=int(room_id))
-            except ChatRoom.DoesNotExist:
-                # If not found by ID, try as room_id field
-                room = ChatRoom.objects.get(room_id=room_id)
-        else:
-            try:
-                room = ChatRoom.objects.get(room_id=room_id)
-            except ChatRoom.MultipleObjectsReturned:
-                print(f"Warning: Multiple rooms found for room_id {room_id}")
-                rooms = ChatRoom.objects.filter(room_id=room_id)
-                # Try to find one where user is participant
-                room = rooms.filter(participants=request.user).first()
-                if not room:
-                    room = rooms.first()
+        room, is_participant = resolve_room(room_id, request.user)
 
         # Verify user has access
-        if request.user not in room.participants.all() and not request.user.is_staff:
+        if not is_participant and not request.user.is_staff:
             return Response(
                 {'error': 'Room not found or access denied'},
                 status=status.HTTP_404_NOT_FOUND
@@ -552,10 +574,9 @@ def send_message_by_room_id(request, room_id):
         cloudinary_public_id=cloudinary_public_id
     )
 
-    # Update room's updated_at
+    # Update room's updated_at (queryset update: the room may be a cached instance)
     from django.utils import timezone
-    room.updated_at = timezone.now()
-    room.save(update_fields=['updated_at'])
+    ChatRoom.objects.filter(pk=room.pk).update(updated_at=timezone.now())
 
     serializer = MessageSerializer(message, context={'request': request})
     return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -564,7 +585,10 @@ def send_message_by_room_id(request, room_id):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def mark_messages_read(request, room_id):
-    """Mark all messages in a room as read by room ID (integer)."""
+    """Mark messages in a room as read by room ID (integer).
+
+    Advances the user's read mark to `message_id` if given, otherwise to the latest message.
+    """
     try:
         room = ChatRoom.objects.get(id=room_id, participants=request.user)
     except ChatRoom.DoesNotExist:
@@ -573,41 +597,26 @@ def mark_messages_read(request, room_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    Message.objects.filter(
-        room=room
-    ).exclude(
-        sender=request.user
-    ).update(read_status=True)
+    last_read_message_id = ChatRoomMember.mark_read(room, request.user, request.data.get('message_id'))
 
-    return Response({'message': 'Messages marked as read'}, status=status.HTTP_200_OK)
+    return Response({
+        'message': 'Messages marked as read',
+        'last_read_message_id': last_read_message_id,
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def mark_messages_read_by_room_id(request, room_id):
-    """Mark all messages in a room as read by room_id (string like '3_6')."""
+    """Mark messages in a room as read by room_id (string like '3_6').
+
+    Advances the user's read mark to `message_id` if given, otherwise to the latest message.
+    """
     try:
-        # Check for numeric ID first (if passed as string but is number)
-        if str(room_id).isdigit():
-            try:
-                room = ChatRoom.objects.get(id=int(room_id))
-            except ChatRoom.DoesNotExist:
-                # If not found by ID, try as room_id field
-                room = ChatRoom.objects.get(room_id=room_id)
-        else:
-            try:
-                room = ChatRoom.objects.get(room_id=room_id)
-            except ChatRoom.MultipleObjectsReturned:
-                # Handle duplicate room_ids
-                print(f"Warning: Multiple rooms found for room_id {room_id}")
-                rooms = ChatRoom.objects.filter(room_id=room_id)
-                # Try to find one where user is participant
-                room = rooms.filter(participants=request.user).first()
-                if not room:
-                    room = rooms.first()
+        room, is_participant = resolve_room(room_id, request.user)
 
         # Verify user has access
-        if request.user not in room.participants.all():
+        if not is_participant:
             return Response(
                 {'error': 'Room not found or access denied'},
                 status=status.HTTP_404_NOT_FOUND
@@ -626,13 +635,12 @@ def mark_messages_read_by_room_id(request, room_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-    Message.objects.filter(
-        room=room
-    ).exclude(
-        sender=request.user
-    ).update(read_status=True)
+    last_read_message_id = ChatRoomMember.mark_read(room, request.user, request.data.get('message_id'))
 
-    return Response({'message': 'Messages marked as read'}, status=status.HTTP_200_OK)
+    return Response({
+        'message': 'Messages marked as read',
+        'last_read_message_id': last_read_message_id,
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['DELETE', 'POST'])
@@ -916,3 +924,10 @@ def respond_to_owner_chat_request(request, request_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def realtime_metrics(request):
+    """Typing/presence events sent vs. suppressed by the WebSocket consumers in this process."""
+    from .presence import get_metrics
+    return Response(get_metrics())
@@ -13,11 +13,31 @@ except ImportError:
     # Channels not installed - WebSocket notifications will be skipped
     get_channel_layer = None
     async_to_sync = lambda x: x
-from .models import ChatRequest, ChatRoom
+from .models import ArchivedMessage, ChatRequest, ChatRoom
 from .serializers import ChatRequestSerializer
+from .pagination import full_history, paginate_messages, paginate_newest_first, wants_full_history
+from .resolver import resolve_room
 import json
 
 
+def filter_chat_requests(queryset, query_params):
+    """Apply ?status= (one or comma-separated) and ?type= filters.
+
+    Raises ValueError for unknown values so views can answer 400.
+    """
+    statuses = [value for value in query_params.get('status', '').split(',') if value]
+    if statuses:
+        valid = {value for value, _ in ChatRequest.STATUS_CHOICES}
+        unknown = [value for value in statuses if value not in valid]
+        if unknown:
+            raise ValueError(f"Unknown status: {', '.join(unknown)}")
+        queryset = queryset.filter(status__in=statuses)
+    request_type = query_params.get('type')
+    if request_type:
+        queryset = queryset.filter(type=request_type)
+    return queryset
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_chat_request(request):
@@ -216,6 +236,12 @@ def admin_start_verification(request, request_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Another admin may have claimed it from the moderation queue
+        from adminpanel.moderation import lease_conflict, lease_conflict_response, release_items
+        lease = lease_conflict('chat_request', chat_request.id, request.user)
+        if lease:
+            return Response(lease_conflict_response(lease), status=status.HTTP_409_CONFLICT)
+        
         # Create verification chat room between admin and requester
         verification_room, created = ChatRoom.objects.get_or_create(
             room_id=f"admin_verification_{chat_request.id}",
@@ -243,6 +269,7 @@ def admin_start_verification(request, request_id):
         chat_request.admin_verification_room = verification_room
         chat_request.verified_by_admin = request.user  # Track which admin verified
         chat_request.save()
+        release_items('chat_request', [chat_request.id])
         
         # Send WebSocket notifications
         channel_layer = None
@@ -448,13 +475,20 @@ def admin_complete_verification(request, request_id):
 def admin_reject_request(request, request_id):
     """Admin rejects a chat request."""
     try:
+        from adminpanel.moderation import lease_conflict, lease_conflict_response, release_items
+        
         chat_request = ChatRequest.objects.get(id=request_id, status='pending')
         admin_notes = request.data.get('admin_notes', '')
         
+        lease = lease_conflict('chat_request', chat_request.id, request.user)
+        if lease:
+            return Response(lease_conflict_response(lease), status=status.HTTP_409_CONFLICT)
+        
         chat_request.status = 'rejected'
         if admin_notes:
             chat_request.admin_notes = admin_notes
         chat_request.save()
+        release_items('chat_request', [chat_request.id])
         
         # Send WebSocket notification to requester
         channel_layer = get_channel_layer()
@@ -496,23 +530,21 @@ def admin_view_chat_readonly(request, room_id):
     This endpoint allows admins (who didn't verify the request) to view chats
     for monitoring purposes. The verifying admin stays in the room and can send messages.
     Other admins can only view messages.
+    Messages are cursor-paged like get_room_messages; ?all=true returns the full history.
+    For downloading a whole conversation use the streaming /api/chats/export/ endpoint.
     """
     try:
         from .models import ChatRoom, Message
         from .serializers import MessageSerializer, ChatRoomSerializer
         
-        # Get the chat room
+        # Get the chat room (admins may view any room, so membership is not checked)
         try:
-            room = ChatRoom.objects.get(room_id=room_id)
+            room, _ = resolve_room(room_id, request.user)
         except ChatRoom.DoesNotExist:
-            # Try by ID
-            try:
-                room = ChatRoom.objects.get(id=room_id)
-            except ChatRoom.DoesNotExist:
-                return Response(
-                    {'error': 'Chat room not found'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
+            return Response(
+                {'error': 'Chat room not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
         # Check if this room is associated with a chat request
         chat_request = None
@@ -537,9 +569,16 @@ def admin_view_chat_readonly(request, room_id):
         # Get room details
         room_serializer = ChatRoomSerializer(room, context={'request': request})
         
-        # Get messages
-        messages = Message.objects.filter(room=room).select_related('sender').order_by('created_at')
-        messages_serializer = MessageSerializer(messages, many=True, context={'request': request})
+        # Get messages - newest page by default, full history only on ?all=true
+        messages = Message.objects.filter(room=room).select_related('sender')
+        archived = ArchivedMessage.objects.filter(room=room).select_related('sender')
+        if wants_full_history(request.query_params):
+            messages, page_info = full_history(messages, archived), None
+        else:
+            messages, page_info = paginate_messages(messages, request.query_params, archived)
+        messages_serializer = MessageSerializer(
+            messages, many=True, context={'request': request, 'read_marks': room.read_marks()}
+        )
         
         # Get participants
         participants = list(room.participants.all())
@@ -547,6 +586,7 @@ def admin_view_chat_readonly(request, room_id):
         return Response({
             'room': room_serializer.data,
             'messages': messages_serializer.data,
+            'pagination': page_info,
             'participants': [
                 {
                     'id': p.id,
@@ -749,41 +789,44 @@ def user_accept_request(request, request_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_chat_requests(request, user_id):
-    """Get chat requests for a specific user."""
+    """Get chat requests for a specific user (same filters and paging as get_all_chat_requests)."""
     if int(user_id) != request.user.id and not request.user.is_staff:
         return Response(
             {'error': 'Permission denied'},
             status=status.HTTP_403_FORBIDDEN
         )
     
-    requests = ChatRequest.objects.filter(
-        target_id=user_id
-    ).select_related('requester', 'target', 'pet').order_by('-created_at')
+    try:
+        requests = filter_chat_requests(
+            ChatRequest.objects.filter(target_id=user_id), request.query_params
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    requests = ChatRequestSerializer.setup_eager_loading(requests, request.user)
+    page, page_info = paginate_newest_first(requests, request.query_params)
     
-    serializer = ChatRequestSerializer(requests, many=True, context={'request': request})
-    return Response({'data': serializer.data})
+    serializer = ChatRequestSerializer(page, many=True, context={'request': request})
+    return Response({'data': serializer.data, 'pagination': page_info})
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_all_chat_requests(request):
-    """Get all chat requests (admin only)."""
+    """Get all chat requests (admin only), newest first.
+    
+    Filters: ?status= (comma-separated) and ?type=. Optional paging: ?limit=N and ?before=<id>.
+    """
     try:
-        # Get all chat requests with proper related field loading
-        # Use select_related for ForeignKey relationships
-        chat_requests = ChatRequest.objects.select_related(
-            'requester', 'target', 'pet'
-        ).select_related(
-            'admin_verification_room', 'admin_verification_room__user_a', 'admin_verification_room__user_b',
-            'final_chat_room', 'final_chat_room__user_a', 'final_chat_room__user_b'
-        ).prefetch_related(
-            'admin_verification_room__participants',
-            'final_chat_room__participants'
-        ).order_by('-created_at')
+        try:
+            chat_requests = filter_chat_requests(ChatRequest.objects.all(), request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        chat_requests = ChatRequestSerializer.setup_eager_loading(chat_requests, request.user)
+        page, page_info = paginate_newest_first(chat_requests, request.query_params)
         
         # Serialize with error handling for each request
         serialized_data = []
-        for chat_request in chat_requests:
+        for chat_request in page:
             try:
                 serializer = ChatRequestSerializer(chat_request, context={'request': request})
                 serialized_data.append(serializer.data)
@@ -805,7 +848,8 @@ def get_all_chat_requests(request):
         
         return Response({
             'data': serialized_data,
-            'count': len(serialized_data)
+            'count': len(serialized_data),
+            'pagination': page_info
         }, status=status.HTTP_200_OK)
     except Exception as e:
         import traceback
@@ -937,17 +981,23 @@ def mark_pet_reunified(request, room_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_my_chat_requests(request):
-    """Get current user's chat requests (as requester and target)."""
+    """Get current user's chat requests (as requester and target), filtered and paged like get_all_chat_requests."""
     try:
         # Use Q objects for better query performance
         from django.db.models import Q
-        requests = ChatRequest.objects.filter(
-            Q(requester=request.user) | Q(target=request.user)
-        ).select_related('requester', 'target').order_by('-created_at')
+        try:
+            requests = filter_chat_requests(
+                ChatRequest.objects.filter(Q(requester=request.user) | Q(target=request.user)),
+                request.query_params
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        requests = requests.select_related('requester', 'target', 'pet')
+        page, page_info = paginate_newest_first(requests, request.query_params)
         
         # Build response manually (no serializer to avoid errors)
         data = []
-        for req in requests:
+        for req in page:
             try:
                 data.append({
                     'id': req.id,
@@ -970,7 +1020,7 @@ def get_my_chat_requests(request):
                 print(f"Error processing request {req.id}: {req_error}")
                 continue
         
-        return Response({'data': data}, status=status.HTTP_200_OK)
+        return Response({'data': data, 'pagination': page_info}, status=status.HTTP_200_OK)
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
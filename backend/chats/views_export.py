@@ -0,0 +1,78 @@
+"""
+Streaming chat transcript export for admins.
+
+Rows are read with QuerySet.iterator(chunk_size=...) and written one line at a
+time through StreamingHttpResponse, so memory use does not depend on how long
+the exported conversation is. Archived messages are included ahead of live ones.
+"""
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from backend.streaming import EXPORT_FORMATS, export_response, iter_rows, parse_bound, wants_gzip
+from .models import ArchivedMessage, ChatRoom, Message
+from .resolver import resolve_room
+
+EXPORT_FIELDS = [
+    'id', 'room__room_id', 'created_at', 'sender_id', 'sender__name', 'sender__email',
+    'message_type', 'content', 'cloudinary_url', 'is_deleted',
+]
+CSV_HEADER = [
+    'id', 'room_id', 'created_at', 'sender_id', 'sender_name', 'sender_email',
+    'message_type', 'content', 'image_url', 'is_deleted',
+]
+
+
+def _filtered(model, room, since, until, participant_id, sender_id):
+    queryset = model.objects.all()
+    if room is not None:
+        queryset = queryset.filter(room=room)
+    if participant_id:
+        queryset = queryset.filter(room__participants__id=participant_id)
+    if sender_id:
+        queryset = queryset.filter(sender_id=sender_id)
+    if since:
+        queryset = queryset.filter(created_at__gte=since)
+    if until:
+        queryset = queryset.filter(created_at__lte=until)
+    return queryset.order_by('room_id', 'id').values_list(*EXPORT_FIELDS)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_chat_transcript(request):
+    """Stream chat messages as NDJSON (default) or CSV.
+
+    Query params (all optional):
+      room         room_id ("3_6") or numeric id
+      since/until  ISO date or datetime bounds on created_at
+      participant  user id: only rooms this user takes part in
+      sender       user id: only messages sent by this user
+      output       'ndjson' or 'csv'
+      gzip         'true' to download the file gzip-compressed
+    """
+    try:
+        params = request.query_params
+        room = None
+        if params.get('room'):
+            room, _ = resolve_room(params['room'], request.user)
+        since = parse_bound(params.get('since'))
+        until = parse_bound(params.get('until'), end_of_day=True)
+        participant_id = int(params['participant']) if params.get('participant') else None
+        sender_id = int(params['sender']) if params.get('sender') else None
+    except ChatRoom.DoesNotExist:
+        return Response({'error': 'Chat room not found'}, status=status.HTTP_404_NOT_FOUND)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    output = params.get('output', 'ndjson').lower()
+    if output not in EXPORT_FORMATS:
+        return Response({'error': "output must be 'ndjson' or 'csv'"}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = iter_rows([
+        _filtered(model, room, since, until, participant_id, sender_id)
+        for model in (ArchivedMessage, Message)
+    ])
+    filename = f"chat-{room.room_id if room else 'all'}-{timezone.now():%Y%m%d%H%M}"
+    return export_response(request, CSV_HEADER, rows, output, filename, wants_gzip(params))
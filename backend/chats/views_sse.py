@@ -10,13 +10,42 @@ from rest_framework import status
 from rest_framework_simplejwt.tokens import UntypedToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth.models import AnonymousUser
+import asyncio
 import json
 import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from .models import ChatRoom, Message
 from .serializers import MessageSerializer
+from .resolver import resolve_room
 
 User = get_user_model()
 
+MAX_CONNECTION_SECONDS = 3600  # 1 hour max connection time
+INACTIVITY_TIMEOUT_SECONDS = 120  # 2 minutes of inactivity = disconnect
+HEARTBEAT_SECONDS = 30  # Send heartbeat every 30 seconds
+
+
+def new_message_events(room, last_sent_id, request):
+    """SSE events for up to 10 messages newer than `last_sent_id`; returns (events, last_sent_id)."""
+    new_messages = Message.objects.filter(
+        room=room,
+        id__gt=last_sent_id
+    ).select_related('sender').order_by('created_at')[:10]
+    
+    events = []
+    for message in new_messages:
+        try:
+            # Pass request context to serializer so image URLs are properly generated
+            serializer = MessageSerializer(message, context={'request': request})
+            events.append(f"data: {json.dumps({'type': 'message', 'data': serializer.data})}\n\n")
+            last_sent_id = message.id
+        except Exception as msg_error:
+            # If serialization fails (e.g., missing column), skip this message
+            print(f"[SSE] Error serializing message {message.id}: {msg_error}")
+    return events, last_sent_id
+
 
 def get_user_from_token(request):
     """Extract and validate user from JWT token (query param or header)"""
@@ -65,25 +94,9 @@ def stream_messages(request, room_id):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        # Get room by room_id (string like "3_6")
+        # Get room by room_id (string like "3_6") or numeric id, with the access check
         try:
-            # Check for numeric ID first (if passed as string but is number)
-            if str(room_id).isdigit():
-                try:
-                    room = ChatRoom.objects.get(id=int(room_id))
-                except ChatRoom.DoesNotExist:
-                    # If not found by ID, try as room_id field
-                    room = ChatRoom.objects.get(room_id=room_id)
-            else:
-                try:
-                    room = ChatRoom.objects.get(room_id=room_id)
-                except ChatRoom.MultipleObjectsReturned:
-                    print(f"Warning: Multiple rooms found for room_id {room_id}")
-                    rooms = ChatRoom.objects.filter(room_id=room_id)
-                    # Try to find one where user is participant
-                    room = rooms.filter(participants=user).first()
-                    if not room:
-                        room = rooms.first()
+            room, is_participant = resolve_room(room_id, user)
         except ChatRoom.DoesNotExist:
             return JsonResponse(
                 {'error': 'Room not found'},
@@ -91,37 +104,23 @@ def stream_messages(request, room_id):
             )
         
         # Verify user has access
-        try:
-            if user not in room.participants.all() and not user.is_staff:
-                return JsonResponse(
-                    {'error': 'Permission denied'},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        except Exception:
-            # If participants field doesn't work, check user_a and user_b
-            try:
-                if hasattr(room, 'user_a') and hasattr(room, 'user_b'):
-                    if user.id not in [room.user_a_id, room.user_b_id] and not user.is_staff:
-                        return JsonResponse(
-                            {'error': 'Permission denied'},
-                            status=status.HTTP_403_FORBIDDEN
-                        )
-            except Exception:
-                return JsonResponse(
-                    {'error': 'Permission denied'},
-                    status=status.HTTP_403_FORBIDDEN
-                )
+        if not is_participant and not user.is_staff:
+            return JsonResponse(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
         
         # Get the last message ID the client has seen (optional)
         last_message_id = request.GET.get('last_id', None)
+        poll_seconds = getattr(settings, 'SSE_POLL_SECONDS', 3)
         
         def event_stream():
             """Generator function that yields SSE formatted messages"""
             # Track connection state
             connection_start_time = time.time()
-            max_connection_time = 3600  # 1 hour max connection time
+            max_connection_time = MAX_CONNECTION_SECONDS
             last_activity = time.time()
-            timeout_seconds = 120  # 2 minutes of inactivity = disconnect
+            timeout_seconds = INACTIVITY_TIMEOUT_SECONDS
             
             # Send initial connection message
             try:
@@ -135,7 +134,7 @@ def stream_messages(request, room_id):
             
             # Keep connection alive with periodic heartbeats
             last_heartbeat = time.time()
-            heartbeat_interval = 30  # Send heartbeat every 30 seconds
+            heartbeat_interval = HEARTBEAT_SECONDS
             
             iteration_count = 0
             max_iterations = 3600  # Safety limit: max 3600 iterations (1 hour at 1s intervals)
@@ -162,29 +161,11 @@ def stream_messages(request, room_id):
                         break
                     
                     # Check for new messages
-                    # Only select fields that exist to avoid database errors
-                    new_messages = Message.objects.filter(
-                        room=room,
-                        id__gt=last_sent_id
-                    ).select_related('sender').order_by('created_at')[:10]
-                    
-                    message_sent = False
-                    for message in new_messages:
-                        try:
-                            # Pass request context to serializer so image URLs are properly generated
-                            serializer = MessageSerializer(message, context={'request': request})
-                            yield f"data: {json.dumps({'type': 'message', 'data': serializer.data})}\n\n"
-                            last_sent_id = message.id
-                            last_activity = time.time()
-                            message_sent = True
-                        except (BrokenPipeError, ConnectionResetError, OSError):
-                            # Client disconnected
-                            print(f"[SSE] Client disconnected while sending message for room {room_id}")
-                            return
-                        except Exception as msg_error:
-                            # If serialization fails (e.g., missing column), skip this message
-                            print(f"[SSE] Error serializing message {message.id}: {msg_error}")
-                            continue
+                    events, last_sent_id = new_message_events(room, last_sent_id, request)
+                    for event in events:
+                        yield event
+                    if events:
+                        last_activity = time.time()
                     
                     # Send heartbeat to keep connection alive
                     if current_time - last_heartbeat >= heartbeat_interval:
@@ -204,7 +185,7 @@ def stream_messages(request, room_id):
                         break
                     
                     # Small delay to prevent excessive database queries
-                    time.sleep(3)
+                    time.sleep(poll_seconds)
                     
                 except (BrokenPipeError, ConnectionResetError, OSError) as conn_error:
                     # Client disconnected
@@ -223,7 +204,44 @@ def stream_messages(request, room_id):
                     print(f"[SSE] Error in event_stream for room {room_id}: {e}")
                     break
         
-        response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+        async def async_event_stream():
+            """Same polling loop for ASGI (daphne).
+            
+            Django buffers a sync iterator completely before sending it over ASGI,
+            and the sync generator would hold the shared ORM thread while it sleeps.
+            Here only the query runs on the ORM thread; the wait is on the event loop,
+            and Django cancels the generator when the client disconnects.
+            """
+            connection_start_time = last_activity = last_heartbeat = time.time()
+            last_sent_id = int(last_message_id) if last_message_id and last_message_id.isdigit() else 0
+            poll = sync_to_async(new_message_events)
+            yield f"data: {json.dumps({'type': 'connected', 'room_id': str(room_id)})}\n\n"
+            
+            while True:
+                current_time = time.time()
+                if current_time - connection_start_time > MAX_CONNECTION_SECONDS:
+                    yield f"data: {json.dumps({'type': 'timeout', 'message': 'Connection timeout'})}\n\n"
+                    break
+                try:
+                    events, last_sent_id = await poll(room, last_sent_id, request)
+                except Exception as e:
+                    print(f"[SSE] Error in event_stream for room {room_id}: {e}")
+                    yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+                    break
+                for event in events:
+                    yield event
+                if events:
+                    last_activity = current_time
+                if current_time - last_heartbeat >= HEARTBEAT_SECONDS:
+                    yield f"data: {json.dumps({'type': 'heartbeat', 'timestamp': current_time})}\n\n"
+                    last_heartbeat = last_activity = current_time
+                if current_time - last_activity > INACTIVITY_TIMEOUT_SECONDS:
+                    yield f"data: {json.dumps({'type': 'timeout', 'message': 'Inactivity timeout'})}\n\n"
+                    break
+                await asyncio.sleep(poll_seconds)
+        
+        stream = async_event_stream() if isinstance(request, ASGIRequest) else event_stream()
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
         response['Cache-Control'] = 'no-cache'
         response['X-Accel-Buffering'] = 'no'  # Disable buffering in nginx
         # Note: 'Connection: keep-alive' is a hop-by-hop header and cannot be set directly
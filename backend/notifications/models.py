@@ -44,13 +44,32 @@ class Notification(models.Model):
         blank=True,
         related_name='received_notifications'
     )
+    related_room = models.ForeignKey(
+        'chats.ChatRoom',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notifications'
+    )
+    
+    # Coalesced notifications (new_message) are bumped in place instead of duplicated
+    count = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-updated_at']
         indexes = [
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['created_at']),
         ]
+        constraints = [
+            # At most one unread new_message notification per user per room
+            models.UniqueConstraint(
+                fields=['user', 'related_room'],
+                condition=models.Q(is_read=False, notification_type='new_message'),
+                name='unique_unread_message_notification',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.user.email}"
@@ -59,3 +78,51 @@ class Notification(models.Model):
         """Mark notification as read."""
         self.is_read = True
         self.save(update_fields=['is_read'])
+    
+    @classmethod
+    def upsert_new_message(cls, message):
+        """Create or bump the unread new_message notification of every other participant.
+        
+        One INSERT ... SELECT ... ON CONFLICT statement covers all recipients: users
+        without an unread notification for the room get a new row, the others get
+        their counter incremented and the latest sender and timestamp.
+        """
+        from django.db import connection
+        from chats.models import ChatRoom
+        
+        qn = connection.ops.quote_name
+        table = qn(cls._meta.db_table)
+        participants = qn(ChatRoom.participants.through._meta.db_table)
+        sender_name = getattr(message.sender, 'name', None) or message.sender.email
+        now = timezone.now()
+        
+        sql = f"""
+            INSERT INTO {table} (
+                user_id, title, message, notification_type, link_target, is_read,
+                created_at, updated_at, count, related_user_id, related_room_id
+            )
+            SELECT p.user_id, %s, %s, 'new_message', %s, %s, %s, %s, 1, %s, p.chatroom_id
+            FROM {participants} p
+            WHERE p.chatroom_id = %s AND p.user_id <> %s
+            ON CONFLICT (user_id, related_room_id) WHERE NOT is_read AND notification_type = 'new_message'
+            DO UPDATE SET
+                count = {table}.count + 1,
+                message = 'You have ' || CAST({table}.count + 1 AS TEXT) || ' new messages, latest from ' || %s,
+                related_user_id = EXCLUDED.related_user_id,
+                updated_at = EXCLUDED.updated_at
+        """
+        params = [
+            'New Message',
+            f'You have a new message from {sender_name}',
+            f'/chats/{message.room_id}',
+            False,
+            now,
+            now,
+            message.sender_id,
+            message.room_id,
+            message.sender_id,
+            sender_name,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
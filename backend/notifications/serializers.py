@@ -13,9 +13,10 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = Notification
         fields = [
             'id', 'title', 'message', 'notification_type', 'link_target',
-            'is_read', 'created_at', 'related_pet', 'related_user'
+            'is_read', 'created_at', 'updated_at', 'count', 'related_pet', 'related_user',
+            'related_room'
         ]
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'count']
 
 
 class NotificationCreateSerializer(serializers.ModelSerializer):
@@ -70,19 +70,13 @@ def notify_adoption_status(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=Message)
 def notify_new_message(sender, instance, created, **kwargs):
-    """Notify users when they receive a new message."""
+    """Notify users when they receive a new message.
+    
+    Keeps one unread notification per (user, room) with a message counter,
+    written for all recipients in a single upsert.
+    """
     if created:
-        # Notify all participants in the room except the sender
-        room = instance.room
-        for participant in room.participants.exclude(id=instance.sender.id):
-            Notification.objects.create(
-                user=participant,
-                title='New Message',
-                message=f'You have a new message from {instance.sender.name}',
-                notification_type='new_message',
-                link_target=f'/chats/{room.id}',
-                related_user=instance.sender
-            )
+        Notification.upsert_new_message(instance)
 
 
 @receiver(post_save, sender=Pet)
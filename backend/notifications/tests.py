@@ -1,3 +1,46 @@
 from django.test import TestCase
+from chats.models import ChatRoom, Message
+from users.models import User
+from .models import Notification
 
-# Create your tests here.
+
+class NewMessageNotificationTests(TestCase):
+    """Messages in a room keep one unread new_message notification per recipient."""
+
+    def setUp(self):
+        self.sender = User.objects.create_user(email='a@example.com', password='x', name='Asha')
+        self.recipients = [
+            User.objects.create_user(email='b@example.com', password='x', name='B'),
+            User.objects.create_user(email='c@example.com', password='x', name='C'),
+        ]
+        self.room = ChatRoom.objects.create(room_id='group')
+        self.room.participants.add(self.sender, *self.recipients)
+
+    def send(self, sender, count=1):
+        for n in range(count):
+            Message.objects.create(room=self.room, sender=sender, content=f'message {n}')
+
+    def unread(self, user):
+        return Notification.objects.filter(
+            user=user, notification_type='new_message', related_room=self.room, is_read=False
+        )
+
+    def test_one_row_per_recipient_with_count(self):
+        self.send(self.sender, 3)
+
+        for user in self.recipients:
+            notification = self.unread(user).get()
+            self.assertEqual(notification.count, 3)
+            self.assertEqual(notification.related_user, self.sender)
+            self.assertEqual(notification.message, 'You have 3 new messages, latest from Asha')
+        self.assertFalse(Notification.objects.filter(user=self.sender).exists())
+
+    def test_read_notification_starts_a_new_row(self):
+        self.send(self.sender, 2)
+        self.unread(self.recipients[0]).get().mark_as_read()
+
+        self.send(self.sender)
+
+        self.assertEqual(self.unread(self.recipients[0]).get().count, 1)
+        self.assertEqual(self.unread(self.recipients[1]).get().count, 3)
+        self.assertEqual(Notification.objects.filter(user=self.recipients[0]).count(), 2)
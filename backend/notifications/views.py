@@ -23,7 +23,7 @@ class NotificationListView(generics.ListAPIView):
                 is_read_bool = is_read.lower() == 'true'
                 queryset = queryset.filter(is_read=is_read_bool)
             
-            return queryset.order_by('-created_at')
+            return queryset.order_by('-updated_at')
         except Exception as e:
             import traceback
             print(f"Error in NotificationListView.get_queryset: {e}")
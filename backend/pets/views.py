@@ -858,8 +858,8 @@ def verify_pet(request, pet_id):
     pet.save()
     
     # Log admin action
-    from adminpanel.models import AdminLog
-    AdminLog.objects.create(
+    from adminpanel.audit import log_action
+    log_action(
         admin=request.user,
         action='VERIFY',
         model_type='Pet',
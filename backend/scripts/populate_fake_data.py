@@ -14,37 +14,16 @@ django.setup()
 from django.contrib.auth import get_user_model
 from users.models import Volunteer, Shelter, FeedingPoint, AdminRegistration
 from health.models import VaccinationCamp, HealthResource
+from api.synthetic import get_random_location
 
 User = get_user_model()
 
 # Constants
 PASSWORD = "Pavankumar@12345"
 ADMIN_EMAIL = "admin@petrenuite.com"
-TELANGANA_CITIES = [
-    {"name": "Hyderabad", "lat": 17.3850, "lng": 78.4867},
-    {"name": "Warangal", "lat": 17.9689, "lng": 79.5941},
-    {"name": "Nizamabad", "lat": 18.6725, "lng": 78.0941},
-    {"name": "Karimnagar", "lat": 18.4386, "lng": 79.1288},
-    {"name": "Khammam", "lat": 17.2473, "lng": 80.1514},
-    {"name": "Secunderabad", "lat": 17.4399, "lng": 78.4983},
-    {"name": "Gachibowli", "lat": 17.4401, "lng": 78.3489},
-]
-
 FIRST_NAMES = ["Aarav", "Vihaan", "Aditya", "Sai", "Pavan", "Rohan", "Karthik", "Ananya", "Diya", "Saanvi", "Lakshmi", "Priya"]
 LAST_NAMES = ["Reddy", "Rao", "Kumar", "Sharma", "Verma", "Singh", "Patel", "Gupta"]
 
-def get_random_location():
-    city = random.choice(TELANGANA_CITIES)
-    lat_var = random.uniform(-0.05, 0.05)
-    lng_var = random.uniform(-0.05, 0.05)
-    return {
-        "city": city["name"],
-        "lat": city["lat"] + lat_var,
-        "lng": city["lng"] + lng_var,
-        "state": "Telangana",
-        "pincode": f"500{random.randint(100, 999)}"
-    }
-
 def create_users_and_admin():
     print("Creating users and admin...")
     users = []
@@ -87,6 +87,8 @@ class User(AbstractBaseUser, PermissionsMixin):
             models.Index(fields=['role']),
             models.Index(fields=['is_volunteer', 'volunteer_verified']),
             models.Index(fields=['is_shelter_provider', 'shelter_verified']),
+            # Dashboard "users in the last 7 days" range count
+            models.Index(fields=['date_joined']),
         ]
     
     def __str__(self):
@@ -35,8 +35,10 @@ urlpatterns = [
     # Admin endpoints
     path('admin/volunteers/pending/', views_volunteer.pending_volunteers, name='pending-volunteers'),
     path('admin/volunteers/<int:volunteer_id>/verify/', views_volunteer.verify_volunteer, name='verify-volunteer'),
+    path('admin/volunteers/bulk-verify/', views_volunteer.bulk_verify_volunteers, name='bulk-verify-volunteers'),
     path('admin/shelters/pending/', views_volunteer.pending_shelters, name='pending-shelters'),
     path('admin/shelters/<int:shelter_id>/verify/', views_volunteer.verify_shelter, name='verify-shelter'),
+    path('admin/shelters/bulk-verify/', views_volunteer.bulk_verify_shelters, name='bulk-verify-shelters'),
     path('admin/shelters/create/', views_volunteer.create_shelter, name='admin-create-shelter'),
     
     # Feeding points endpoints
@@ -274,6 +274,69 @@ def verify_shelter(request, shelter_id):
         )
 
 
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_verify_volunteers(request):
+    """Verify or reject many volunteers at once. Body: {"ids": [...], "approved": bool, "notes": "..."}."""
+    try:
+        from adminpanel.bulk_actions import parse_approved, parse_ids, verify_volunteers
+        
+        try:
+            ids = parse_ids(request.data.get('ids'))
+            approved = parse_approved(request.data.get('approved'))
+        except ValueError as e:
+            return Response({'message': str(e), 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        result = verify_volunteers(
+            request.user, ids, approved, request.data.get('notes', ''), request.META.get('REMOTE_ADDR')
+        )
+        return Response({
+            'message': f"{'Verified' if approved else 'Rejected'} {len(result['updated'])} volunteers",
+            'data': result
+        })
+    except Exception as e:
+        import traceback
+        print(f"Error in bulk_verify_volunteers: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'message': f'Error: {str(e)}', 'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def bulk_verify_shelters(request):
+    """Verify or reject many shelters at once.
+    
+    Body: {"ids": [...], "approved": bool, "notes": "...", "verification_params": {...}};
+    approving needs at least 2 checked verification_params, as in verify_shelter.
+    """
+    try:
+        from adminpanel.bulk_actions import parse_approved, parse_ids, verify_shelters
+        
+        try:
+            ids = parse_ids(request.data.get('ids'))
+            approved = parse_approved(request.data.get('approved'))
+            result = verify_shelters(
+                request.user, ids, approved, request.data.get('notes', ''),
+                request.data.get('verification_params', {}), request.META.get('REMOTE_ADDR')
+            )
+        except ValueError as e:
+            return Response({'message': str(e), 'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'message': f"{'Verified' if approved else 'Rejected'} {len(result['updated'])} shelters",
+            'data': result
+        })
+    except Exception as e:
+        import traceback
+        print(f"Error in bulk_verify_shelters: {e}")
+        print(traceback.format_exc())
+        return Response(
+            {'message': f'Error: {str(e)}', 'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def create_shelter(request):